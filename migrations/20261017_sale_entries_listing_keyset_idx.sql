@@ -0,0 +1,5 @@
+-- Keyset pages of GET /api/sale-entries on (sale_date, created_at, id).
+-- created_at is nullable, so the listing keys it as coalesce(created_at, epoch)
+-- and the index matches that expression.
+CREATE INDEX IF NOT EXISTS sale_entries_listing_key_idx
+  ON sale_entries (sale_date DESC, (coalesce(created_at, 'epoch'::timestamp)) DESC, id DESC);
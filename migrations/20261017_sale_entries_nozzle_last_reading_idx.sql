@@ -0,0 +1,3 @@
+-- Latest closing reading per nozzle (GET /api/nozzles-with-last-readings)
+CREATE INDEX IF NOT EXISTS sale_entries_nozzle_last_reading_idx
+  ON sale_entries (nozzle_id, sale_date DESC, created_at DESC);
@@ -7,6 +7,7 @@ config({ path: path.resolve(process.cwd(), '.local.env') });
 import express from "express";
 import fs from 'fs';
 import cookieParser from "cookie-parser";
+import jwt from "jsonwebtoken";
 import { createServer as createViteServer } from "vite";
 
 const app = express();
@@ -26,6 +27,55 @@ function auditReqToFile(req: any) {
 }
 app.use((req, res, next) => { auditReqToFile(req); next(); });
 
+// Opt-in structured capture for traffic replay (testsprite_tests/harness/replay.py):
+// one JSON line per finished request, with query string, status and duration.
+// No credentials reach the file: the session token is reduced to its decoded
+// claims (replay re-signs them), login bodies are skipped and password-like
+// fields in other write bodies are redacted.
+const CAPTURE_REDACT = /pass(word)?|secret|token|otp|pin$/i;
+
+function redactForCapture(value: any): any {
+  if (Array.isArray(value)) return value.map(redactForCapture);
+  if (value && typeof value === 'object') {
+    return Object.fromEntries(Object.entries(value).map(([key, v]) =>
+      [key, CAPTURE_REDACT.test(key) ? '[redacted]' : redactForCapture(v)]));
+  }
+  return value;
+}
+
+function sessionClaims(req: express.Request) {
+  const token = req.cookies?.token ?? /(?:^|;\s*)token=([^;]+)/.exec(req.headers.cookie || '')?.[1];
+  const claims: any = token ? jwt.decode(token) : null;
+  return claims ? { userId: claims.userId, email: claims.email, tenantId: claims.tenantId } : null;
+}
+
+const captureFile = process.env.REQUEST_CAPTURE_FILE
+  ? path.resolve(process.cwd(), process.env.REQUEST_CAPTURE_FILE)
+  : null;
+if (captureFile) {
+  const captureStream = fs.createWriteStream(captureFile, { flags: 'a', mode: 0o600 });
+  app.use((req, res, next) => {
+    const ts = new Date().toISOString();
+    const started = process.hrtime.bigint();
+    res.on('finish', () => {
+      const entry = {
+        ts,
+        method: req.method,
+        url: req.originalUrl,
+        status: res.statusCode,
+        durationMs: Number(process.hrtime.bigint() - started) / 1e6,
+        bytes: Number(res.getHeader('content-length')) || null,
+        user: sessionClaims(req),
+        ua: req.headers['user-agent'] || null,
+        // Bodies of writes, except logins
+        body: req.method !== 'GET' && !req.path.startsWith('/api/auth') ? redactForCapture((req as any).body) : undefined,
+      };
+      captureStream.write(JSON.stringify(entry) + '\n');
+    });
+    next();
+  });
+}
+
 // Per-request soft timeout to prevent client hangs (30s)
 app.use((req, res, next) => {
   // Allow recoveries endpoints to manage their own timing/queuing
@@ -118,6 +168,9 @@ app.use((req, res, next) => {
       res.json({ ok: true, service: "api", time: new Date().toISOString() });
     });
 
+    // Opt-in (RUNTIME_METRICS=1) memory, handle and pool metrics for soak runs
+    (await import("./runtime-metrics.js")).registerRuntimeMetrics(app);
+
     app.get('/api/readiness', async (req, res) => {
       const { pool } = await import("./db.js");
       const started = Date.now();
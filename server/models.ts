@@ -696,6 +696,11 @@ const SaleEntrySchema = new Schema<ISaleEntry>({
     createdBy: { type: String },
 }, { timestamps: true });
 
+// Latest reading per nozzle (GET /api/nozzles-with-last-readings).
+SaleEntrySchema.index({ nozzleId: 1, saleDate: -1, createdAt: -1 });
+// Keyset pages of GET /api/sale-entries.
+SaleEntrySchema.index({ saleDate: -1, createdAt: -1, _id: -1 });
+
 export const SaleEntry = mongoose.model<ISaleEntry>('SaleEntry', SaleEntrySchema);
 
 // ==========================================
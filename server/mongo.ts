@@ -9,7 +9,8 @@ export async function connectToMongo() {
 
     try {
         mongoose.set('debug', true);
-        await mongoose.connect(uri);
+        // Command events feed the query counts in /api/runtime-metrics.
+        await mongoose.connect(uri, { monitorCommands: process.env.RUNTIME_METRICS === "1" });
         console.log("✅ Connected to MongoDB");
     } catch (error) {
         console.error("❌ MongoDB connection error:", error);
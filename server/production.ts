@@ -12,10 +12,35 @@ const __dirname = dirname(__filename);
 const app = express();
 const PORT = Number(process.env.PORT) || 5000;
 
-app.use(express.json());
-app.use(express.urlencoded({ extended: true }));
+// Same body limits as server/index.ts: bulk imports (a month of attendance,
+// a full shift sheet) are well over express' 100kb default
+app.use(express.json({ limit: '50mb' }));
+app.use(express.urlencoded({ extended: true, limit: '50mb' }));
 app.use(cookieParser());
 
+const { connectToMongo } = await import("./mongo.js");
+await connectToMongo();
+
+// Public health endpoints (before authentication), same as server/index.ts
+app.get('/api/health', (req, res) => {
+  res.json({ ok: true, service: "api", time: new Date().toISOString() });
+});
+
+// Opt-in (RUNTIME_METRICS=1) memory, handle and pool metrics for soak runs
+(await import("./runtime-metrics.js")).registerRuntimeMetrics(app);
+
+app.get('/api/readiness', async (req, res) => {
+  const { pool } = await import("./db.js");
+  const started = Date.now();
+  try {
+    await pool.query('SELECT 1');
+    const latencyMs = Date.now() - started;
+    res.json({ ok: true, db: 'up', latencyMs });
+  } catch (err) {
+    res.status(503).json({ ok: false, db: 'down', error: String(err) });
+  }
+});
+
 // Auth routes (no authentication required)
 console.log("🔄 Auth routes module loading...");
 app.use("/api/auth", (await import("./auth-routes")).authRouter);
@@ -737,37 +737,118 @@ relationalRouter.get("/attendance/details", async (req: Request, res: Response)
     }
 });
 
+// Relax validation for MongoDB mode (shiftId might be "S-1")
+const bulkAttendanceSchema = z.object({
+    attendanceDate: z.string().or(z.date()),
+    employeeId: z.string(),
+    status: z.string(),
+    shiftId: z.string().optional().nullable(),
+    notes: z.string().optional().nullable(),
+    type: z.string().optional().nullable()
+});
+
+type BulkAttendanceStatus = "created" | "updated" | "failed" | "skipped" | "invalid";
+
+// POST /api/attendance/bulk[?ordered=false]
+// One bulkWrite of updateOne upserts keyed on the unique (attendanceDate,
+// employeeId) index, plus one read for the saved records. Ordered (the
+// default) rejects the whole sheet when a row is invalid and stops at the
+// first failed write (rows before it stay written); ordered=false writes
+// every valid row and lets the server apply them in parallel. `results` has
+// a status per request row.
 relationalRouter.post("/attendance/bulk", async (req: Request, res: Response) => {
     try {
         const body = req.body;
         if (!Array.isArray(body)) return res.status(400).json({ success: false, error: "Expected array" });
-
-        // Relax validation for MongoDB mode (shiftId might be "S-1")
-        const bulkAttendanceSchema = z.object({
-            attendanceDate: z.string().or(z.date()),
-            employeeId: z.string(),
-            status: z.string(),
-            shiftId: z.string().optional().nullable(),
-            notes: z.string().optional().nullable(),
-            type: z.string().optional().nullable()
-        });
-
-        const results = [];
-        for (const item of body) {
-            const data = bulkAttendanceSchema.parse(item);
+        const ordered = req.query.ordered !== "false";
+
+        const results: { index: number; status: BulkAttendanceStatus; id?: string; error?: string }[] =
+            body.map((_, index) => ({ index, status: "invalid" }));
+        const rows: { index: number; attendanceDate: Date; employeeId: string; payload: any }[] = [];
+        body.forEach((item, index) => {
+            const parsed = bulkAttendanceSchema.safeParse(item);
+            if (!parsed.success) {
+                results[index].error = parsed.error.issues.map(i => `${i.path.join(".")}: ${i.message}`).join("; ");
+                return;
+            }
+            const data = parsed.data;
             const dateObj = data.attendanceDate ? new Date(data.attendanceDate) : new Date();
-
+            if (isNaN(dateObj.getTime())) {
+                results[index].error = "attendanceDate: Invalid date";
+                return;
+            }
             // Clean up payload for Mongoose
             const payload: any = { ...data, attendanceDate: dateObj, createdBy: (req as any).user?.id };
+            rows.push({ index, attendanceDate: dateObj, employeeId: data.employeeId, payload });
+        });
 
-            const updated = await Attendance.findOneAndUpdate(
-                { attendanceDate: dateObj, employeeId: data.employeeId },
-                payload,
-                { new: true, upsert: true }
-            );
-            results.push({ ...updated.toObject(), id: updated._id });
+        if (ordered && rows.length < body.length) {
+            return res.status(400).json({ success: false, error: "Invalid attendance rows", results: results.filter(r => r.status === "invalid") });
         }
-        res.json({ success: true, count: results.length, data: results });
+
+        let upserted: Record<number, any> = {};
+        let writeErrors: any[] = [];
+        if (rows.length > 0) {
+            try {
+                const written = await Attendance.bulkWrite(rows.map(row => ({
+                    updateOne: {
+                        filter: { attendanceDate: row.attendanceDate, employeeId: row.employeeId },
+                        update: { $set: row.payload },
+                        upsert: true,
+                    }
+                })), { ordered });
+                upserted = written.upsertedIds || {};
+            } catch (error: any) {
+                // MongoBulkWriteError: some rows failed, the rest carry on (or
+                // stop, when ordered). Anything else failed the whole batch.
+                if (!error?.writeErrors && !error?.result) throw error;
+                upserted = error.result?.upsertedIds || error.upsertedIds || {};
+                writeErrors = [].concat(error.writeErrors || []);
+            }
+        }
+
+        const failedAt = new Map<number, string>(writeErrors.map((e: any) => [e.index, e.errmsg || e.message]));
+        const firstFailure = writeErrors.length > 0 ? Math.min(...failedAt.keys()) : Infinity;
+        rows.forEach((row, op) => {
+            const result = results[row.index];
+            delete result.error;
+            if (failedAt.has(op)) {
+                result.status = "failed";
+                result.error = failedAt.get(op);
+            } else if (ordered && op > firstFailure) {
+                result.status = "skipped";
+            } else if (upserted[op] !== undefined) {
+                result.status = "created";
+                result.id = String(upserted[op]);
+            } else {
+                result.status = "updated";
+            }
+        });
+
+        // One read returns the saved records (and the ids of updated rows).
+        const savedRows = rows.filter(row => ["created", "updated"].includes(results[row.index].status));
+        const saved = savedRows.length === 0 ? [] : await Attendance.find({
+            employeeId: { $in: [...new Set(savedRows.map(r => r.employeeId))] },
+            attendanceDate: { $in: [...new Set(savedRows.map(r => r.attendanceDate.getTime()))].map(t => new Date(t)) },
+        }).lean();
+        const byKey = new Map(saved.map((d: any) => [`${new Date(d.attendanceDate).getTime()}|${d.employeeId}`, d]));
+        const data = savedRows.map((row) => {
+            const doc: any = byKey.get(`${row.attendanceDate.getTime()}|${row.employeeId}`);
+            if (doc) results[row.index].id = String(doc._id);
+            return doc ? { ...doc, id: doc._id } : null;
+        }).filter(Boolean);
+
+        const count = (status: BulkAttendanceStatus) => results.filter(r => r.status === status).length;
+        const summary = {
+            created: count("created"), updated: count("updated"), failed: count("failed"),
+            skipped: count("skipped"), invalid: count("invalid"),
+        };
+        const written = summary.created + summary.updated;
+        const success = summary.failed + summary.skipped + summary.invalid === 0;
+        // Partial success is still a 200; callers read `results` for the rest.
+        res.status(success || written > 0 ? 200 : 400).json({
+            success, count: written, ...summary, results, data
+        });
     } catch (error: any) {
         res.status(400).json({ success: false, error: error.message });
     }
@@ -1412,24 +1493,6 @@ relationalRouter.get("/recoveries", async (req: Request, res: Response) => {
     }
 });
 
-relationalRouter.get("/sale-entries", async (req: Request, res: Response) => {
-    try {
-        const { from_date, to_date, shift_id } = req.query;
-        let conditions = [];
-        if (from_date) conditions.push(gte(saleEntries.saleDate, String(from_date)));
-        if (to_date) conditions.push(lte(saleEntries.saleDate, String(to_date)));
-        if (shift_id) conditions.push(eq(saleEntries.shiftId, String(shift_id)));
-
-        const results = await db.select().from(saleEntries)
-            .where(and(...conditions))
-            .orderBy(desc(saleEntries.saleDate));
-
-        res.json({ success: true, rows: results, ok: true });
-    } catch (error: any) {
-        res.status(500).json({ success: false, error: error.message });
-    }
-});
-
 relationalRouter.get("/credit-sales", async (req: Request, res: Response) => {
     try {
         const { from_date, to_date } = req.query;
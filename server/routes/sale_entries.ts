@@ -1,17 +1,29 @@
 
 import { Router, Request, Response } from "express";
+import mongoose from "mongoose";
 import { db } from "../db";
 import {
     saleEntries, nozzles, fuelProducts, dailySaleRates, employees, dutyShifts, users, tanks,
     insertSaleEntrySchema
 } from "../../shared/schema";
-import { eq, desc, and, sql } from "drizzle-orm";
+import { eq, desc, and, sql, inArray } from "drizzle-orm";
 import {
     Nozzle, DailySaleRate, FuelProduct, Tank, SaleEntry, DutyShift, Employee, User
 } from "../models";
 
 export const saleEntriesRouter = Router();
 
+// Documents of `model` whose _id is one of `ids`, keyed by id string. Most
+// master data keeps Postgres UUIDs as String _ids; for ObjectId-keyed models
+// (users) ids that are not ObjectIds are skipped, since the cast would throw.
+async function lookupByIds(model: mongoose.Model<any>, ids: unknown[], projection: string) {
+    const objectIds = model.schema.path("_id")?.instance === "ObjectId";
+    const wanted = [...new Set(ids.filter(Boolean).map(String))]
+        .filter(id => !objectIds || mongoose.Types.ObjectId.isValid(id));
+    const docs: any[] = wanted.length === 0 ? [] : await model.find({ _id: { $in: wanted } }, projection).lean();
+    return new Map<string, any>(docs.map(d => [String(d._id), d]));
+}
+
 // GET /api/nozzles-with-last-readings?date=YYYY-MM-DD
 saleEntriesRouter.get("/nozzles-with-last-readings", async (req: Request, res: Response) => {
     try {
@@ -39,21 +51,25 @@ saleEntriesRouter.get("/nozzles-with-last-readings", async (req: Request, res: R
             const ratesMap = new Map();
             rates.forEach(r => ratesMap.set(r.fuelProductId, r.closeRate));
 
-            const rows = await Promise.all(activeNozzles.map(async (n) => {
-                // Get last closing reading
-                const lastEntry = await SaleEntry.findOne({ nozzleId: String(n._id) })
-                    .sort({ saleDate: -1, createdAt: -1 });
-
-                return {
-                    id: n._id,
-                    nozzle_number: n.nozzleNumber,
-                    tank_number: tankMap[n.tankId] || '',
-                    pump_station: n.pumpStation,
-                    fuel_product_id: n.fuelProductId,
-                    product_name: productMap[n.fuelProductId] || '',
-                    last_closing_reading: lastEntry ? lastEntry.closingReading : "0",
-                    current_rate: ratesMap.get(n.fuelProductId) || 0
-                };
+            // Last closing reading of every nozzle in one pass: walk the
+            // (nozzleId, saleDate desc, createdAt desc) index and keep the first
+            // entry per nozzle.
+            const lastReadings = await SaleEntry.aggregate([
+                { $match: { nozzleId: { $in: activeNozzles.map(n => String(n._id)) } } },
+                { $sort: { nozzleId: 1, saleDate: -1, createdAt: -1 } },
+                { $group: { _id: "$nozzleId", closingReading: { $first: "$closingReading" } } },
+            ]);
+            const lastReadingMap = new Map(lastReadings.map(r => [String(r._id), r.closingReading]));
+
+            const rows = activeNozzles.map((n) => ({
+                id: n._id,
+                nozzle_number: n.nozzleNumber,
+                tank_number: tankMap[n.tankId] || '',
+                pump_station: n.pumpStation,
+                fuel_product_id: n.fuelProductId,
+                product_name: productMap[n.fuelProductId] || '',
+                last_closing_reading: lastReadingMap.get(String(n._id)) ?? "0",
+                current_rate: ratesMap.get(n.fuelProductId) || 0
             }));
 
             return res.json({ success: true, ok: true, rows });
@@ -82,19 +98,22 @@ saleEntriesRouter.get("/nozzles-with-last-readings", async (req: Request, res: R
         const ratesMap = new Map();
         rates.forEach(r => ratesMap.set(r.fuelProductId, r.closeRate));
 
-        const rows = await Promise.all(activeNozzles.map(async (n) => {
-            // Get last closing reading
-            const lastEntry = await db.select({ closingReading: saleEntries.closingReading })
-                .from(saleEntries)
-                .where(eq(saleEntries.nozzleId, n.id))
-                .orderBy(desc(saleEntries.saleDate), desc(saleEntries.createdAt))
-                .limit(1);
-
-            return {
-                ...n,
-                last_closing_reading: lastEntry.length > 0 ? lastEntry[0].closingReading : "0",
-                current_rate: ratesMap.get(n.fuel_product_id) || 0
-            };
+        // Last closing reading per nozzle in one query; DISTINCT ON keeps the
+        // first row of each nozzle_id in sale_entries_nozzle_last_reading_idx order.
+        const lastReadings = activeNozzles.length === 0 ? [] : await db
+            .selectDistinctOn([saleEntries.nozzleId], {
+                nozzleId: saleEntries.nozzleId,
+                closingReading: saleEntries.closingReading,
+            })
+            .from(saleEntries)
+            .where(inArray(saleEntries.nozzleId, activeNozzles.map(n => n.id)))
+            .orderBy(saleEntries.nozzleId, desc(saleEntries.saleDate), desc(saleEntries.createdAt));
+        const lastReadingMap = new Map(lastReadings.map(r => [r.nozzleId, r.closingReading]));
+
+        const rows = activeNozzles.map((n) => ({
+            ...n,
+            last_closing_reading: lastReadingMap.get(n.id) ?? "0",
+            current_rate: ratesMap.get(n.fuel_product_id) || 0
         }));
 
         res.json({ success: true, ok: true, rows });
@@ -104,115 +123,417 @@ saleEntriesRouter.get("/nozzles-with-last-readings", async (req: Request, res: R
     }
 });
 
-// GET /api/sale-entries
-saleEntriesRouter.get("/sale-entries", async (req: Request, res: Response) => {
+// Sale entry listing, newest first, keyset-paginated on (sale_date, created_at, id).
+// A cursor is the base64url JSON of the last row's key; the next page starts
+// strictly after it, so pages stay stable while new entries are added.
+// Rows without created_at key as the epoch (after every dated row of their
+// day) so they are neither skipped nor repeated.
+const SALE_ENTRY_PAGE_DEFAULT = 200;
+const SALE_ENTRY_PAGE_MAX = 1000;
+const SALE_ENTRY_STREAM_BATCH = 500;
+
+type SaleEntryCursor = [saleDate: string, createdAt: string, id: string];
+
+function encodeSaleEntryCursor(key: SaleEntryCursor): string {
+    return Buffer.from(JSON.stringify(key)).toString("base64url");
+}
+
+// undefined when absent, null when malformed.
+function decodeSaleEntryCursor(value: unknown): SaleEntryCursor | null | undefined {
+    if (value === undefined || value === "") return undefined;
     try {
-        const { from, to, product } = req.query;
+        const key = JSON.parse(Buffer.from(String(value), "base64url").toString());
+        const valid = Array.isArray(key) && key.length === 3 && key.every(k => typeof k === "string")
+            && !isNaN(Date.parse(key[0])) && !isNaN(Date.parse(key[1])) && /^[0-9a-f-]{24,36}$/i.test(key[2]);
+        return valid ? key as SaleEntryCursor : null;
+    } catch {
+        return null;
+    }
+}
+
+function saleEntryPageLimit(value: unknown): number {
+    const limit = Number(value) || SALE_ENTRY_PAGE_DEFAULT;
+    return Math.min(Math.max(Math.floor(limit), 1), SALE_ENTRY_PAGE_MAX);
+}
+
+interface SaleEntryFilter { from?: string; to?: string; product?: string; shift?: string }
+
+// created_at as it appears in the Postgres keyset (sale_entries_listing_key_idx).
+const pgCreatedAtKey = sql`coalesce(${saleEntries.createdAt}, 'epoch'::timestamp)`;
+
+interface SaleEntryPage { rows: any[]; next: SaleEntryCursor | null }
+
+// Fetch related data once per collection ($in over the distinct ids) and join
+// in memory, so the query count does not grow with the rows.
+async function joinSaleEntryRefs(entries: any[]) {
+    const [nozzleMap, productMap, shiftMap, employeeMap, userMap] = await Promise.all([
+        lookupByIds(Nozzle, entries.map(e => e.nozzleId), "nozzleNumber tankId"),
+        lookupByIds(FuelProduct, entries.map(e => e.fuelProductId), "productName"),
+        lookupByIds(DutyShift, entries.map(e => e.shiftId), "shiftName"),
+        lookupByIds(Employee, entries.map(e => e.employeeId), "employeeName"),
+        lookupByIds(User, entries.map(e => e.createdBy), "fullName username"),
+    ]);
+    const tankMap = await lookupByIds(Tank, [...nozzleMap.values()].map(n => n.tankId), "tankNumber");
+
+    return entries.map((e) => {
+        const nozzle = nozzleMap.get(String(e.nozzleId));
+        const tank = nozzle ? tankMap.get(String(nozzle.tankId)) : null;
+        const prod = productMap.get(String(e.fuelProductId));
+        const shift = shiftMap.get(String(e.shiftId));
+        const emp = employeeMap.get(String(e.employeeId));
+        const user = userMap.get(String(e.createdBy));
+
+        return {
+            id: e._id,
+            sale_date: e.saleDate instanceof Date ? e.saleDate.toISOString().slice(0, 10) : e.saleDate,
+            pump_station: e.pumpStation,
+            tank_number: tank ? tank.tankNumber : '',
+            product_name: prod ? prod.productName : '',
+            shift: shift ? shift.shiftName : '',
+            nozzle_number: nozzle ? nozzle.nozzleNumber : '',
+            opening_reading: e.openingReading,
+            closing_reading: e.closingReading,
+            price_per_unit: e.pricePerUnit,
+            quantity: e.quantity,
+            net_sale_amount: e.netSaleAmount,
+            employee_name: emp ? emp.employeeName : '',
+            created_at: e.createdAt,
+            created_by: user ? (user.fullName || user.username) : ''
+        };
+    });
+}
+
+async function mongoSaleEntryConditions({ from, to, product, shift }: SaleEntryFilter) {
+    let conditions: any = {};
+    if (from && to) {
+        // Ensure 'to' covers the full day
+        const toDate = new Date(to);
+        toDate.setHours(23, 59, 59, 999);
+
+        conditions.saleDate = {
+            $gte: new Date(from),
+            $lte: toDate
+        };
+    }
+    // Look up product ID by name
+    if (product && product !== 'All') {
+        const prod = await FuelProduct.findOne({ productName: product });
+        // fuelProductId is a String field, and aggregate $match (totals) does not cast
+        if (prod) conditions.fuelProductId = String(prod._id);
+        else conditions.fuelProductId = "non_existent";
+    }
+    if (shift) conditions.shiftId = shift;
+    return conditions;
+}
+
+function pgSaleEntryConditions({ from, to, product, shift }: SaleEntryFilter) {
+    const conditions = [];
+    if (from) conditions.push(sql`${saleEntries.saleDate} >= ${from}`);
+    if (to) conditions.push(sql`${saleEntries.saleDate} <= ${to}`);
+    if (product && product !== 'All') conditions.push(eq(fuelProducts.productName, product));
+    if (shift) conditions.push(eq(saleEntries.shiftId, shift));
+    return conditions;
+}
+
+// One page of the listing after `after`; every row when `limit` is undefined.
+async function fetchSaleEntryPage(filter: SaleEntryFilter, after?: SaleEntryCursor, limit?: number): Promise<SaleEntryPage> {
+    // MongoDB Path
+    if (!process.env.DATABASE_URL) {
+        const conditions = await mongoSaleEntryConditions(filter);
+        if (after) {
+            const saleDate = new Date(after[0]), createdAt = new Date(after[1]);
+            // Missing createdAt sorts last (as the epoch); $not $gte includes it.
+            const undated = createdAt.getTime() === 0;
+            conditions.$or = [
+                { saleDate: { $lt: saleDate } },
+                ...(undated ? [] : [{ saleDate, createdAt: { $not: { $gte: createdAt } } }]),
+                { saleDate, createdAt: undated ? null : createdAt, _id: { $lt: after[2] } },
+            ];
+        }
 
-        // MongoDB Path
-        if (!process.env.DATABASE_URL) {
-            let conditions: any = {};
-            if (from && to) {
-                // Ensure 'to' covers the full day
-                const toDate = new Date(String(to));
-                toDate.setHours(23, 59, 59, 999);
-
-                conditions.saleDate = {
-                    $gte: new Date(String(from)),
-                    $lte: toDate
-                };
-            }
-            // Product filtering requires mapping product name to ID first, OR we fetch all and filter in memory
-            // Or look up product ID by name
-            if (product && product !== 'All') {
-                const prod = await FuelProduct.findOne({ productName: String(product) });
-                if (prod) conditions.fuelProductId = prod._id;
-                else conditions.fuelProductId = "non_existent";
+        let query = SaleEntry.find(conditions).sort({ saleDate: -1, createdAt: -1, _id: -1 });
+        if (limit !== undefined) query = query.limit(limit);
+        const entries: any[] = await query.lean();
+        const last = entries[entries.length - 1];
+        return {
+            rows: await joinSaleEntryRefs(entries),
+            next: last ? [new Date(last.saleDate).toISOString(), new Date(last.createdAt ?? 0).toISOString(), String(last._id)] : null,
+        };
+    }
+
+    // Postgres Path
+    const conditions = pgSaleEntryConditions(filter);
+    if (after) {
+        conditions.push(sql`(${saleEntries.saleDate}, ${pgCreatedAtKey}, ${saleEntries.id}) < (${after[0]}::date, ${after[1]}::timestamp, ${after[2]}::uuid)`);
+    }
+    let query = db.select({
+        id: saleEntries.id,
+        sale_date: saleEntries.saleDate,
+        pump_station: saleEntries.pumpStation,
+        tank_number: tanks.tankNumber,
+        product_name: fuelProducts.productName,
+        shift: dutyShifts.shiftName,
+        nozzle_number: nozzles.nozzleNumber,
+        opening_reading: saleEntries.openingReading,
+        closing_reading: saleEntries.closingReading,
+        price_per_unit: saleEntries.pricePerUnit,
+        quantity: saleEntries.quantity,
+        net_sale_amount: saleEntries.netSaleAmount,
+        employee_name: employees.employeeName,
+        created_at: saleEntries.createdAt,
+        created_by: users.fullName,
+        // created_at at full (microsecond) precision for the cursor
+        cursor_created_at: sql<string>`${pgCreatedAtKey}::text`,
+    })
+        .from(saleEntries)
+        .leftJoin(nozzles, eq(saleEntries.nozzleId, nozzles.id))
+        .leftJoin(fuelProducts, eq(saleEntries.fuelProductId, fuelProducts.id))
+        .leftJoin(dutyShifts, eq(saleEntries.shiftId, dutyShifts.id))
+        .leftJoin(employees, eq(saleEntries.employeeId, employees.id))
+        .leftJoin(users, eq(saleEntries.createdBy, users.id))
+        .leftJoin(tanks, eq(nozzles.tankId, tanks.id)) // Join tanks here too
+        .where(and(...conditions))
+        .orderBy(desc(saleEntries.saleDate), sql`${pgCreatedAtKey} desc`, desc(saleEntries.id))
+        .$dynamic();
+    if (limit !== undefined) query = query.limit(limit);
+
+    const results = await query;
+    const last = results[results.length - 1];
+    return {
+        rows: results.map(({ cursor_created_at, ...row }) => row),
+        next: last ? [String(last.sale_date), last.cursor_created_at, last.id] : null,
+    };
+}
+
+// Resolves once `res` can take more data or the client has gone away.
+function drained(res: Response) {
+    return new Promise<void>((resolve) => {
+        const done = () => {
+            res.off("drain", done);
+            res.off("close", done);
+            resolve();
+        };
+        res.on("drain", done);
+        res.on("close", done);
+    });
+}
+
+// Write the listing as NDJSON, one keyset batch at a time, so the server only
+// ever holds SALE_ENTRY_STREAM_BATCH rows. Errors after the headers are sent
+// end the stream with an {"error": ...} line.
+async function streamSaleEntries(res: Response, filter: SaleEntryFilter, after?: SaleEntryCursor) {
+    res.status(200).type("application/x-ndjson");
+    try {
+        let cursor = after;
+        while (!res.destroyed) {
+            const page = await fetchSaleEntryPage(filter, cursor, SALE_ENTRY_STREAM_BATCH);
+            for (const row of page.rows) {
+                if (!res.write(JSON.stringify(row) + "\n")) await drained(res);
             }
+            if (page.rows.length < SALE_ENTRY_STREAM_BATCH || !page.next) break;
+            cursor = page.next;
+        }
+    } catch (error: any) {
+        console.error("Error streaming sale entries:", error);
+        res.write(JSON.stringify({ error: error.message }) + "\n");
+    }
+    res.end();
+}
+
+// from_date/to_date/shift_id are the names the report pages send.
+function saleEntryFilter(query: Request["query"]): SaleEntryFilter {
+    const { product } = query;
+    const from = query.from ?? query.from_date;
+    const to = query.to ?? query.to_date;
+    const shift = query.shift_id;
+    return {
+        from: from ? String(from) : undefined,
+        to: to ? String(to) : undefined,
+        product: product ? String(product) : undefined,
+        shift: shift ? String(shift) : undefined,
+    };
+}
+
+// GET /api/sale-entries?from&to&product&shift_id[&limit&cursor][&stream=1]
+// Without limit/cursor every matching row is returned, as before. With them
+// the response holds one page and `nextCursor` (null on the last page).
+// stream=1 (or Accept: application/x-ndjson) streams every row as NDJSON.
+saleEntriesRouter.get("/sale-entries", async (req: Request, res: Response) => {
+    try {
+        const filter = saleEntryFilter(req.query);
+        const after = decodeSaleEntryCursor(req.query.cursor);
+        if (after === null) {
+            return res.status(400).json({ success: false, error: "Invalid cursor" });
+        }
 
-            // Using lean() for performance and simple object return
-            const entries = await SaleEntry.find(conditions).sort({ saleDate: -1, createdAt: -1 });
-
-            // Fetch related data for mapping
-            // This is N+1 susceptible but for now fine
-            const rows = await Promise.all(entries.map(async (e) => {
-                const nozzle = await Nozzle.findById(e.nozzleId);
-                const tank = nozzle ? await Tank.findById(nozzle.tankId) : null;
-                const prod = await FuelProduct.findById(e.fuelProductId);
-                const shift = e.shiftId ? await DutyShift.findById(e.shiftId) : null;
-                const emp = await Employee.findById(e.employeeId);
-                const user = e.createdBy ? await User.findById(e.createdBy) : null;
-
-                return {
-                    id: e._id,
-                    sale_date: e.saleDate instanceof Date ? e.saleDate.toISOString().slice(0, 10) : e.saleDate,
-                    pump_station: e.pumpStation,
-                    tank_number: tank ? tank.tankNumber : '',
-                    product_name: prod ? prod.productName : '',
-                    shift: shift ? shift.shiftName : '',
-                    nozzle_number: nozzle ? nozzle.nozzleNumber : '',
-                    opening_reading: e.openingReading,
-                    closing_reading: e.closingReading,
-                    price_per_unit: e.pricePerUnit,
-                    quantity: e.quantity,
-                    net_sale_amount: e.netSaleAmount,
-                    employee_name: emp ? emp.employeeName : '',
-                    created_at: e.createdAt,
-                    created_by: user ? (user.fullName || user.username) : ''
-                };
-            }));
+        if (req.query.stream === "1" || req.accepts(["json", "application/x-ndjson"]) === "application/x-ndjson") {
+            return await streamSaleEntries(res, filter, after);
+        }
 
+        if (req.query.limit === undefined && after === undefined) {
+            const { rows } = await fetchSaleEntryPage(filter);
             return res.json({ success: true, ok: true, rows });
         }
 
-        // Postgres Path
-        let query = db.select({
-            id: saleEntries.id,
-            sale_date: saleEntries.saleDate,
-            pump_station: saleEntries.pumpStation,
-            tank_number: tanks.tankNumber,
-            product_name: fuelProducts.productName,
-            shift: dutyShifts.shiftName,
-            nozzle_number: nozzles.nozzleNumber,
-            opening_reading: saleEntries.openingReading,
-            closing_reading: saleEntries.closingReading,
-            price_per_unit: saleEntries.pricePerUnit,
-            quantity: saleEntries.quantity,
-            net_sale_amount: saleEntries.netSaleAmount,
-            employee_name: employees.employeeName,
-            created_at: saleEntries.createdAt,
-            created_by: users.fullName
-        })
-            .from(saleEntries)
-            .leftJoin(nozzles, eq(saleEntries.nozzleId, nozzles.id))
-            .leftJoin(fuelProducts, eq(saleEntries.fuelProductId, fuelProducts.id))
-            .leftJoin(dutyShifts, eq(saleEntries.shiftId, dutyShifts.id))
-            .leftJoin(employees, eq(saleEntries.employeeId, employees.id))
-            .leftJoin(users, eq(saleEntries.createdBy, users.id))
-            .leftJoin(tanks, eq(nozzles.tankId, tanks.id)); // Join tanks here too
-
-        const conditions = [];
-        if (from) conditions.push(sql`${saleEntries.saleDate} >= ${from}`);
-        if (to) conditions.push(sql`${saleEntries.saleDate} <= ${to}`);
-        if (product && product !== 'All') conditions.push(eq(fuelProducts.productName, product as string));
-
-        if (conditions.length > 0) {
-            // @ts-ignore
-            query.where(and(...conditions));
-        }
+        const limit = saleEntryPageLimit(req.query.limit);
+        const page = await fetchSaleEntryPage(filter, after, limit);
+        const nextCursor = page.rows.length === limit && page.next ? encodeSaleEntryCursor(page.next) : null;
+        res.json({ success: true, ok: true, rows: page.rows, nextCursor });
+    } catch (error: any) {
+        console.error("Error fetching sale entries:", error);
+        res.status(500).json({ success: false, error: error.message });
+    }
+});
 
-        // @ts-ignore
-        query.orderBy(desc(saleEntries.saleDate), desc(saleEntries.createdAt));
+// GET /api/sale-entries/totals?from&to&product
+// Quantity and net sale amount per product over the same filter as the
+// listing, computed by the database so the UI can show totals without
+// fetching every row.
+saleEntriesRouter.get("/sale-entries/totals", async (req: Request, res: Response) => {
+    try {
+        const filter = saleEntryFilter(req.query);
+        let rows: { fuel_product_id: string; product_name: string; entries: number; quantity: number; net_sale_amount: number }[];
 
-        const rows = await query;
-        res.json({ success: true, ok: true, rows });
+        // MongoDB Path
+        if (!process.env.DATABASE_URL) {
+            const totals = await SaleEntry.aggregate([
+                { $match: await mongoSaleEntryConditions(filter) },
+                {
+                    $group: {
+                        _id: "$fuelProductId",
+                        entries: { $sum: 1 },
+                        quantity: { $sum: "$quantity" },
+                        net_sale_amount: { $sum: "$netSaleAmount" },
+                    }
+                },
+            ]);
+            const productMap = await lookupByIds(FuelProduct, totals.map(t => t._id), "productName");
+            rows = totals.map(t => ({
+                fuel_product_id: String(t._id),
+                product_name: productMap.get(String(t._id))?.productName || '',
+                entries: t.entries,
+                quantity: t.quantity,
+                net_sale_amount: t.net_sale_amount,
+            }));
+        } else {
+            // Postgres Path
+            const totals = await db.select({
+                fuel_product_id: saleEntries.fuelProductId,
+                product_name: fuelProducts.productName,
+                entries: sql<number>`count(*)::int`,
+                quantity: sql<string>`coalesce(sum(${saleEntries.quantity}), 0)`,
+                net_sale_amount: sql<string>`coalesce(sum(${saleEntries.netSaleAmount}), 0)`,
+            })
+                .from(saleEntries)
+                .leftJoin(fuelProducts, eq(saleEntries.fuelProductId, fuelProducts.id))
+                .where(and(...pgSaleEntryConditions(filter)))
+                .groupBy(saleEntries.fuelProductId, fuelProducts.productName);
+            rows = totals.map(t => ({
+                fuel_product_id: String(t.fuel_product_id),
+                product_name: t.product_name || '',
+                entries: t.entries,
+                quantity: Number(t.quantity),
+                net_sale_amount: Number(t.net_sale_amount),
+            }));
+        }
+
+        rows.sort((a, b) => a.product_name.localeCompare(b.product_name));
+        const total = rows.reduce((acc, r) => ({
+            entries: acc.entries + r.entries,
+            quantity: acc.quantity + r.quantity,
+            net_sale_amount: acc.net_sale_amount + r.net_sale_amount,
+        }), { entries: 0, quantity: 0, net_sale_amount: 0 });
+        res.json({ success: true, ok: true, rows, total });
     } catch (error: any) {
-        console.error("Error fetching sale entries:", error);
+        console.error("Error fetching sale entry totals:", error);
         res.status(500).json({ success: false, error: error.message });
     }
 });
 
+// Shift sheets above this many rows are inserted in chunks (inside one
+// transaction) to stay under Postgres' 65535 bind parameters per statement.
+const SALE_ENTRY_INSERT_CHUNK = 1000;
+
+interface PreparedSaleEntry {
+    index: number;
+    entry: any;
+    open: number;
+    close: number;
+    test: number;
+    price: number | null;
+    quantity: number;
+    netSaleAmount: number;
+}
+
+// Parse readings and compute quantity and amount for every entry in one pass;
+// collect the rows that cannot be saved instead of stopping at the first.
+// price_per_unit may be left out when net_sale_amount is given.
+function prepareSaleEntries(body: any[]) {
+    const prepared: PreparedSaleEntry[] = [];
+    const errors: { index: number; error: string }[] = [];
+    body.forEach((entry, index) => {
+        // Calculate derived fields
+        const open = parseFloat(entry?.opening_reading);
+        const close = parseFloat(entry?.closing_reading);
+        const test = parseFloat(entry?.test_qty || '0');
+        const hasPrice = entry?.price_per_unit != null && entry.price_per_unit !== '';
+        const price = hasPrice || !entry?.net_sale_amount ? parseFloat(entry?.price_per_unit) : null;
+
+        const invalid = ([["opening_reading", open], ["closing_reading", close], ["test_qty", test], ["price_per_unit", price ?? 0]] as const)
+            .filter(([, value]) => !Number.isFinite(value))
+            .map(([field]) => field);
+        if (invalid.length > 0) {
+            errors.push({ index, error: `${invalid.join(", ")} must be numeric` });
+            return;
+        }
+
+        const quantity = parseFloat(Math.max(0, (close - open) - test).toFixed(2));
+        // Use provided net_sale_amount if available (manual override), otherwise calculate
+        const netSaleAmount = entry.net_sale_amount
+            ? parseFloat(entry.net_sale_amount)
+            : parseFloat((quantity * price!).toFixed(2));
+        if (!Number.isFinite(netSaleAmount)) {
+            errors.push({ index, error: "net_sale_amount must be numeric" });
+            return;
+        }
+        prepared.push({ index, entry, open, close, test, price, quantity, netSaleAmount });
+    });
+    return { prepared, errors };
+}
+
+// Raised when a standalone server (no transactions) stopped part-way through
+// an ordered insert: `saved` rows are written, the rest are not.
+class PartialSaleEntryInsert extends Error {
+    constructor(public saved: number, cause: any) {
+        super(`Saved ${saved} sale entries before: ${cause?.message || cause}. `
+            + `This MongoDB deployment has no transactions (use a replica set) to roll them back.`);
+    }
+}
+
+// All-or-nothing insert in one transaction where the deployment supports them
+// (replica set or mongos). A standalone server rejects transactions; there the
+// already-validated documents go in one ordered insertMany, and a failure
+// reports exactly how many were written instead of pretending to roll back.
+async function insertSaleEntryDocs(docs: any[]) {
+    try {
+        await mongoose.connection.transaction((session) => SaleEntry.insertMany(docs, { session }));
+        return;
+    } catch (error: any) {
+        const unsupported = error?.code === 20 || /replica set|Transaction numbers/i.test(error?.message || "");
+        if (!unsupported) throw error;
+    }
+    try {
+        await SaleEntry.insertMany(docs, { ordered: true });
+    } catch (error: any) {
+        const saved = error?.writeErrors?.[0]?.index ?? error?.insertedDocs?.length ?? error?.result?.insertedCount ?? 0;
+        throw new PartialSaleEntryInsert(saved, error);
+    }
+}
+
 // POST /api/sale-entries
+// Body: the whole shift sheet as an array. Every entry is validated before
+// anything is written, then all rows are inserted at once, all or nothing.
+// Returns { count, ids } in request order, or 400 with per-row errors.
 saleEntriesRouter.post("/sale-entries", async (req: Request, res: Response) => {
     try {
         const body = req.body; // Array of entries
@@ -221,82 +542,89 @@ saleEntriesRouter.post("/sale-entries", async (req: Request, res: Response) => {
             return res.status(400).json({ success: false, error: "Expected array of entries" });
         }
 
+        const { prepared, errors } = prepareSaleEntries(body);
+        const createdBy = (req as any).user?.id;
+
         // MongoDB Path
         if (!process.env.DATABASE_URL) {
-            const results = [];
-            for (const entry of body) {
-                // Calculate derived fields
-                const open = parseFloat(entry.opening_reading);
-                const close = parseFloat(entry.closing_reading);
-                const test = parseFloat(entry.test_qty || '0');
-                const price = parseFloat(entry.price_per_unit);
-
-                const quantity = Math.max(0, (close - open) - test).toFixed(2);
-                let netSaleAmount = entry.net_sale_amount;
-                if (!netSaleAmount) {
-                    netSaleAmount = (parseFloat(quantity) * price).toFixed(2);
-                }
-
-                const newEntry = new SaleEntry({
-                    saleDate: entry.sale_date,
-                    shiftId: entry.shift_id,
-                    pumpStation: entry.pump_station,
-                    nozzleId: entry.nozzle_id,
-                    fuelProductId: entry.fuel_product_id,
-                    openingReading: open,
-                    closingReading: close,
-                    testQty: test,
-                    pricePerUnit: price,
-                    quantity: parseFloat(quantity),
-                    netSaleAmount: parseFloat(netSaleAmount),
-                    employeeId: entry.employee_id,
-                    createdBy: (req as any).user?.id
-                });
-
-                const saved = await newEntry.save();
-                results.push({ ...saved.toObject(), id: saved._id });
-            }
-            return res.json({ success: true, ok: true, count: results.length });
-        }
-
-        // Postgres Path
-        const results = [];
-        for (const entry of body) {
-            // Calculate derived fields
-            const open = parseFloat(entry.opening_reading);
-            const close = parseFloat(entry.closing_reading);
-            const test = parseFloat(entry.test_qty || '0');
-            const price = parseFloat(entry.price_per_unit);
-
-            const quantity = Math.max(0, (close - open) - test).toFixed(2);
-
-            // Use provided net_sale_amount if available (manual override), otherwise calculate
-            let netSaleAmount = entry.net_sale_amount;
-            if (!netSaleAmount) {
-                netSaleAmount = (parseFloat(quantity) * price).toFixed(2);
-            }
-
-            const formatted = {
+            const docs = prepared.map(({ entry, open, close, test, price, quantity, netSaleAmount }) => new SaleEntry({
                 saleDate: entry.sale_date,
                 shiftId: entry.shift_id,
                 pumpStation: entry.pump_station,
                 nozzleId: entry.nozzle_id,
                 fuelProductId: entry.fuel_product_id,
-                openingReading: entry.opening_reading?.toString(),
-                closingReading: entry.closing_reading?.toString(),
-                quantity: quantity.toString(),
-                pricePerUnit: entry.price_per_unit?.toString(),
-                netSaleAmount: netSaleAmount.toString(),
+                openingReading: open,
+                closingReading: close,
+                testQty: test,
+                // The Mongo schema requires a price; derive it from a manual net amount.
+                pricePerUnit: price ?? (quantity > 0 ? parseFloat((netSaleAmount / quantity).toFixed(2)) : 0),
+                quantity,
+                netSaleAmount,
                 employeeId: entry.employee_id,
-                createdBy: (req as any).user?.id
-            };
+                createdBy
+            }));
+            docs.forEach((doc, i) => {
+                const invalid = doc.validateSync();
+                if (invalid) errors.push({ index: prepared[i].index, error: invalid.message });
+            });
+            if (errors.length > 0) {
+                errors.sort((a, b) => a.index - b.index);
+                return res.status(400).json({ success: false, error: "Invalid sale entries", errors });
+            }
+
+            try {
+                if (docs.length > 0) await insertSaleEntryDocs(docs);
+            } catch (error: any) {
+                if (!(error instanceof PartialSaleEntryInsert)) throw error;
+                console.error("Error saving sale entries:", error);
+                return res.status(500).json({
+                    success: false, error: error.message, count: error.saved,
+                    ids: docs.slice(0, error.saved).map(d => String(d._id)),
+                    failedIndex: prepared[error.saved]?.index,
+                });
+            }
+            const ids = docs.map(d => String(d._id));
+            return res.json({ success: true, ok: true, count: ids.length, ids });
+        }
+
+        // Postgres Path
+        if (errors.length > 0) {
+            return res.status(400).json({ success: false, error: "Invalid sale entries", errors });
+        }
+        const rows = prepared.map(({ entry, price, quantity, netSaleAmount }) => ({
+            saleDate: entry.sale_date,
+            shiftId: entry.shift_id,
+            pumpStation: entry.pump_station,
+            nozzleId: entry.nozzle_id,
+            fuelProductId: entry.fuel_product_id,
+            openingReading: entry.opening_reading?.toString(),
+            closingReading: entry.closing_reading?.toString(),
+            quantity: quantity.toString(),
+            pricePerUnit: price === null ? null : entry.price_per_unit.toString(),
+            netSaleAmount: netSaleAmount.toString(),
+            employeeId: entry.employee_id,
+            createdBy
+        }));
 
-            console.log("Saving entry:", formatted);
-            const saved = await db.insert(saleEntries).values(formatted).returning();
-            results.push(saved[0]);
+        // One multi-row INSERT is atomic on its own; larger sheets are split
+        // into chunks that commit or roll back together.
+        let saved: { id: string }[] = [];
+        if (rows.length > SALE_ENTRY_INSERT_CHUNK) {
+            saved = await db.transaction(async (tx: any) => {
+                const ids: { id: string }[] = [];
+                for (let i = 0; i < rows.length; i += SALE_ENTRY_INSERT_CHUNK) {
+                    ids.push(...await tx.insert(saleEntries)
+                        .values(rows.slice(i, i + SALE_ENTRY_INSERT_CHUNK))
+                        .returning({ id: saleEntries.id }));
+                }
+                return ids;
+            });
+        } else if (rows.length > 0) {
+            saved = await db.insert(saleEntries).values(rows).returning({ id: saleEntries.id });
         }
 
-        res.json({ success: true, ok: true, count: results.length });
+        const ids = saved.map(r => r.id);
+        res.json({ success: true, ok: true, count: ids.length, ids });
     } catch (error: any) {
         console.error("Error saving sale entries:", error);
         res.status(500).json({ success: false, error: error.message || "DB Error" });
@@ -334,10 +662,6 @@ saleEntriesRouter.delete("/sale-entries-batch", async (req: Request, res: Respon
             return res.json({ success: true, ok: true });
         }
 
-        // Using inArray would be better but for now looping is acceptable if handled in transaction or simple delete with 'in'
-        // Drizzle select In: 
-        const { inArray } = await import("drizzle-orm");
-
         await db.delete(saleEntries).where(inArray(saleEntries.id, ids));
 
         res.json({ success: true, ok: true });
@@ -0,0 +1,85 @@
+import type { Express } from "express";
+import { monitorEventLoopDelay } from "perf_hooks";
+import v8 from "v8";
+import mongoose from "mongoose";
+
+// Opt-in process metrics for the soak harness (testsprite_tests/harness/soak.py).
+// Enabled with RUNTIME_METRICS=1; unauthenticated, so never enable it on a
+// public deployment.
+
+const loopDelay = monitorEventLoopDelay({ resolution: 10 });
+
+// Mongo driver pool, counted from CMAP events once the default connection exists.
+const mongoPool = { open: 0, checkedOut: 0, created: 0, closed: 0 };
+// Commands sent, by name (find, aggregate, insert, ...). The driver only emits
+// these with monitorCommands, which connectToMongo sets under RUNTIME_METRICS=1.
+const mongoCommands: Record<string, number> = {};
+let mongoWatched = false;
+
+function watchMongoPool() {
+  if (mongoWatched || mongoose.connection.readyState !== 1) return;
+  const client: any = mongoose.connection.getClient();
+  client.on("connectionCreated", () => { mongoPool.open++; mongoPool.created++; });
+  client.on("connectionClosed", () => { mongoPool.open--; mongoPool.closed++; });
+  client.on("connectionCheckedOut", () => { mongoPool.checkedOut++; });
+  client.on("connectionCheckedIn", () => { mongoPool.checkedOut--; });
+  client.on("commandStarted", (event: any) => {
+    mongoCommands[event.commandName] = (mongoCommands[event.commandName] || 0) + 1;
+  });
+  mongoWatched = true;
+}
+
+export function registerRuntimeMetrics(app: Express) {
+  if (process.env.RUNTIME_METRICS !== "1") return;
+  loopDelay.enable();
+  mongoose.connection.on("connected", watchMongoPool);
+  watchMongoPool();
+
+  app.get("/api/runtime-metrics", async (_req, res) => {
+    const handles: Record<string, number> = {};
+    for (const kind of (process as any).getActiveResourcesInfo?.() ?? []) {
+      handles[kind] = (handles[kind] || 0) + 1;
+    }
+
+    // Event-loop delay since the previous sample.
+    const eventLoop = {
+      meanMs: loopDelay.mean / 1e6,
+      p99Ms: loopDelay.percentile(99) / 1e6,
+      maxMs: loopDelay.max / 1e6,
+    };
+    loopDelay.reset();
+
+    const { getConnectionStats } = await import("./services/db-connection-manager.js");
+    const tenants = getConnectionStats();
+    const { pool } = await import("./db.js");
+    const main: any = pool;
+
+    const heap = v8.getHeapStatistics();
+    res.json({
+      ts: new Date().toISOString(),
+      uptimeSec: process.uptime(),
+      memory: process.memoryUsage(),
+      heap: {
+        usedHeapSize: heap.used_heap_size,
+        totalHeapSize: heap.total_heap_size,
+        heapSizeLimit: heap.heap_size_limit,
+        nativeContexts: heap.number_of_native_contexts,
+        detachedContexts: heap.number_of_detached_contexts,
+      },
+      handles,
+      eventLoop,
+      postgres: {
+        mainTotal: typeof main.totalCount === "number" ? main.totalCount : null,
+        mainIdle: typeof main.idleCount === "number" ? main.idleCount : null,
+        tenantPools: tenants.totalPools,
+        tenantConnections: tenants.poolDetails.reduce((sum, p) => sum + p.totalCount, 0),
+      },
+      mongo: {
+        connections: mongoose.connections.length,
+        readyState: mongoose.connection.readyState,
+        ...mongoPool,
+        commands: { ...mongoCommands },
+      },
+    });
+  });
+}
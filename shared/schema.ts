@@ -1,4 +1,4 @@
-import { pgTable, uuid, text, timestamp, date, numeric, boolean, varchar, integer, uniqueIndex } from "drizzle-orm/pg-core";
+import { pgTable, uuid, text, timestamp, date, numeric, boolean, varchar, integer, uniqueIndex, index } from "drizzle-orm/pg-core";
 import { relations, sql } from "drizzle-orm";
 import { createInsertSchema } from "drizzle-zod";
 import { z } from "zod";
@@ -529,7 +529,13 @@ export const saleEntries = pgTable("sale_entries", {
   employeeId: uuid("employee_id"),
   createdAt: timestamp("created_at").defaultNow(),
   createdBy: uuid("created_by").references(() => users.id),
-});
+}, (table) => ({
+  nozzleLastReadingIdx: index("sale_entries_nozzle_last_reading_idx")
+    .on(table.nozzleId, table.saleDate.desc(), table.createdAt.desc()),
+  // created_at is nullable; the listing keys missing values as the epoch.
+  listingKeysetIdx: index("sale_entries_listing_key_idx")
+    .on(table.saleDate.desc(), sql`coalesce(${table.createdAt}, 'epoch'::timestamp) DESC`, table.id.desc()),
+}));
 
 export const insertSaleEntrySchema = createInsertSchema(saleEntries).omit({ id: true, createdAt: true, quantity: true, netSaleAmount: true });
 export type InsertSaleEntry = typeof saleEntries.$inferInsert;
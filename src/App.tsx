@@ -141,6 +141,14 @@ const queryClient = new QueryClient({
   },
 });
 
+// Expose the client in dev builds, and in production builds made with
+// VITE_E2E_HOOKS=1 (the TestSprite harness builds dist/ that way), so the
+// harness can wait for React Query to go idle instead of sleeping
+// (testsprite_tests/harness/waits.py)
+if (import.meta.env.DEV || import.meta.env.VITE_E2E_HOOKS === "1") {
+  (window as any).__REACT_QUERY_CLIENT__ = queryClient;
+}
+
 const App = () => (
   <QueryClientProvider client={queryClient}>
     <TooltipProvider>
@@ -0,0 +1,73 @@
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import mongoose from 'mongoose';
+import { startTestApp, type TestApp } from '../setup/integration-setup';
+import { relationalRouter } from '../../server/routes/relational';
+import { Attendance } from '../../server/models';
+
+// POST /api/attendance/bulk is MongoDB-only (one bulkWrite of upserts).
+describe.skipIf(!process.env.MONGODB_URI)('Attendance Bulk Integration Tests', () => {
+  let app: TestApp;
+  const employeeA = `bulk-test-a-${Date.now()}`;
+  const employeeB = `bulk-test-b-${Date.now()}`;
+
+  const post = async (rows: any[], query = '') => {
+    const response = await fetch(`${app.baseUrl}/attendance/bulk${query}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(rows),
+    });
+    return { status: response.status, body: await response.json() };
+  };
+
+  beforeAll(async () => {
+    await mongoose.connect(process.env.MONGODB_URI!);
+    app = await startTestApp(relationalRouter);
+  });
+
+  afterAll(async () => {
+    await Attendance.deleteMany({ employeeId: { $in: [employeeA, employeeB] } });
+    await app.close();
+    await mongoose.disconnect();
+  });
+
+  beforeEach(async () => {
+    await Attendance.deleteMany({ employeeId: { $in: [employeeA, employeeB] } });
+  });
+
+  test('should report created, updated and invalid rows of a mixed batch', async () => {
+    // Arrange: employee A already has a record for the day
+    const seeded = await post([{ attendanceDate: '2026-10-01', employeeId: employeeA, status: 'PRESENT' }]);
+    expect(seeded.body.created).toBe(1);
+
+    // Act: update A, create B, and send two rows that cannot be saved
+    const { status, body } = await post([
+      { attendanceDate: '2026-10-01', employeeId: employeeA, status: 'ABSENT' },
+      { attendanceDate: '2026-10-01', employeeId: employeeB, status: 'PRESENT' },
+      { attendanceDate: 'not-a-date', employeeId: employeeB, status: 'PRESENT' },
+      { attendanceDate: '2026-10-01', status: 'PRESENT' },
+    ], '?ordered=false');
+
+    // Assert: the valid rows are written, the others are reported per row
+    expect(status).toBe(200);
+    expect(body).toMatchObject({ success: false, count: 2, created: 1, updated: 1, invalid: 2, failed: 0 });
+    expect(body.results.map((r: any) => r.status)).toEqual(['updated', 'created', 'invalid', 'invalid']);
+    expect(body.results[2].error).toMatch(/attendanceDate/);
+    expect(body.results[3].error).toMatch(/employeeId/);
+
+    const saved = await Attendance.find({ employeeId: { $in: [employeeA, employeeB] } }).lean();
+    expect(saved).toHaveLength(2);
+    expect(saved.find((a: any) => a.employeeId === employeeA)?.status).toBe('ABSENT');
+    expect(saved.every((a: any) => !isNaN(new Date(a.attendanceDate).getTime()))).toBe(true);
+  });
+
+  test('should reject an ordered batch with an unparsable date without writing', async () => {
+    const { status, body } = await post([
+      { attendanceDate: '2026-10-02', employeeId: employeeA, status: 'PRESENT' },
+      { attendanceDate: '2026-13-45', employeeId: employeeB, status: 'PRESENT' },
+    ]);
+
+    expect(status).toBe(400);
+    expect(body.results).toEqual([{ index: 1, status: 'invalid', error: 'attendanceDate: Invalid date' }]);
+    expect(await Attendance.countDocuments({ employeeId: { $in: [employeeA, employeeB] } })).toBe(0);
+  });
+});
@@ -0,0 +1,68 @@
+import { describe, test, expect, beforeAll, afterAll } from 'vitest';
+import { randomUUID } from 'crypto';
+import {
+  setupTestDatabase,
+  createTestFixtures,
+  startTestApp,
+  type TestApp,
+  type TestDatabase
+} from '../setup/integration-setup';
+import { saleEntriesRouter } from '../../server/routes/sale_entries';
+
+describe('Nozzle Last Readings Integration Tests', () => {
+  let db: TestDatabase;
+  let app: TestApp;
+  let fuelProductId: string;
+  const tag = randomUUID().slice(0, 8);
+  const nozzleIds = {} as Record<'walked' | 'unused' | 'tied', string>;
+
+  const addEntry = (nozzleId: string, saleDate: string, createdAt: string, closing: number) =>
+    db.client.query(
+      `INSERT INTO sale_entries (sale_date, nozzle_id, fuel_product_id, opening_reading, closing_reading, created_at)
+       VALUES ($1, $2, $3, 0, $4, $5)`,
+      [saleDate, nozzleId, fuelProductId, closing, createdAt]
+    );
+
+  beforeAll(async () => {
+    db = await setupTestDatabase();
+    ({ fuelProductId } = await createTestFixtures(db.client));
+    for (const name of ['walked', 'unused', 'tied'] as const) {
+      const { rows: [nozzle] } = await db.client.query(
+        `INSERT INTO nozzles (nozzle_number, fuel_product_id, pump_station, is_active)
+         VALUES ($1, $2, 'Test Pump', true) RETURNING id`,
+        [`TN-${tag}-${name}`, fuelProductId]
+      );
+      nozzleIds[name] = nozzle.id;
+    }
+
+    // Latest sale_date wins, whatever the insert order
+    await addEntry(nozzleIds.walked, '1999-02-01', '1999-02-01 08:00:00', 100);
+    await addEntry(nozzleIds.walked, '1999-02-03', '1999-02-03 08:00:00', 300);
+    await addEntry(nozzleIds.walked, '1999-02-02', '1999-02-02 08:00:00', 200);
+    // Same sale_date: the later created_at wins, as the per-nozzle
+    // ORDER BY sale_date DESC, created_at DESC LIMIT 1 query picked it
+    await addEntry(nozzleIds.tied, '1999-02-05', '1999-02-05 10:00:00', 500);
+    await addEntry(nozzleIds.tied, '1999-02-05', '1999-02-05 09:00:00', 450);
+
+    app = await startTestApp(saleEntriesRouter);
+  });
+
+  afterAll(async () => {
+    const ids = Object.values(nozzleIds);
+    await db.client.query('DELETE FROM sale_entries WHERE nozzle_id = ANY($1)', [ids]);
+    await db.client.query('DELETE FROM nozzles WHERE id = ANY($1)', [ids]);
+    await app.close();
+    await db.cleanup();
+  });
+
+  test('should report the last closing reading of every active nozzle', async () => {
+    const response = await fetch(`${app.baseUrl}/nozzles-with-last-readings?date=1999-02-05`);
+    expect(response.status).toBe(200);
+    const { rows } = await response.json();
+    const reading = (id: string) => rows.find((r: any) => r.id === id)?.last_closing_reading;
+
+    expect(parseFloat(reading(nozzleIds.walked))).toBe(300);
+    expect(reading(nozzleIds.unused)).toBe('0');
+    expect(parseFloat(reading(nozzleIds.tied))).toBe(500);
+  });
+});
@@ -0,0 +1,211 @@
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import { randomUUID } from 'crypto';
+import {
+  setupTestDatabase,
+  cleanupTestData,
+  createTestFixtures,
+  startTestApp,
+  type TestApp,
+  type TestDatabase
+} from '../setup/integration-setup';
+import { saleEntriesRouter } from '../../server/routes/sale_entries';
+
+describe('Sale Entries API Integration Tests', () => {
+  let db: TestDatabase;
+  let app: TestApp;
+  let fixtures: {
+    fuelProductId: string;
+    employeeId: string;
+  };
+  // Rows written by a test carry its pump_station, so counts ignore other data.
+  let station: string;
+
+  const entry = (overrides: Record<string, any> = {}) => ({
+    sale_date: '2026-10-01',
+    pump_station: station,
+    fuel_product_id: fixtures.fuelProductId,
+    employee_id: fixtures.employeeId,
+    opening_reading: 1000,
+    closing_reading: 1100,
+    price_per_unit: 95.5,
+    ...overrides,
+  });
+
+  const postEntries = async (entries: any[]) => {
+    const response = await fetch(`${app.baseUrl}/sale-entries`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(entries),
+    });
+    return { status: response.status, body: await response.json() };
+  };
+
+  const savedRows = async () => (await db.client.query(
+    'SELECT quantity, price_per_unit, net_sale_amount FROM sale_entries WHERE pump_station = $1 ORDER BY opening_reading',
+    [station]
+  )).rows;
+
+  beforeAll(async () => {
+    db = await setupTestDatabase();
+    fixtures = await createTestFixtures(db.client);
+    app = await startTestApp(saleEntriesRouter);
+  });
+
+  afterAll(async () => {
+    await app.close();
+    await db.cleanup();
+  });
+
+  beforeEach(async () => {
+    await cleanupTestData(db.client);
+    // cleanupTestData keys on created_at, which the listing tests leave NULL
+    await db.client.query(`DELETE FROM sale_entries WHERE pump_station LIKE 'Test Pump %'`);
+    station = `Test Pump ${randomUUID().slice(0, 8)}`;
+  });
+
+  test('should insert a shift sheet and return ids in request order', async () => {
+    const { status, body } = await postEntries([
+      entry(),
+      entry({ opening_reading: 2000, closing_reading: 2050, test_qty: 5 }),
+    ]);
+
+    expect(status).toBe(200);
+    expect(body.count).toBe(2);
+    expect(body.ids).toHaveLength(2);
+
+    const rows = await savedRows();
+    expect(rows.map(r => parseFloat(r.quantity))).toEqual([100, 45]);
+    expect(parseFloat(rows[0].net_sale_amount)).toBeCloseTo(9550, 2);
+  });
+
+  test('should reject the whole sheet with per-row errors when an entry is invalid', async () => {
+    const { status, body } = await postEntries([
+      entry(),
+      entry({ closing_reading: 'abc' }),
+      entry({ price_per_unit: undefined }),
+    ]);
+
+    expect(status).toBe(400);
+    expect(body.errors).toEqual([
+      { index: 1, error: 'closing_reading must be numeric' },
+      { index: 2, error: 'price_per_unit must be numeric' },
+    ]);
+    expect(await savedRows()).toHaveLength(0);
+  });
+
+  test('should accept a manual net_sale_amount without price_per_unit', async () => {
+    const { status, body } = await postEntries([
+      entry({ price_per_unit: undefined, net_sale_amount: 9400 }),
+    ]);
+
+    expect(status).toBe(200);
+    expect(body.count).toBe(1);
+
+    const [row] = await savedRows();
+    expect(row.price_per_unit).toBeNull();
+    expect(parseFloat(row.net_sale_amount)).toBe(9400);
+  });
+
+  test('should roll back every row when one insert fails', async () => {
+    // Arrange: the second entry passes validation but references a nozzle
+    // that does not exist, so the foreign key rejects the INSERT.
+    const { status } = await postEntries([
+      entry(),
+      entry({ opening_reading: 2000, closing_reading: 2100, nozzle_id: randomUUID() }),
+    ]);
+
+    expect(status).toBe(500);
+    expect(await savedRows()).toHaveLength(0);
+  });
+
+  describe('GET /api/sale-entries', () => {
+    // A day no other test writes, so the listing holds only these rows
+    const range = 'from=1999-01-01&to=1999-01-02';
+    let expected: string[];
+
+    beforeEach(async () => {
+      // Two days; ties on created_at and a row without created_at on the first
+      const rows: [string, string | null][] = [
+        ['1999-01-01', '1999-01-01 08:00:00'],
+        ['1999-01-01', '1999-01-01 08:00:00'],
+        ['1999-01-01', '1999-01-01 09:30:00.123456'],
+        ['1999-01-01', null],
+        ['1999-01-02', '1999-01-02 07:00:00'],
+      ];
+      for (const [saleDate, createdAt] of rows) {
+        await db.client.query(
+          `INSERT INTO sale_entries (sale_date, pump_station, fuel_product_id, quantity, net_sale_amount, created_at)
+           VALUES ($1, $2, $3, 10, 955, $4)`,
+          [saleDate, station, fixtures.fuelProductId, createdAt]
+        );
+      }
+      expected = (await db.client.query(`
+        SELECT id FROM sale_entries WHERE pump_station = $1
+        ORDER BY sale_date DESC, coalesce(created_at, 'epoch'::timestamp) DESC, id DESC
+      `, [station])).rows.map(r => r.id);
+    });
+
+    test('should page through every row once with the cursor', async () => {
+      const seen: string[] = [];
+      let cursor: string | null = null;
+      let pages = 0;
+      do {
+        const response = await fetch(`${app.baseUrl}/sale-entries?${range}&limit=2${cursor ? `&cursor=${cursor}` : ''}`);
+        expect(response.status).toBe(200);
+        const body = await response.json();
+        expect(body.rows.length).toBeLessThanOrEqual(2);
+        seen.push(...body.rows.map((r: any) => r.id));
+        cursor = body.nextCursor;
+        pages += 1;
+      } while (cursor && pages < 10);
+
+      // Including the row without created_at, which comes last in its day
+      expect(seen).toEqual(expected);
+      expect(pages).toBe(3);
+    });
+
+    test('should total only the requested product', async () => {
+      const { rows: [other] } = await db.client.query(
+        `INSERT INTO fuel_products (product_name, short_name, is_active) VALUES ($1, 'TO', true) RETURNING id`,
+        [`Test Other ${station}`]
+      );
+      try {
+        await db.client.query(
+          `INSERT INTO sale_entries (sale_date, pump_station, fuel_product_id, quantity, net_sale_amount)
+           VALUES ('1999-01-01', $1, $2, 7, 700)`,
+          [station, other.id]
+        );
+
+        const response = await fetch(`${app.baseUrl}/sale-entries/totals?${range}&product=Test%20Petrol`);
+        expect(response.status).toBe(200);
+        const body = await response.json();
+
+        expect(body.rows).toEqual([{
+          fuel_product_id: fixtures.fuelProductId,
+          product_name: 'Test Petrol',
+          entries: 5,
+          quantity: 50,
+          net_sale_amount: 4775,
+        }]);
+      } finally {
+        await db.client.query('DELETE FROM sale_entries WHERE fuel_product_id = $1', [other.id]);
+        await db.client.query('DELETE FROM fuel_products WHERE id = $1', [other.id]);
+      }
+    });
+
+    test('should reject a malformed cursor', async () => {
+      const response = await fetch(`${app.baseUrl}/sale-entries?${range}&cursor=not-a-cursor`);
+      expect(response.status).toBe(400);
+    });
+
+    test('should stream every row as NDJSON', async () => {
+      const response = await fetch(`${app.baseUrl}/sale-entries?${range}&stream=1`);
+      expect(response.status).toBe(200);
+      expect(response.headers.get('content-type')).toMatch(/application\/x-ndjson/);
+
+      const lines = (await response.text()).split('\n').filter(Boolean).map(line => JSON.parse(line));
+      expect(lines.map(row => row.id)).toEqual(expected);
+      expect(lines[0]).toMatchObject({ sale_date: '1999-01-02', product_name: 'Test Petrol', pump_station: station });
+    });
+  });
+});
@@ -0,0 +1,144 @@
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import { randomUUID } from 'crypto';
+import mongoose from 'mongoose';
+import { startTestApp, type TestApp } from '../setup/integration-setup';
+import { saleEntriesRouter } from '../../server/routes/sale_entries';
+import { FuelProduct, Nozzle, SaleEntry, Tank, User } from '../../server/models';
+
+// The sale entry routes take their MongoDB path when DATABASE_URL is unset.
+describe.skipIf(!process.env.MONGODB_URI)('Sale Entries Mongo Integration Tests', () => {
+  let app: TestApp;
+  let databaseUrl: string | undefined;
+  // Rows written by a test carry its pump station, so cleanup ignores other data.
+  let station: string;
+  const petrolId = randomUUID();
+  const dieselId = randomUUID();
+
+  const entry = (overrides: Record<string, any> = {}) => ({
+    saleDate: new Date('1998-03-01'),
+    pumpStation: station,
+    nozzleId: randomUUID(),
+    fuelProductId: petrolId,
+    openingReading: 1000,
+    closingReading: 1100,
+    pricePerUnit: 95,
+    quantity: 100,
+    netSaleAmount: 9500,
+    employeeId: randomUUID(),
+    ...overrides,
+  });
+
+  const get = async (path: string) => {
+    const response = await fetch(`${app.baseUrl}${path}`);
+    return { status: response.status, body: await response.json() };
+  };
+
+  beforeAll(async () => {
+    databaseUrl = process.env.DATABASE_URL;
+    delete process.env.DATABASE_URL;
+    await mongoose.connect(process.env.MONGODB_URI!);
+    await FuelProduct.create([
+      { _id: petrolId, productName: `Test Petrol ${petrolId.slice(0, 8)}`, shortName: 'TP', lfrn: 'T1' },
+      { _id: dieselId, productName: `Test Diesel ${dieselId.slice(0, 8)}`, shortName: 'TD', lfrn: 'T2' },
+    ]);
+    app = await startTestApp(saleEntriesRouter);
+  });
+
+  afterAll(async () => {
+    await SaleEntry.deleteMany({ pumpStation: /^Test Pump / });
+    await FuelProduct.deleteMany({ _id: { $in: [petrolId, dieselId] } });
+    await app.close();
+    await mongoose.disconnect();
+    if (databaseUrl !== undefined) process.env.DATABASE_URL = databaseUrl;
+  });
+
+  beforeEach(async () => {
+    await SaleEntry.deleteMany({ pumpStation: /^Test Pump / });
+    station = `Test Pump ${randomUUID().slice(0, 8)}`;
+  });
+
+  test('should total only the requested product', async () => {
+    await SaleEntry.create([
+      entry(),
+      entry({ quantity: 50, netSaleAmount: 4750 }),
+      entry({ fuelProductId: dieselId, quantity: 10, netSaleAmount: 900 }),
+    ]);
+
+    const { status, body } = await get(`/sale-entries/totals?from=1998-03-01&to=1998-03-01&product=Test Petrol ${petrolId.slice(0, 8)}`);
+
+    expect(status).toBe(200);
+    expect(body.rows).toEqual([{
+      fuel_product_id: petrolId,
+      product_name: `Test Petrol ${petrolId.slice(0, 8)}`,
+      entries: 2,
+      quantity: 150,
+      net_sale_amount: 14250,
+    }]);
+    expect(body.total).toEqual({ entries: 2, quantity: 150, net_sale_amount: 14250 });
+  });
+
+  test('should report the last closing reading of every active nozzle', async () => {
+    const [walked, unused, tied] = [randomUUID(), randomUUID(), randomUUID()];
+    await Nozzle.create([walked, unused, tied].map((id, i) => (
+      { _id: id, nozzleNumber: `TN-${station}-${i}`, pumpStation: station, fuelProductId: petrolId }
+    )));
+    // Raw inserts keep the given createdAt (the schema's timestamps would not)
+    const reading = (nozzleId: string, saleDate: string, createdAt: string, closingReading: number) =>
+      ({ ...entry({ nozzleId, closingReading }), saleDate: new Date(saleDate), createdAt: new Date(createdAt) });
+    await SaleEntry.collection.insertMany([
+      // Latest saleDate wins, whatever the insert order
+      reading(walked, '1999-02-01', '1999-02-01T08:00:00Z', 100),
+      reading(walked, '1999-02-03', '1999-02-03T08:00:00Z', 300),
+      reading(walked, '1999-02-02', '1999-02-02T08:00:00Z', 200),
+      // Same saleDate: the later createdAt wins, as the per-nozzle
+      // findOne().sort({ saleDate: -1, createdAt: -1 }) picked it
+      reading(tied, '1999-02-05', '1999-02-05T10:00:00Z', 500),
+      reading(tied, '1999-02-05', '1999-02-05T09:00:00Z', 450),
+    ]);
+
+    try {
+      const { status, body } = await get('/nozzles-with-last-readings?date=1999-02-05');
+      expect(status).toBe(200);
+      const last = (id: string) => body.rows.find((r: any) => r.id === id)?.last_closing_reading;
+
+      expect(last(walked)).toBe(300);
+      expect(last(unused)).toBe('0');
+      expect(last(tied)).toBe(500);
+    } finally {
+      await Nozzle.deleteMany({ _id: { $in: [walked, unused, tied] } });
+    }
+  });
+
+  test('should join nozzle, tank, product and user names into the listing', async () => {
+    const tankId = randomUUID();
+    const nozzleId = randomUUID();
+    await Tank.create({ _id: tankId, tankNumber: `TT-${station}`, fuelProductId: petrolId });
+    await Nozzle.create({ _id: nozzleId, nozzleNumber: `TN-${station}`, tankId, fuelProductId: petrolId });
+    const user = await User.create({ email: `${randomUUID()}@example.com`, passwordHash: 'x', fullName: 'Test Cashier' });
+    await SaleEntry.create([
+      entry({ saleDate: new Date('1998-04-01'), nozzleId, createdBy: String(user._id) }),
+      // Ids that are not ObjectIds (User) or match nothing are skipped, not a CastError
+      entry({ saleDate: new Date('1998-04-01'), nozzleId: 'legacy-nozzle', createdBy: 'legacy-user' }),
+    ]);
+
+    try {
+      const { status, body } = await get('/sale-entries?from=1998-04-01&to=1998-04-01');
+      expect(status).toBe(200);
+
+      const byNozzle = (number: string) => body.rows.find((r: any) => r.nozzle_number === number);
+      expect(byNozzle(`TN-${station}`)).toMatchObject({
+        tank_number: `TT-${station}`,
+        product_name: `Test Petrol ${petrolId.slice(0, 8)}`,
+        created_by: 'Test Cashier',
+      });
+      expect(body.rows).toContainEqual(expect.objectContaining({
+        nozzle_number: '', tank_number: '', created_by: '', employee_name: '',
+        product_name: `Test Petrol ${petrolId.slice(0, 8)}`,
+      }));
+    } finally {
+      await Nozzle.deleteMany({ _id: nozzleId });
+      await Tank.deleteMany({ _id: tankId });
+      await User.deleteMany({ _id: user._id });
+    }
+  });
+});
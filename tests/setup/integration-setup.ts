@@ -3,6 +3,9 @@ import { config } from 'dotenv';
 import path from 'path';
 import fs from 'fs';
 import { execSync } from 'child_process';
+import { once } from 'events';
+import type { AddressInfo } from 'net';
+import express, { type Router } from 'express';
 
 // Load environment variables
 config();
@@ -151,6 +154,28 @@ export async function createTestFixtures(client: Client) {
   };
 }
 
+export interface TestApp {
+  baseUrl: string;
+  close: () => Promise<void>;
+}
+
+/**
+ * Serves routers under /api on a free local port, without the auth
+ * middleware, so tests can call the real route handlers over HTTP
+ */
+export async function startTestApp(...routers: Router[]): Promise<TestApp> {
+  const app = express();
+  app.use(express.json({ limit: '50mb' }));
+  app.use('/api', ...routers);
+  const server = app.listen(0, '127.0.0.1');
+  await once(server, 'listening');
+  const { port } = server.address() as AddressInfo;
+  return {
+    baseUrl: `http://127.0.0.1:${port}/api`,
+    close: () => new Promise<void>((resolve) => server.close(() => resolve())),
+  };
+}
+
 /**
  * Assertion helpers for database state
  */
@@ -1,79 +0,0 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Look for any navigation or login link/button to access the login page or form.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Try to reload the page or check for any error messages or alternative URLs.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Try to reload the page or use keyboard input simulation to enter credentials if possible.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Try to scroll or interact with the page to trigger detection of interactive elements or reload the page to fix detection issues.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        assert False, 'Test failed: Expected result unknown, forcing failure.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
@@ -1,137 +0,0 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Find and navigate to the login page or login form
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Try to reload the page to see if the login form appears or check for any hidden elements
-        await page.goto('http://localhost:5000/', timeout=10000)
-        
-
-        # Input valid username/email and password, then click login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('@Tkhg998899')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Correct the email input to a valid email format and retry login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Verify that the session token is issued and stored securely, then verify user role and access to role-specific resources.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Try to extract session token and role information from cookies or local storage, or verify role-based access by checking presence of role-specific UI elements.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Complete verification by checking access to another role-specific resource such as Dashboard or Invoice, then finalize the test.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Verify access to Invoice page as another role-specific resource to confirm role permissions.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Verify access to another role-specific resource such as Day Business or Product Stock to further confirm role permissions.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Verify access to Product Stock page as another role-specific resource to further confirm role permissions.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Perform logout to verify session termination and complete the test.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -48,17 +50,17 @@ async def run_test():
         # Input invalid email/username and password
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invaliduser@example.com')
+        await waits.actionable(elem); await elem.fill('invaliduser@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await waits.actionable(elem); await elem.fill('wrongpassword')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
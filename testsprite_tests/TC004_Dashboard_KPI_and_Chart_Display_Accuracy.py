@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -52,95 +54,97 @@ async def run_test():
         # Input email and password, then click login button to access dashboard.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz')
+        await waits.actionable(elem); await elem.fill('Rockarz')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('@Tkhg998899')
+        await waits.actionable(elem); await elem.fill('@Tkhg998899')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Clear the email input, enter a valid email format for user 'Rockarz', re-enter password, and click login.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.actionable(elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz@example.com')
+        await waits.actionable(elem); await elem.fill('Rockarz@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('@Tkhg998899')
+        await waits.actionable(elem); await elem.fill('@Tkhg998899')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Add a new sale transaction and verify that the charts update in real-time on the dashboard.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Fill in customer name, vehicle number, select payment mode, fuel type, quantity, and generate the invoice to add a new sale transaction.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Customer')
+        await waits.actionable(elem); await elem.fill('Test Customer')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('XX-12-AB-3456')
+        await waits.actionable(elem); await elem.fill('XX-12-AB-3456')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Select 'Cash' as payment mode, then select fuel type, enter quantity, and generate the invoice.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/div/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Select fuel type, enter quantity, and generate the invoice to add a new sale transaction.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Select 'Petrol' as fuel type, enter quantity (e.g., 50 liters), and generate the invoice.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/div/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Enter quantity as 50 liters and click 'Generate Invoice' to add the new sale transaction.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('50')
+        await waits.actionable(elem); await elem.fill('50')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem)
+        async with waits.api_response(page, '/api/guest-sales', method='POST'):
+            await elem.click(timeout=5000)
         
 
         # Navigate back to the dashboard page and verify that KPIs and charts update in real-time reflecting the new sale transaction.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assertion: Verify dashboard loads within 3 seconds by checking the dashboard title visibility with timeout 3000ms
@@ -1,6 +1,13 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+from harness.perf import PerfCapture
+
+# Budgets measured from navigation start of the dashboard document
+MAX_KPI_VISIBLE_MS = 3000
+MAX_CHARTS_VISIBLE_MS = 5000
+
 async def run_test():
     pw = None
     browser = None
@@ -24,6 +31,9 @@ async def run_test():
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
         context.set_default_timeout(5000)
+
+        # Capture navigation/resource timing, long tasks and CDP metrics for every page
+        perf = await PerfCapture.install(context, "TC009_Dashboard_and_Search_Performance_under_Load")
         
         # Open a new page in the browser context
         page = await context.new_page()
@@ -45,7 +55,32 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        assert False, 'Test plan execution failed: generic failure assertion.'
+        # Input username and password, then click login button to reach the dashboard.
+        frame = context.pages[-1]
+        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
+        await waits.actionable(elem); await elem.fill('Rockarz')
+        
+
+        frame = context.pages[-1]
+        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+        await waits.actionable(elem); await elem.fill('@Tkhg998899')
+        
+
+        frame = context.pages[-1]
+        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
+        await waits.actionable(elem); await elem.click(timeout=5000)
+        
+
+        # Reload the dashboard so its navigation timing starts clean, then time KPIs and charts.
+        await page.goto("http://localhost:5000/", wait_until="commit", timeout=10000)
+        kpi_ms = await perf.mark_visible(page, 'text=Fuel Sale:', 'kpi-visible')
+        charts_ms = await perf.mark_visible(page, '.recharts-surface', 'charts-visible')
+        artifact = await perf.write()
+        print(f"KPI visible at {kpi_ms:.0f} ms, charts at {charts_ms:.0f} ms ({artifact})")
+
+        # Assertion: dashboard KPIs and Recharts panels render within budget
+        assert kpi_ms <= MAX_KPI_VISIBLE_MS, f"KPIs took {kpi_ms:.0f} ms to appear (budget {MAX_KPI_VISIBLE_MS} ms)"
+        assert charts_ms <= MAX_CHARTS_VISIBLE_MS, f"Charts took {charts_ms:.0f} ms to appear (budget {MAX_CHARTS_VISIBLE_MS} ms)"
         await asyncio.sleep(5)
     
     finally:
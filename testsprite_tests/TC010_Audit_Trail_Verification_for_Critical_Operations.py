@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -56,51 +58,51 @@ async def run_test():
         # Input username 'test' and password 'TestSprite123!' and click login.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test')
+        await waits.actionable(elem); await elem.fill('test')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestSprite123!')
+        await waits.actionable(elem); await elem.fill('TestSprite123!')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Perform add operation in Invoice section to generate audit log entry for creation.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Perform add operation in 'Liquid Purchase' to generate audit log entry for creation.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Fill in the required fields for a new Liquid Purchase invoice and click SAVE to create the record.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('INV12345')
+        await waits.actionable(elem); await elem.fill('INV12345')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/input[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test liquid purchase invoice')
+        await waits.actionable(elem); await elem.fill('Test liquid purchase invoice')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Try to open the Vendor dropdown using keyboard navigation or scroll to reveal options, then select a vendor to proceed.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assert that audit logs capture creation operation with correct user and timestamp details
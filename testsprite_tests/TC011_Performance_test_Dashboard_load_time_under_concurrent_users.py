@@ -1,6 +1,16 @@
 import asyncio
+import time
 from playwright import async_api
 
+from harness.load import LoadConfig, run_load
+
+# Budget for a dashboard page load while other station users are active
+VIRTUAL_USERS = 25
+ARRIVAL_RATE = 10.0
+MAX_DASHBOARD_LOAD_SECONDS = 3.0
+MAX_P95_SECONDS = 2.0
+MAX_ERROR_RATE = 0.01
+
 async def run_test():
     pw = None
     browser = None
@@ -44,8 +54,22 @@ async def run_test():
             except async_api.Error:
                 pass
         
-        # Interact with the page elements to simulate user flow
-        assert False, 'Test plan execution failed: generic failure assertion.'
+        # Start concurrent virtual users, then time a dashboard load while they run
+        load = asyncio.create_task(run_load(LoadConfig(users=VIRTUAL_USERS, arrival_rate=ARRIVAL_RATE, rounds=3)))
+        await asyncio.sleep(VIRTUAL_USERS / ARRIVAL_RATE / 2)
+        started = time.perf_counter()
+        await page.goto("http://localhost:5000", wait_until="networkidle", timeout=30000)
+        dashboard_load = time.perf_counter() - started
+        report = await load
+        report.print_table()
+        print(f"dashboard load under {VIRTUAL_USERS} users: {dashboard_load:.2f}s")
+
+        # Assertion: dashboard loads within budget and the API holds up under the same load
+        assert dashboard_load <= MAX_DASHBOARD_LOAD_SECONDS, f"Dashboard took {dashboard_load:.2f}s under load"
+        assert report.timeouts == 0, f"{report.timeouts} requests hit the server's 30s soft timeout"
+        for endpoint, stats in report.endpoints.items():
+            assert stats.error_rate <= MAX_ERROR_RATE, f"{endpoint} error rate {stats.error_rate:.1%} over {MAX_ERROR_RATE:.0%}"
+            assert stats.p95 <= MAX_P95_SECONDS, f"{endpoint} p95 {stats.p95:.2f}s over {MAX_P95_SECONDS}s"
         await asyncio.sleep(5)
     
     finally:
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -56,71 +58,71 @@ async def run_test():
         # Input username and password, then click the login button to authenticate.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test')
+        await waits.actionable(elem); await elem.fill('test')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestSprite123!')
+        await waits.actionable(elem); await elem.fill('TestSprite123!')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Navigate sequentially through each main menu item (Dashboard, Invoice, Day Business, Statement Generation, Product Stock, Shift Sheet Entry, Busi. Cr/Dr Trxns, Vendor Transaction, Reports, Generate SaleInvoice, Generated Invoices, Credit Limit Reports, Relational features) and verify UI components render correctly without errors.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Liquid Purchase' sub-menu item to load and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Lubs Purchase' sub-menu item to load and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Day Business' menu to navigate and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Day Assignings' sub-menu item to load and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Daily Sale Rate' sub-menu item to load and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Sale Entry' menu item to navigate and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Lub Sale' menu item to navigate and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on 'Swipe' menu item to navigate and validate its UI components.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[2]/div/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assert page title is correct and contains expected text
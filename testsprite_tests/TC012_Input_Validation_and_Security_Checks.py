@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -60,94 +62,94 @@ async def run_test():
         # Return to home page and look for accessible pages or links that contain user input forms for validation testing.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Attempt input of special characters and script tags in the email and password fields to test input sanitization and validation.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('XSS')</script>")
+        await waits.actionable(elem); await elem.fill("<script>alert('XSS')</script>")
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('XSS')</script>")
+        await waits.actionable(elem); await elem.fill("<script>alert('XSS')</script>")
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Attempt SQL injection strings in the email and password fields to verify input sanitization and protection against injection attacks.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("admin' OR '1'='1")
+        await waits.actionable(elem); await elem.fill("admin' OR '1'='1")
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click on the 'Sign Up' tab to access the registration form and test input validation for special characters, SQL injection, and invalid data formats.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Submit the form with the current SQL injection string in the email field and valid passwords to verify input sanitization and validation enforcement.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Test input of special characters and script tags in the Sign Up form fields to verify input sanitization and validation enforcement.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('XSS')</script>")
+        await waits.actionable(elem); await elem.fill("<script>alert('XSS')</script>")
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Test input of invalid data formats such as incorrect dates, negative amounts, and empty mandatory fields in other accessible forms or fields.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Clear the email and password fields, then input invalid data formats such as empty email, invalid email format, and test submission to verify validation warnings and blocking of submission.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.actionable(elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.actionable(elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Test invalid data formats such as incorrect dates and negative amounts in other accessible forms or modules, if available, to verify validation enforcement and warnings.
@@ -157,7 +159,7 @@ async def run_test():
         # Return to home page to conclude testing due to lack of accessible input forms for further validation.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assert that special characters and script tags are rejected or sanitized in login form fields
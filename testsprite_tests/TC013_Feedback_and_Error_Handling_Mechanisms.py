@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -56,106 +58,106 @@ async def run_test():
         # Submit the login form with empty email and password fields to trigger validation errors.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.actionable(elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.actionable(elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Test input validation by entering invalid email format and valid password, then submit to check error message clarity.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email-format')
+        await waits.actionable(elem); await elem.fill('invalid-email-format')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestSprite123!')
+        await waits.actionable(elem); await elem.fill('TestSprite123!')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Attempt login with valid username 'test' and incorrect password to trigger authentication error and verify error message clarity.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test')
+        await waits.actionable(elem); await elem.fill('test')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await waits.actionable(elem); await elem.fill('wrongpassword')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Attempt an unauthorized action by clicking on 'Relational features' which may require special permissions, to verify access denied messages.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Try to trigger system error or failure by clicking on 'Generate SaleInvoice' button (index 9) which might cause an error if system is down or data is missing.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div/div[2]/div/div/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Submit the 'Generate Sale Invoice' form with all required fields empty to trigger validation errors and verify error messages.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Simulate a system failure or error boundary by attempting to generate an invoice with invalid or missing critical data to check for appropriate error handling and retry or support options.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Customer')
+        await waits.actionable(elem); await elem.fill('Test Customer')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('XX-00-XX-0000')
+        await waits.actionable(elem); await elem.fill('XX-00-XX-0000')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await waits.actionable(elem); await elem.fill('10')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click the Payment Mode button (index 32), then select a valid payment mode option from the dropdown. After that, click the Fuel Type button (index 33) and select a valid fuel type option from the dropdown.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Select 'Cash' as the payment mode from the dropdown options.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/div/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Click the Fuel Type button (index 33) to open the dropdown and select a valid fuel type option.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/main/div/div[2]/div[2]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assertion for input validation error messages visibility and clarity after submitting invalid form data
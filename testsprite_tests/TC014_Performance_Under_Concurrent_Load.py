@@ -1,6 +1,14 @@
 import asyncio
 from playwright import async_api
 
+from harness.load import LoadConfig, run_load
+
+# Budget for the dashboard API fan-out under concurrent station users
+VIRTUAL_USERS = 25
+ARRIVAL_RATE = 5.0
+MAX_P95_SECONDS = 2.0
+MAX_ERROR_RATE = 0.01
+
 async def run_test():
     pw = None
     browser = None
@@ -44,8 +52,15 @@ async def run_test():
             except async_api.Error:
                 pass
         
-        # Interact with the page elements to simulate user flow
-        assert False, 'Test plan execution failed: generic failure assertion.'
+        # Drive concurrent virtual users through the dashboard API fan-out
+        report = await run_load(LoadConfig(users=VIRTUAL_USERS, arrival_rate=ARRIVAL_RATE, rounds=3))
+        report.print_table()
+
+        # Assertion: no soft timeouts and every endpoint stays inside the latency/error budget
+        assert report.timeouts == 0, f"{report.timeouts} requests hit the server's 30s soft timeout"
+        for endpoint, stats in report.endpoints.items():
+            assert stats.error_rate <= MAX_ERROR_RATE, f"{endpoint} error rate {stats.error_rate:.1%} over {MAX_ERROR_RATE:.0%}"
+            assert stats.p95 <= MAX_P95_SECONDS, f"{endpoint} p95 {stats.p95:.2f}s over {MAX_P95_SECONDS}s"
         await asyncio.sleep(5)
     
     finally:
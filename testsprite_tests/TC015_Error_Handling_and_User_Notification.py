@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -56,23 +58,23 @@ async def run_test():
         # Submit empty login form to trigger invalid form submission error and check error message.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Input invalid credentials and submit login form to trigger unauthorized error message and verify it is clear and non-sensitive.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invaliduser@example.com')
+        await waits.actionable(elem); await elem.fill('invaliduser@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await waits.actionable(elem); await elem.fill('wrongpassword')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Simulate a failed network request or server error and verify the error message is clear, actionable, and non-sensitive.
@@ -82,77 +84,77 @@ async def run_test():
         # Click 'Return to Home' link to navigate back to a valid page and then find other ways to trigger failed network requests or server errors.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Attempt to trigger a failed network request or server error by submitting a form or performing an action that can fail, and verify the error message is clear and non-sensitive.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz')
+        await waits.actionable(elem); await elem.fill('Rockarz')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('@Tkhg998899')
+        await waits.actionable(elem); await elem.fill('@Tkhg998899')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Navigate to Sign Up page to test invalid form submission and error messages there.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Submit the Sign Up form with invalid email format to trigger validation error and verify the error message is clear and non-sensitive.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalidemail')
+        await waits.actionable(elem); await elem.fill('invalidemail')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Submit Sign Up form with mismatched passwords to trigger validation error and verify the error message is clear and non-sensitive.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
+        await waits.actionable(elem); await elem.fill('user@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await waits.actionable(elem); await elem.fill('password123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password321')
+        await waits.actionable(elem); await elem.fill('password321')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Navigate to Super Admin Panel or Master Data Management to trigger and verify error messages for failed operations or unauthorized actions.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.actionable(elem); await elem.click(timeout=5000)
         
 
         # Assertion: Verify user-friendly error message for empty login form submission
@@ -1,120 +0,0 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Input login credentials and submit on desktop viewport.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rockarz@gmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('@Tkhg998899')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Test UI layout responsiveness on desktop viewport without login, then switch to tablet viewport.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Change viewport to tablet size and verify layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        # Change viewport to tablet size and verify the login page layout adapts without broken elements or content overflow.
-        await page.goto('http://localhost:5000/login', timeout=10000)
-        
-
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
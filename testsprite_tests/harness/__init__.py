@@ -0,0 +1,17 @@
+"""Local harness for the generated TestSprite ``TC*.py`` flows.
+
+The generated files are standalone scripts that each start Playwright,
+launch Chromium and call ``asyncio.run(run_test())`` at import time.  The
+harness loads their ``run_test`` coroutines without executing them and
+runs the whole suite on a single event loop against one shared browser.
+Files that were only generated steps have been compiled into
+``flows/*.json`` and run through :mod:`harness.engine`.
+
+Run it from the ``testsprite_tests`` directory::
+
+    python -m harness --help
+"""
+
+from .loader import TestCase, discover, load_test
+
+__all__ = ["TestCase", "discover", "load_test"]
@@ -0,0 +1,408 @@
+"""HTTP-level API conformance and latency suite.
+
+``TC020_API_endpoints_CRUD_operations_validation`` and the master-data
+cases check CRUD through the UI, which takes minutes per case.  This suite
+runs the same checks over ``httpx`` in seconds, with one logged-in client
+(one shared ``token`` cookie) and every flow running concurrently:
+
+* :data:`RESOURCES` - create -> read back from the list -> update -> read
+  the change back -> delete -> check it is gone (or inactive, for soft
+  deletes);
+* custom flows for daily sale rates (upsert) and sale entries (created with
+  no ids returned, removed via ``/sale-entries/:id`` and
+  ``/sale-entries-batch``);
+* a smoke ``GET`` of every other list and report route, with the query
+  from :data:`SMOKE_QUERIES` for routes that require one.
+
+The routes come from the router files themselves
+(``server/routes/relational.ts``, ``sale_entries.ts``, ``daily_rates.ts``
+and ``reports.ts``, mounted as in ``server/routes.ts``).  A route that no
+check calls and that is not listed in :data:`SKIPPED` is a failure, so a new
+endpoint cannot slip past the suite.  Records are created far in the future
+(:data:`FLOW_DATE`) and named after ``TESTSPRITE_NAMESPACE``, so they never
+show up on the dashboard and parallel runs do not collide.
+
+``python -m harness.apisuite`` prints per-route latency and writes
+``artifacts/api_suite.json``.  ``python -m harness --api-gate`` runs it
+first and skips the browser phase if it fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import calendar
+import json
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME
+from .load import LOGIN_PATH, EndpointStats
+from .loader import DEFAULT_BASE_URL, TESTS_DIR
+from .recorder import url_template
+from .shard import namespaced
+
+ROUTES_DIR = TESTS_DIR.parent / "server" / "routes"
+# Mount points from server/index.ts (``/api``) and server/routes.ts.
+ROUTE_FILES = {
+    "relational.ts": "/api",
+    "sale_entries.ts": "/api",
+    "daily_rates.ts": "/api",
+    "reports.ts": "/api/reports",
+}
+REPORT_FILE = TESTS_DIR / "artifacts" / "api_suite.json"
+FLOW_DATE = "2099-01-01"
+
+# Query strings for smoke GETs that answer 400 without them.
+SMOKE_QUERIES = {
+    "/api/attendance/summary": f"?employeeId=apisuite&month={int(FLOW_DATE[5:7])}&year={FLOW_DATE[:4]}",
+    "/api/attendance/details": f"?date={FLOW_DATE}",
+    "/api/duty-pay/details": f"?year={FLOW_DATE[:4]}&month={calendar.month_name[int(FLOW_DATE[5:7])]}",
+}
+
+_ROUTE_RE = re.compile(r'^\w+Router\.(get|post|put|patch|delete)\(\s*"([^"]+)"', re.MULTILINE)
+
+SKIPPED = {
+    "DELETE /api/credit-customers/cleanup-duplicates": "destructive: removes real duplicate customers",
+    **{f"POST /api/{path}": "no DELETE route, would leave rows behind" for path in (
+        "sheet-records", "day-cash-movements", "tanker-sales", "guest-sales", "attendance",
+        "attendance/bulk", "duty-pay/entry", "sales-officer", "credit-requests",
+        "tank-daily-readings", "feedback",
+    )},
+}
+
+
+def registered_routes(routes_dir: Path = ROUTES_DIR) -> List[str]:
+    """``"METHOD /api/path/:id"`` for every route in :data:`ROUTE_FILES`."""
+    routes: List[str] = []
+    for name, prefix in ROUTE_FILES.items():
+        for method, path in _ROUTE_RE.findall((routes_dir / name).read_text(encoding="utf-8")):
+            route = f"{method.upper()} {prefix}{path}"
+            if route not in routes:
+                routes.append(route)
+    return routes
+
+
+def _template(method: str, url: str) -> str:
+    return f"{method} {url_template(url)}"
+
+
+def _rows(body: Any) -> List[dict]:
+    if isinstance(body, dict):
+        rows = body.get("rows", body.get("data"))
+        return rows if isinstance(rows, list) else []
+    return body if isinstance(body, list) else []
+
+
+def _id_of(record: Any) -> Optional[str]:
+    if isinstance(record, list):
+        record = record[0] if record else None
+    if not isinstance(record, dict):
+        return None
+    value = record.get("id", record.get("_id"))
+    return str(value) if value is not None else None
+
+
+class CheckFailed(Exception):
+    pass
+
+
+@dataclass
+class Failure:
+    check: str
+    route: str
+    message: str
+
+
+@dataclass
+class SuiteResult:
+    elapsed: float = 0.0
+    routes: Dict[str, EndpointStats] = field(default_factory=dict)
+    failures: List[Failure] = field(default_factory=list)
+    registered: List[str] = field(default_factory=list)
+    checks: int = 0
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    @property
+    def uncovered(self) -> List[str]:
+        return [r for r in self.registered if r not in self.routes and r not in SKIPPED]
+
+    def to_dict(self) -> dict:
+        return {
+            "passed": self.passed,
+            "elapsed": self.elapsed,
+            "checks": self.checks,
+            "registered": len(self.registered),
+            "exercised": sum(1 for r in self.registered if r in self.routes),
+            "skipped": {r: SKIPPED[r] for r in self.registered if r in SKIPPED},
+            "failures": [vars(f) for f in self.failures],
+            "routes": {k: v.to_dict() for k, v in sorted(self.routes.items())},
+        }
+
+    def print_table(self) -> None:
+        print(f"{'route':<58}{'n':>4}{'p50 ms':>9}{'p95 ms':>9}{'err':>5}")
+        for route, s in sorted(self.routes.items(), key=lambda kv: kv[1].p95, reverse=True):
+            print(f"{route[:57]:<58}{s.count:>4}{s.p50 * 1000:>9.0f}{s.p95 * 1000:>9.0f}{s.errors:>5}")
+        for failure in self.failures:
+            print(f"FAIL {failure.check}: {failure.route}: {failure.message}")
+        exercised = sum(1 for r in self.registered if r in self.routes)
+        print(f"{self.checks} checks, {len(self.failures)} failed; {exercised}/{len(self.registered)} "
+              f"routes exercised, {len(SKIPPED)} skipped, in {self.elapsed:.2f}s")
+
+
+class Checker:
+    """One flow's view of the shared client: timed calls plus assertions."""
+
+    def __init__(self, name: str, client: httpx.AsyncClient, result: SuiteResult,
+                 limit: asyncio.Semaphore) -> None:
+        self.name = name
+        self.client = client
+        self.result = result
+        self.limit = limit
+
+    async def call(self, method: str, url: str, expect: Sequence[int] = (200,), **kwargs: Any) -> Any:
+        route = _template(method, url.split("?")[0])
+        stats = self.result.routes.setdefault(route, EndpointStats())
+        async with self.limit:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.HTTPError as exc:
+                stats.record(time.perf_counter() - started, None)
+                raise CheckFailed(f"{route}: {exc!r}") from exc
+            stats.record(time.perf_counter() - started, response.status_code)
+        if response.status_code not in expect:
+            raise CheckFailed(f"{route}: HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            body = response.json()
+        except ValueError:
+            raise CheckFailed(f"{route}: response is not JSON") from None
+        if isinstance(body, dict) and body.get("success") is False:
+            raise CheckFailed(f"{route}: success=false: {body.get('error')}")
+        return body
+
+    def expect(self, condition: bool, message: str) -> None:
+        if not condition:
+            raise CheckFailed(message)
+
+
+@dataclass
+class Resource:
+    """A CRUD resource under ``/api/<path>``."""
+
+    path: str
+    create: Callable[[str], dict]
+    update: Optional[dict] = None
+    list_query: str = ""
+
+    def find(self, rows: List[dict], record_id: str) -> Optional[dict]:
+        return next((r for r in rows if str(r.get("id", r.get("_id"))) == record_id), None)
+
+
+def _same(actual: Any, expected: Any) -> bool:
+    try:
+        return float(actual) == float(expected)
+    except (TypeError, ValueError):
+        return actual == expected
+
+
+RESOURCES = [
+    Resource("fuel-products",
+             lambda tag: {"product_name": f"API {tag}", "short_name": "API", "gst_percentage": 0,
+                          "tds_percentage": 0, "wgt_percentage": 0, "lfrn": ""},
+             update={"short_name": "APIU"}),
+    Resource("lubricants",
+             lambda tag: {"lubricant_name": f"API {tag}", "gst_percentage": 18, "mrp_rate": 100,
+                          "sale_rate": 90, "minimum_stock": 5},
+             update={"sale_rate": 95}),
+    Resource("interest-transactions",
+             lambda tag: {"transactionDate": FLOW_DATE, "transactionType": "Loan Taken",
+                          "partyName": f"API {tag}", "loanAmount": 1000},
+             update={"notes": "updated by harness.apisuite"},
+             list_query=f"?from={FLOW_DATE}&to={FLOW_DATE}"),
+    Resource("credit-customers",
+             lambda tag: {"organization_name": f"API {tag}", "phone_number": "9000000000",
+                          "credit_limit": 1000, "opening_balance": 0, "balance_type": "Due"},
+             update={"credit_limit": 2000}),
+    Resource("employees",
+             lambda tag: {"employee_name": f"API {tag}", "join_date": FLOW_DATE,
+                          "mobile_number": "9000000000", "designation": "Attendant",
+                          "salary_type": "Monthly", "salary": 1000},
+             update={"designation": "Supervisor"}),
+    Resource("expiry-items",
+             lambda tag: {"item_name": f"API {tag}", "expiry_date": FLOW_DATE, "category": "API"}),
+    Resource("categories", lambda tag: {"category_name": f"API {tag}", "description": "harness"}),
+    Resource("lubricant-sales",
+             lambda tag: {"saleDate": FLOW_DATE, "product": f"API {tag}", "saleRate": "10",
+                          "quantity": "1", "amount": "10"},
+             list_query=f"?from_date={FLOW_DATE}&to_date={FLOW_DATE}"),
+]
+
+# Fields the list endpoints return for an update sent in snake_case.
+_LIST_FIELD = {"short_name": "short_name", "sale_rate": "sale_rate", "notes": "notes",
+               "credit_limit": "creditLimit", "designation": "designation"}
+
+
+async def crud_flow(check: Checker, resource: Resource, tag: str) -> None:
+    base = f"/api/{resource.path}"
+    listing = base + resource.list_query
+    created = await check.call("POST", base, json=resource.create(tag))
+    record_id = _id_of(created.get("data")) or _id_of(created.get("rows"))
+    check.expect(record_id is not None, f"POST {base} returned no id")
+    try:
+        row = resource.find(_rows(await check.call("GET", listing)), record_id)
+        check.expect(row is not None, f"created {resource.path} {record_id} missing from GET {base}")
+        if resource.update:
+            await check.call("PUT", f"{base}/{record_id}", json=resource.update)
+            row = resource.find(_rows(await check.call("GET", listing)), record_id)
+            for key, value in resource.update.items():
+                field_name = _LIST_FIELD.get(key, key)
+                check.expect(row is not None and _same(row.get(field_name), value),
+                             f"PUT {base}/:id did not change {field_name}")
+    finally:
+        await check.call("DELETE", f"{base}/{record_id}")
+    row = resource.find(_rows(await check.call("GET", listing)), record_id)
+    check.expect(row is None or row.get("isActive", row.get("is_active")) is False,
+                 f"deleted {resource.path} {record_id} still listed as active")
+
+
+async def daily_rate_flow(check: Checker, tag: str) -> None:
+    products = _rows(await check.call("GET", "/api/fuel-products"))
+    check.expect(bool(products), "no fuel products to rate")
+    product_id = _id_of(products[0])
+    rate = {"rateDate": FLOW_DATE, "fuelProductId": product_id, "openRate": 100, "closeRate": 100}
+    first = _id_of((await check.call("POST", "/api/daily-sale-rates", json=[rate]))["data"])
+    try:
+        again = await check.call("POST", "/api/daily-sale-rates", json=[dict(rate, closeRate=101)])
+        check.expect(_id_of(again["data"]) == first, "re-posting a daily rate created a duplicate")
+        rows = _rows(await check.call("GET", f"/api/daily-sale-rates?date={FLOW_DATE}"))
+        mine = [r for r in rows if str(r.get("id")) == first]
+        check.expect(bool(mine) and _same(mine[0].get("close_rate", mine[0].get("closeRate")), 101),
+                     "daily rate upsert not visible in GET /api/daily-sale-rates")
+    finally:
+        await check.call("DELETE", f"/api/daily-sale-rates/{first}")
+
+
+async def sale_entry_flow(check: Checker, tag: str) -> None:
+    nozzles = _rows(await check.call("GET", "/api/nozzles-list"))
+    check.expect(bool(nozzles), "no nozzles to book sales on")
+    nozzle = nozzles[0]
+    entries = [{"sale_date": FLOW_DATE, "nozzle_id": nozzle["id"], "pump_station": nozzle.get("pump_station"),
+                "fuel_product_id": nozzle.get("fuel_product_id"), "opening_reading": 1000 + i * 10,
+                "closing_reading": 1010 + i * 10, "test_qty": 0, "price_per_unit": 100} for i in range(2)]
+    window = f"/api/sale-entries?from={FLOW_DATE}&to={FLOW_DATE}"
+    created = await check.call("POST", "/api/sale-entries", json=entries)
+    ids = [str(i) for i in created.get("ids") or []]
+    check.expect(created.get("count") == len(entries) == len(ids),
+                 f"POST /api/sale-entries saved {created.get('count')} with {len(ids)} ids")
+    listed = {_id_of(r) for r in _rows(await check.call("GET", window))}
+    check.expect(listed >= set(ids), f"{len(set(ids) - listed)} of {len(ids)} new sale entries not listed")
+    if ids:
+        await check.call("DELETE", f"/api/sale-entries/{ids[0]}")
+    if ids[1:]:
+        await check.call("DELETE", "/api/sale-entries-batch", json={"ids": ids[1:]})
+    left = {_id_of(r) for r in _rows(await check.call("GET", window))} & set(ids)
+    check.expect(not left, f"{len(left)} deleted sale entries still listed")
+
+
+async def harmless_writes(check: Checker, tag: str) -> None:
+    await check.call("PUT", "/api/lubricants/bulk-rate", json={"rates": []})
+    await check.call("POST", "/api/reports/run", json={})
+
+
+FLOWS: Dict[str, Callable[[Checker, str], Awaitable[None]]] = {
+    **{f"crud {r.path}": (lambda resource: lambda check, tag: crud_flow(check, resource, tag))(r)
+       for r in RESOURCES},
+    "daily-sale-rates upsert": daily_rate_flow,
+    "sale-entries": sale_entry_flow,
+    "bulk-rate and report run": harmless_writes,
+}
+
+
+async def run_suite(base_url: str = DEFAULT_BASE_URL, username: str = DEFAULT_USERNAME,
+                    password: str = DEFAULT_PASSWORD, concurrency: int = 16,
+                    select: Optional[Sequence[str]] = None, timeout: float = 35.0) -> SuiteResult:
+    """Log in once, then run every flow and smoke check concurrently."""
+    result = SuiteResult(registered=registered_routes())
+    limit = asyncio.Semaphore(concurrency)
+    tag = namespaced(f"apisuite {uuid.uuid4().hex[:8]}")
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        login = await client.post(LOGIN_PATH, json={"email": username, "password": password})
+        if login.status_code != 200:
+            result.failures.append(Failure("login", f"POST {LOGIN_PATH}", f"HTTP {login.status_code}"))
+            return result
+
+        checks: Dict[str, Callable[[Checker], Awaitable[Any]]] = {
+            name: (lambda flow: lambda check: flow(check, tag))(flow)
+            for name, flow in FLOWS.items()
+        }
+        flow_routes = {"GET /api/fuel-products", "GET /api/nozzles-list", "GET /api/sale-entries",
+                       "GET /api/daily-sale-rates"} | {f"GET /api/{r.path}" for r in RESOURCES}
+        for route in result.registered:
+            method, path = route.split(" ", 1)
+            if method == "GET" and ":" not in path and route not in flow_routes:
+                url = path + SMOKE_QUERIES.get(path, "")
+                checks[f"smoke {path}"] = (lambda u: lambda check: check.call("GET", u))(url)
+        if select:
+            checks = {k: v for k, v in checks.items() if any(s in k for s in select)}
+
+        async def run_check(name: str, body: Callable[[Checker], Awaitable[Any]]) -> None:
+            try:
+                await body(Checker(name, client, result, limit))
+            except CheckFailed as exc:
+                route, _, message = str(exc).partition(": ")
+                result.failures.append(Failure(name, route, message or route))
+
+        result.checks = len(checks)
+        await asyncio.gather(*(run_check(name, body) for name, body in checks.items()))
+    result.elapsed = time.perf_counter() - started
+    for stats in result.routes.values():
+        stats.window = result.elapsed
+    # Routes behind a failed step are uncovered too; only a clean run means
+    # the suite itself lacks a check.
+    if not select and not result.failures:
+        for route in result.uncovered:
+            result.failures.append(Failure("coverage", route, "registered but not exercised or skipped"))
+    return result
+
+
+def write_result(result: SuiteResult, path: Path = REPORT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result.to_dict(), indent=2))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.apisuite", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight (default: 16)")
+    parser.add_argument("-k", dest="select", action="append",
+                        help="only run checks whose name contains this (repeatable; skips the coverage check)")
+    parser.add_argument("--list", action="store_true", help="print the registered routes and exit")
+    args = parser.parse_args(argv)
+    if args.list:
+        for route in registered_routes():
+            print(f"{route:<60}{SKIPPED.get(route, '')}")
+        return 0
+    result = asyncio.run(run_suite(args.base_url, args.username, args.password,
+                                   args.concurrency, args.select))
+    result.print_table()
+    write_result(result)
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Log in once per suite and reuse the session cookie in every test.
+
+Most generated tests start with the same 3-6 UI steps that type the
+``Rockarz`` credentials into the login form.  :class:`AuthCache` instead calls
+``POST /api/auth/login`` directly, saves the ``token`` httpOnly cookie as a
+Playwright ``storage_state`` file, and the runner opens every non-auth test's
+context from that file.  The loader strips the now-redundant login-form steps
+from those tests (see :func:`harness.loader.strip_ui_login`).
+
+The cached file is reused across runs until either
+
+* the JWT is within :data:`EXPIRY_MARGIN` of its ``exp`` claim (the server
+  signs with ``JWT_EXPIRES_IN = '7d'`` in ``server/auth.ts``), or
+* its HS256 signature no longer verifies against the server's
+  ``JWT_SECRET``, i.e. the secret was rotated.
+
+When ``JWT_SECRET`` cannot be read locally (remote server), one
+``GET /api/auth/me`` probe decides instead.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from .loader import TESTS_DIR
+
+REPO_ROOT = TESTS_DIR.parent
+DEFAULT_STATE_FILE = TESTS_DIR / "artifacts" / "auth" / "storage_state.json"
+DEFAULT_USERNAME = "Rockarz"
+DEFAULT_PASSWORD = "@Tkhg998899"
+
+# Refresh a day early so a long suite never runs into the expiry.
+EXPIRY_MARGIN = 24 * 60 * 60
+
+
+def state_file_for(namespace: Optional[str] = None) -> Path:
+    """Storage-state path for a shard namespace (``TESTSPRITE_NAMESPACE``).
+
+    Cookies are not port-scoped, so shards logged in as different users must
+    not share one file.
+    """
+    namespace = namespace if namespace is not None else os.environ.get("TESTSPRITE_NAMESPACE")
+    if not namespace:
+        return DEFAULT_STATE_FILE
+    return DEFAULT_STATE_FILE.with_name(f"storage_state.{namespace}.json")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _read_env_file(path: Path) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    if not path.exists():
+        return values
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+def server_env(key: str) -> Optional[str]:
+    """Resolve a server setting the way ``server/index.ts`` does.
+
+    Process env wins, then ``.env`` (``dotenv/config``), then ``.local.env``.
+    """
+    if os.environ.get(key):
+        return os.environ[key]
+    for name in (".env", ".local.env"):
+        value = _read_env_file(REPO_ROOT / name).get(key)
+        if value:
+            return value
+    return None
+
+
+def server_jwt_secret() -> Optional[str]:
+    return server_env("JWT_SECRET")
+
+
+def decode_jwt(token: str) -> Dict[str, Any]:
+    """Return the JWT payload without verifying it."""
+    return json.loads(_b64url_decode(token.split(".")[1]))
+
+
+def encode_jwt(payload: Dict[str, Any], secret: str) -> str:
+    """HS256-sign ``payload`` the way ``jsonwebtoken`` does."""
+    def b64(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    header = b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    body = b64(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{b64(signature)}"
+
+
+def jwt_signature_valid(token: str, secret: str) -> bool:
+    header, payload, signature = token.split(".")
+    expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return hmac.compare_digest(expected, _b64url_decode(signature))
+
+
+class AuthCache:
+    """Session-scoped login producing a reusable ``storage_state`` file."""
+
+    def __init__(
+        self,
+        base_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        state_file: Optional[Path] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.username = username or os.environ.get("TESTSPRITE_USERNAME", DEFAULT_USERNAME)
+        self.password = password or os.environ.get("TESTSPRITE_PASSWORD", DEFAULT_PASSWORD)
+        self.state_file = state_file or state_file_for()
+        self.reused = False
+
+    def _cached_token(self) -> Optional[str]:
+        if not self.state_file.exists():
+            return None
+        try:
+            state = json.loads(self.state_file.read_text())
+        except ValueError:
+            return None
+        host = urlparse(self.base_url).hostname
+        for cookie in state.get("cookies", []):
+            if cookie.get("name") == "token" and cookie.get("domain", "").lstrip(".") == host:
+                return cookie.get("value")
+        return None
+
+    async def _still_valid(self, playwright: Any, token: str) -> bool:
+        try:
+            claims = decode_jwt(token)
+        except (ValueError, IndexError):
+            return False
+        if claims.get("exp", 0) - time.time() < EXPIRY_MARGIN:
+            return False
+
+        secret = server_jwt_secret()
+        if secret is not None:
+            return jwt_signature_valid(token, secret)
+
+        request = await playwright.request.new_context(
+            base_url=self.base_url, storage_state=str(self.state_file)
+        )
+        try:
+            response = await request.get("/api/auth/me")
+            return response.ok
+        finally:
+            await request.dispose()
+
+    async def _login(self, playwright: Any) -> None:
+        request = await playwright.request.new_context(base_url=self.base_url)
+        try:
+            response = await request.post(
+                "/api/auth/login",
+                data={"email": self.username, "password": self.password},
+            )
+            if not response.ok:
+                raise RuntimeError(
+                    f"POST /api/auth/login failed with {response.status}: {await response.text()}"
+                )
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            await request.storage_state(path=str(self.state_file))
+        finally:
+            await request.dispose()
+
+    async def ensure(self, playwright: Any) -> Path:
+        """Return a valid storage-state file, logging in only if needed."""
+        token = self._cached_token()
+        if token and await self._still_valid(playwright, token):
+            self.reused = True
+            return self.state_file
+        self.reused = False
+        await self._login(playwright)
+        return self.state_file
@@ -0,0 +1,233 @@
+"""Timing baseline and p95 regression gate for suite runs.
+
+The ``testsprite-mcp-test-report-*.md`` files only count passes, so a change
+that doubles dashboard load time goes unnoticed.  This module keeps a
+versioned baseline of timing *distributions*:
+
+* per test: the durations of the last :data:`MAX_TEST_SAMPLES` passing runs;
+* per endpoint (``METHOD /api/route/:id`` from :mod:`harness.recorder`): the
+  last :data:`MAX_ENDPOINT_SAMPLES` browser-observed request durations.
+
+A run is compared sample-against-sample.  Each test and endpoint gets a
+one-sided Mann-Whitney p-value ("the current run is slower") and a
+bootstrap 95% CI for the change in p95.  It is reported as ``regressed``
+when the p-value is below :data:`ALPHA` and p95 grew by at least
+:data:`NOISE_FLOOR`.  A test contributes one sample per pass, so use
+``--repeat 3`` or more for per-test verdicts; endpoints usually have
+dozens of samples per run.
+
+``python -m harness --baseline`` compares and adds a ``regressions`` section
+to the JSON report plus ``artifacts/regressions.md``;
+``--fail-on-regression 20`` also exits non-zero when any p95 regressed by
+more than 20%; ``--update-baseline`` folds the run into the baseline and
+bumps its ``revision``.  The baseline file lives outside ``artifacts/`` so
+it can be committed.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import subprocess
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .loader import TESTS_DIR
+from .stats import mann_whitney_greater, percentile
+
+BASELINE_FILE = TESTS_DIR / "perf_baseline.json"
+REGRESSIONS_MD = TESTS_DIR / "artifacts" / "regressions.md"
+SCHEMA = 1
+
+MAX_TEST_SAMPLES = 50
+MAX_ENDPOINT_SAMPLES = 1000
+MIN_BASELINE_SAMPLES = 3
+ALPHA = 0.05
+NOISE_FLOOR = 0.10
+BOOTSTRAP_ROUNDS = 1000
+
+
+@dataclass
+class Comparison:
+    kind: str  # "test" | "endpoint"
+    name: str
+    baseline_n: int
+    current_n: int
+    baseline_p95: float
+    current_p95: float
+    change: float  # relative p95 change, 0.25 == 25% slower
+    ci_low: float
+    ci_high: float
+    p_value: float
+    verdict: str  # "regressed" | "improved" | "unchanged" | "insufficient"
+
+
+def empty_baseline() -> Dict[str, Any]:
+    return {"schema": SCHEMA, "revision": 0, "updated": None, "git_commit": None,
+            "tests": {}, "endpoints": {}}
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Any]:
+    if not path.exists():
+        return empty_baseline()
+    data = json.loads(path.read_text())
+    if data.get("schema") != SCHEMA:
+        raise RuntimeError(f"{path} has schema {data.get('schema')}, expected {SCHEMA}")
+    return data
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=TESTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def test_samples(results: Sequence[Any]) -> Dict[str, List[float]]:
+    """Durations of passing results per test name (several with ``--repeat``)."""
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for result in results:
+        if result.status == "passed":
+            samples[result.name].append(result.duration)
+    return dict(samples)
+
+
+def endpoint_samples(log: Path) -> Dict[str, List[float]]:
+    """Successful request durations per ``METHOD /template`` from a recorder log."""
+    samples: Dict[str, List[float]] = defaultdict(list)
+    if not log.exists():
+        return {}
+    with log.open(encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            status = entry.get("status")
+            if entry.get("duration_ms") is None or status is None or status >= 400:
+                continue
+            samples[f"{entry['method']} {entry['url']}"].append(entry["duration_ms"] / 1000)
+    return dict(samples)
+
+
+def update_baseline(baseline: Dict[str, Any], tests: Dict[str, List[float]],
+                    endpoints: Dict[str, List[float]]) -> Dict[str, Any]:
+    """Append the run's samples, keeping the most recent ones, and bump the revision."""
+    for key, samples, cap in (("tests", tests, MAX_TEST_SAMPLES),
+                              ("endpoints", endpoints, MAX_ENDPOINT_SAMPLES)):
+        store = baseline.setdefault(key, {})
+        for name, values in samples.items():
+            store[name] = (store.get(name, []) + [round(v, 4) for v in values])[-cap:]
+    baseline["revision"] = baseline.get("revision", 0) + 1
+    baseline["updated"] = dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
+    baseline["git_commit"] = _git_commit()
+    return baseline
+
+
+def write_baseline(baseline: Dict[str, Any], path: Path = BASELINE_FILE) -> None:
+    path.write_text(json.dumps(baseline, indent=1, sort_keys=True) + "\n")
+
+
+def _p95_change_ci(baseline: Sequence[float], current: Sequence[float],
+                   rng: np.random.Generator) -> tuple:
+    base = np.asarray(baseline)
+    cur = np.asarray(current)
+    base_p95 = np.percentile(rng.choice(base, (BOOTSTRAP_ROUNDS, base.size)), 95, axis=1)
+    cur_p95 = np.percentile(rng.choice(cur, (BOOTSTRAP_ROUNDS, cur.size)), 95, axis=1)
+    ratios = cur_p95 / np.maximum(base_p95, 1e-9) - 1
+    low, high = np.percentile(ratios, [2.5, 97.5])
+    return float(low), float(high)
+
+
+def compare_samples(kind: str, name: str, baseline: Sequence[float], current: Sequence[float],
+                    rng: np.random.Generator) -> Comparison:
+    base_sorted, cur_sorted = sorted(baseline), sorted(current)
+    base_p95 = percentile(base_sorted, 95)
+    cur_p95 = percentile(cur_sorted, 95)
+    if len(baseline) < MIN_BASELINE_SAMPLES or not current:
+        return Comparison(kind, name, len(baseline), len(current), base_p95, cur_p95,
+                          float("nan"), float("nan"), float("nan"), float("nan"), "insufficient")
+    change = cur_p95 / base_p95 - 1 if base_p95 > 0 else 0.0
+    ci_low, ci_high = _p95_change_ci(baseline, current, rng)
+    slower = mann_whitney_greater(baseline, current)
+    faster = mann_whitney_greater(current, baseline)
+    if slower < ALPHA and change >= NOISE_FLOOR:
+        verdict = "regressed"
+    elif faster < ALPHA and change <= -NOISE_FLOOR:
+        verdict = "improved"
+    else:
+        verdict = "unchanged"
+    return Comparison(kind, name, len(baseline), len(current), base_p95, cur_p95,
+                      change, ci_low, ci_high, slower, verdict)
+
+
+def compare(baseline: Dict[str, Any], tests: Dict[str, List[float]],
+            endpoints: Dict[str, List[float]], seed: int = 0) -> List[Comparison]:
+    """Compare this run's samples with the baseline, worst regressions first."""
+    rng = np.random.default_rng(seed)
+    rows = [compare_samples("test", name, baseline.get("tests", {}).get(name, []), values, rng)
+            for name, values in sorted(tests.items())]
+    rows += [compare_samples("endpoint", name, baseline.get("endpoints", {}).get(name, []), values, rng)
+             for name, values in sorted(endpoints.items())]
+    order = {"regressed": 0, "improved": 1, "unchanged": 2, "insufficient": 3}
+    rows.sort(key=lambda c: (order[c.verdict], -(c.change if c.change == c.change else 0.0)))
+    return rows
+
+
+def gate(rows: Sequence[Comparison], threshold_pct: float) -> List[Comparison]:
+    """Regressions whose p95 grew by more than ``threshold_pct`` percent."""
+    return [c for c in rows if c.verdict == "regressed" and c.change * 100 > threshold_pct]
+
+
+def regression_section(rows: Sequence[Comparison], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``regressions`` block stored in the JSON suite report."""
+    counts: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        counts[row.verdict] += 1
+    return {
+        "baseline_revision": baseline.get("revision"),
+        "baseline_commit": baseline.get("git_commit"),
+        "counts": dict(counts),
+        "rows": [asdict(c) for c in rows if c.verdict != "insufficient"],
+    }
+
+
+def _fmt_pct(value: float) -> str:
+    return "n/a" if value != value else f"{value:+.0%}"
+
+
+def print_regressions(rows: Sequence[Comparison], limit: int = 20) -> None:
+    shown = [c for c in rows if c.verdict in ("regressed", "improved")][:limit]
+    skipped = sum(1 for c in rows if c.verdict == "insufficient")
+    print(f"\nbaseline comparison: {sum(c.verdict == 'regressed' for c in rows)} regressed, "
+          f"{sum(c.verdict == 'improved' for c in rows)} improved, {skipped} without enough samples")
+    for c in shown:
+        print(f"  {c.verdict:<10}{c.kind:<9}{c.name[:60]:<61}p95 {c.baseline_p95 * 1000:>7.0f} -> "
+              f"{c.current_p95 * 1000:>7.0f} ms {_fmt_pct(c.change):>6} "
+              f"[{_fmt_pct(c.ci_low)}, {_fmt_pct(c.ci_high)}] p={c.p_value:.3f}")
+
+
+def write_markdown(rows: Sequence[Comparison], baseline: Dict[str, Any], path: Path = REGRESSIONS_MD) -> None:
+    """Render the comparison as a report section for the markdown test reports."""
+    lines = [
+        "## Performance Regressions",
+        "",
+        f"Baseline revision {baseline.get('revision')} "
+        f"(commit {baseline.get('git_commit') or 'unknown'}, updated {baseline.get('updated') or 'never'}). "
+        f"One-sided Mann-Whitney at alpha {ALPHA}, noise floor {NOISE_FLOOR:.0%} on p95.",
+        "",
+        "| Verdict | Kind | Name | n base/cur | p95 base ms | p95 cur ms | Change | 95% CI | p |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for c in rows:
+        if c.verdict == "insufficient":
+            continue
+        lines.append(f"| {c.verdict} | {c.kind} | `{c.name}` | {c.baseline_n}/{c.current_n} | "
+                     f"{c.baseline_p95 * 1000:.0f} | {c.current_p95 * 1000:.0f} | {_fmt_pct(c.change)} | "
+                     f"{_fmt_pct(c.ci_low)} to {_fmt_pct(c.ci_high)} | {c.p_value:.3f} |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
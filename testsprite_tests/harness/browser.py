@@ -0,0 +1,223 @@
+"""One Playwright driver and Chromium shared by every test in a run.
+
+The generated tests call ``async_api.async_playwright().start()``,
+``pw.chromium.launch(...)`` and ``browser.new_context()`` themselves.  Rather
+than editing 68 generated files, :meth:`BrowserSession.bind` swaps the
+module's ``async_api`` global for a shim whose ``launch`` hands back the
+shared browser and whose ``close``/``stop`` are no-ops.  Each
+``new_context`` call still creates a fresh, isolated ``BrowserContext``, but
+only after taking a slot from a bounded pool so a full suite cannot open
+more contexts than Chromium can comfortably drive.
+
+When the session is given an :class:`~harness.auth.AuthCache`, it logs in
+once at start-up and opens every ``authenticated`` test's context from the
+cached ``storage_state`` file.
+
+Optional features (performance capture, request recording, ...) plug in as
+:class:`SessionPlugin` objects.  Tests receive a thin context wrapper so that
+plugins get ``context_closing`` while the context's pages are still alive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright import async_api
+
+from .auth import AuthCache
+from .loader import TestCase
+
+DEFAULT_LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+
+class SessionPlugin:
+    """Hooks run around every context the session hands to a test."""
+
+    async def context_created(self, test: TestCase, context: async_api.BrowserContext) -> None:
+        pass
+
+    async def context_closing(self, test: TestCase, context: async_api.BrowserContext) -> None:
+        pass
+
+
+class BrowserSession:
+    """Shared Playwright driver, Chromium instance and context pool."""
+
+    def __init__(
+        self,
+        max_contexts: int = 8,
+        headless: bool = True,
+        launch_args: Optional[List[str]] = None,
+        auth: Optional[AuthCache] = None,
+        plugins: Optional[List[SessionPlugin]] = None,
+    ) -> None:
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.launch_args = launch_args or list(DEFAULT_LAUNCH_ARGS)
+        self.launch_seconds = 0.0
+        self.contexts_opened = 0
+        self.auth = auth
+        self.plugins = list(plugins or [])
+        self.storage_state: Optional[Path] = None
+        self._pw: Optional[async_api.Playwright] = None
+        self._browser: Optional[async_api.Browser] = None
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._open: Dict[str, List["SessionContext"]] = defaultdict(list)
+
+    @property
+    def browser(self) -> async_api.Browser:
+        if self._browser is None:
+            raise RuntimeError("BrowserSession.start() has not been called")
+        return self._browser
+
+    async def start(self) -> "BrowserSession":
+        started = time.perf_counter()
+        self._pw = await async_api.async_playwright().start()
+        # --single-process from the generated tests is deliberately dropped:
+        # one renderer process cannot host many concurrent contexts.
+        self._browser = await self._pw.chromium.launch(
+            headless=self.headless, args=self.launch_args
+        )
+        self.launch_seconds = time.perf_counter() - started
+        if self.auth is not None:
+            self.storage_state = await self.auth.ensure(self._pw)
+        return self
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self) -> "BrowserSession":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def bind(self, test: TestCase) -> None:
+        """Point ``test``'s ``async_api`` global at this session."""
+        test.module.async_api = _SessionApi(self, test)
+
+    async def new_context(self, test: TestCase, **options: Any) -> "SessionContext":
+        """Open an isolated context for ``test``, waiting for a free slot."""
+        if test.authenticated and self.storage_state is not None:
+            options.setdefault("storage_state", str(self.storage_state))
+        await self._slots.acquire()
+        try:
+            context = await self.browser.new_context(**options)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        released = False
+
+        def _release(_: Any = None) -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._slots.release()
+
+        context.on("close", _release)
+        wrapped = SessionContext(self, test, context)
+        self._open[test.name].append(wrapped)
+        self.contexts_opened += 1
+        for plugin in self.plugins:
+            await plugin.context_created(test, context)
+        return wrapped
+
+    async def release(self, test: TestCase) -> None:
+        """Close any context ``test`` left open (e.g. after a crash)."""
+        for context in self._open.pop(test.name, []):
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+
+
+class SessionContext:
+    """``BrowserContext`` wrapper that runs plugin hooks before closing."""
+
+    def __init__(self, session: BrowserSession, test: TestCase,
+                 context: async_api.BrowserContext) -> None:
+        self._session = session
+        self._test = test
+        self._closed = False
+        self.context = context
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.context, name)
+
+    async def close(self, **kwargs: Any) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for plugin in self._session.plugins:
+            try:
+                await plugin.context_closing(self._test, self.context)
+            except async_api.Error:
+                # The page may already be gone; never mask the test's own result.
+                pass
+        await self.context.close(**kwargs)
+
+
+class _SessionApi:
+    """Stand-in for the ``playwright.async_api`` module inside one test."""
+
+    def __init__(self, session: BrowserSession, test: TestCase) -> None:
+        self._session = session
+        self._test = test
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+    def async_playwright(self) -> "_SessionPlaywrightStarter":
+        return _SessionPlaywrightStarter(self._session, self._test)
+
+
+class _SessionPlaywrightStarter:
+    def __init__(self, session: BrowserSession, test: TestCase) -> None:
+        self._playwright = _SessionPlaywright(session, test)
+
+    async def start(self) -> "_SessionPlaywright":
+        return self._playwright
+
+
+class _SessionPlaywright:
+    def __init__(self, session: BrowserSession, test: TestCase) -> None:
+        self.chromium = _SessionBrowserType(session, test)
+
+    async def stop(self) -> None:
+        pass
+
+
+class _SessionBrowserType:
+    def __init__(self, session: BrowserSession, test: TestCase) -> None:
+        self._browser = _SessionBrowser(session, test)
+
+    async def launch(self, **_: Any) -> "_SessionBrowser":
+        return self._browser
+
+
+class _SessionBrowser:
+    def __init__(self, session: BrowserSession, test: TestCase) -> None:
+        self._session = session
+        self._test = test
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session.browser, name)
+
+    async def new_context(self, **options: Any) -> SessionContext:
+        return await self._session.new_context(self._test, **options)
+
+    async def close(self) -> None:
+        pass
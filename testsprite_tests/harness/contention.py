@@ -0,0 +1,386 @@
+"""Contention stress test for the read-modify-write routes.
+
+``TC011_Concurrent_transaction_handling_and_data_integrity`` and
+``TC019_Concurrent_data_updates_consistency`` never issue two writes at
+once.  The server has three classic races:
+
+* ``POST /api/tank-daily-readings`` looks up the tank-day and the previous
+  day with ``findOne``, computes ``openingStock`` from yesterday's closing,
+  then inserts or updates.  Two writers can both see "missing" and both
+  insert (the unique ``(readingDate, tankId)`` index turns the loser into a
+  400), and a write to yesterday racing a write to today leaves today's
+  opening stock stale.
+* ``PUT /api/credit-customers/:id`` sets whatever fields it is sent, with no
+  version check, so clients that read, adjust and write back lose each
+  other's changes.
+* ``POST /api/attendance`` upserts with ``findOneAndUpdate``; concurrent
+  upserts of the same employee-day can collide on the unique index.
+  ``POST /api/attendance/bulk`` does the same for a whole sheet in one
+  ``bulkWrite``.
+
+Each scenario releases ``--writers`` requests at the same instant (one
+shared HTTP/1.1 pool sized to the writer count) against a record of its
+own, then reads the final state back and checks the invariants:
+
+``tank-day``
+    half the writers write day D, half day D-1, each with a distinct
+    closing stock.  Exactly one reading per tank-day; ``opening(D) ==
+    closing(D-1)``; each acknowledged day-D write whose ``openingStock``
+    differs from the final ``closing(D-1)`` counts as a stale read.
+``credit-customer``
+    a fresh customer; every writer GETs it, adds 1 to ``advanceAmount`` and
+    PUTs it back.  Lost updates = acknowledged increments - actual increase.
+``attendance``
+    every writer upserts the same employee-day with its own status.  Exactly
+    one record, holding a status some writer sent.
+``attendance-bulk``
+    every writer posts the same ``--bulk-rows`` employee sheet for one day
+    with ``ordered=false``.  Exactly one record per employee; rows written
+    per second is the bulk import throughput.
+
+Records are isolated per run: a synthetic tank id and employee id, a
+reading date far in the future, and a customer that is deleted afterwards.
+Tank readings and attendance have no DELETE route, so they stay behind.
+Sustained write throughput (acknowledged writes per second) and p50/p99
+latency come from :class:`harness.load.EndpointStats`::
+
+    python -m harness.contention --writers 200
+    python -m harness.contention --scenario credit-customer --writers 500 --rounds 3
+    python -m harness.contention --scenario attendance-bulk --writers 10 --bulk-rows 1000
+
+Results are written to ``artifacts/contention.json``; the exit status is
+non-zero when an invariant fails or an update was lost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME
+from .load import LOGIN_PATH, EndpointStats
+from .loader import DEFAULT_BASE_URL, TESTS_DIR
+
+REPORT_FILE = TESTS_DIR / "artifacts" / "contention.json"
+FAR_FUTURE = dt.date(2099, 1, 1)
+STATUSES = ("Present", "Absent", "Half Day", "Leave")
+REQUEST_TIMEOUT = 60.0
+BULK_ROWS = 100  # employees per attendance-bulk sheet
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    writers: int
+    rounds: int = 0
+    elapsed: float = 0.0
+    writes: EndpointStats = field(default_factory=EndpointStats)
+    rejected: Dict[str, int] = field(default_factory=dict)  # error message -> count
+    lost_updates: int = 0
+    stale_reads: int = 0
+    rows: int = 0  # rows written by acknowledged bulk requests
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def acked(self) -> int:
+        return sum(n for status, n in self.writes.statuses.items() if status < 400)
+
+    @property
+    def throughput(self) -> float:
+        return self.acked / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations and not self.lost_updates
+
+    def reject(self, response: Optional[httpx.Response]) -> None:
+        if response is None:
+            key = "transport error"
+        else:
+            try:
+                key = str(response.json().get("error") or response.status_code)
+            except ValueError:
+                key = f"HTTP {response.status_code}"
+            # E11000 messages embed the key; group them.
+            key = "E11000 duplicate key" if "E11000" in key else key[:120]
+        self.rejected[key] = self.rejected.get(key, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "writers": self.writers,
+            "rounds": self.rounds,
+            "elapsed": self.elapsed,
+            "acked": self.acked,
+            "throughput": self.throughput,
+            "writes": self.writes.to_dict(),
+            "rejected": self.rejected,
+            "lost_updates": self.lost_updates,
+            "stale_reads": self.stale_reads,
+            "rows": self.rows,
+            "rows_per_second": self.rows_per_second,
+            "violations": self.violations,
+            "ok": self.ok,
+        }
+
+
+def _data(response: httpx.Response) -> Any:
+    body = response.json()
+    return body.get("data", body.get("rows")) if isinstance(body, dict) else body
+
+
+def _id_of(record: Dict[str, Any]) -> Optional[str]:
+    value = record.get("id") or record.get("_id")
+    return str(value) if value is not None else None
+
+
+class Contention:
+    """Runs the scenarios with one logged-in client shared by every writer."""
+
+    def __init__(self, client: httpx.AsyncClient, writers: int, rounds: int = 1,
+                 seed: Optional[int] = None, bulk_rows: int = BULK_ROWS) -> None:
+        self.client = client
+        self.writers = writers
+        self.rounds = rounds
+        self.bulk_rows = bulk_rows
+        self.rng = random.Random(seed)
+        # Each run gets its own day, so reruns never see earlier state.
+        self.day = FAR_FUTURE + dt.timedelta(days=self.rng.randrange(1, 3650))
+
+    async def _burst(self, result: ScenarioResult,
+                     write: Callable[[int], Awaitable[Optional[httpx.Response]]]) -> List[Optional[httpx.Response]]:
+        """Release ``self.writers`` calls of ``write(i)`` together; time each one."""
+        go = asyncio.Event()
+
+        async def one(i: int) -> Optional[httpx.Response]:
+            await go.wait()
+            started = time.perf_counter()
+            try:
+                response = await write(i)
+            except httpx.HTTPError:
+                response = None
+            status = response.status_code if response is not None else None
+            result.writes.record(time.perf_counter() - started, status)
+            if status is None or status >= 400:
+                result.reject(response)
+            return response
+
+        tasks = [asyncio.create_task(one(i)) for i in range(self.writers)]
+        await asyncio.sleep(0)  # let every task reach the barrier
+        started = time.perf_counter()
+        go.set()
+        responses = await asyncio.gather(*tasks)
+        result.elapsed += time.perf_counter() - started
+        result.rounds += 1
+        return list(responses)
+
+    # -- tank-day ----------------------------------------------------------------
+
+    async def tank_day(self) -> ScenarioResult:
+        result = ScenarioResult("tank-day", self.writers)
+        tank_id = f"contention-{uuid.uuid4()}"
+        today, yesterday = self.day.isoformat(), (self.day - dt.timedelta(days=1)).isoformat()
+        sent: Dict[str, set] = {today: set(), yesterday: set()}
+
+        for round_no in range(self.rounds):
+            def write(i: int, round_no: int = round_no) -> Awaitable[httpx.Response]:
+                day = today if i % 2 == 0 else yesterday
+                closing = float((20_000 if day == yesterday else 10_000) + round_no * self.writers + i)
+                sent[day].add(closing)
+                return self.client.post("/api/tank-daily-readings", json={
+                    "tankId": tank_id, "readingDate": day, "closingStock": closing,
+                    "stockReceived": 0, "meterSale": 100, "testing": 0,
+                })
+            responses = await self._burst(result, write)
+
+        final: Dict[str, List[dict]] = {}
+        for day in (today, yesterday):
+            rows = _data(await self.client.get("/api/tank-daily-readings", params={"date": day})) or []
+            final[day] = [r for r in rows if (r.get("tankId") or r.get("tank_id")) == tank_id]
+            if len(final[day]) != 1:
+                result.violations.append(f"{len(final[day])} readings for {tank_id} on {day}, expected 1")
+        if len(final[today]) == 1 and len(final[yesterday]) == 1:
+            opening = float(final[today][0]["previousStock"])
+            closing_before = float(final[yesterday][0]["currentStock"])
+            if abs(opening - closing_before) > 1e-6:
+                result.violations.append(f"opening stock {opening} on {today} != closing {closing_before} "
+                                         f"on {yesterday}")
+            for day, rows in final.items():
+                if float(rows[0]["currentStock"]) not in sent[day]:
+                    result.violations.append(f"closing stock on {day} is not a value any writer sent")
+            # Acknowledged day-D writes from the last round that computed opening from a stale D-1.
+            for i, response in enumerate(responses):
+                if i % 2 == 0 and response is not None and response.status_code < 400:
+                    if abs(float(_data(response).get("openingStock", 0)) - closing_before) > 1e-6:
+                        result.stale_reads += 1
+        return result
+
+    # -- credit-customer ---------------------------------------------------------
+
+    async def _customer(self, customer_id: str) -> Optional[dict]:
+        rows = _data(await self.client.get("/api/credit-customers")) or []
+        return next((r for r in rows if _id_of(r) == customer_id), None)
+
+    async def credit_customer(self) -> ScenarioResult:
+        result = ScenarioResult("credit-customer", self.writers)
+        created = await self.client.post("/api/credit-customers", json={
+            "organization_name": f"Contention {uuid.uuid4().hex[:8]}", "phone_number": "9000000000",
+            "credit_limit": 100000, "opening_balance": 0, "advance_amount": 0, "balance_type": "Due",
+        })
+        if created.status_code >= 400:
+            result.violations.append(f"could not create customer: HTTP {created.status_code}")
+            return result
+        customer_id = _id_of(_data(created))
+        try:
+            for _ in range(self.rounds):
+                async def write(i: int) -> Optional[httpx.Response]:
+                    current = await self._customer(customer_id)
+                    if current is None:
+                        return None
+                    amount = float(current.get("advanceAmount") or 0) + 1
+                    return await self.client.put(f"/api/credit-customers/{customer_id}",
+                                                 json={"advance_amount": amount})
+                await self._burst(result, write)
+            final = await self._customer(customer_id)
+            if final is None:
+                result.violations.append(f"customer {customer_id} disappeared")
+                return result
+            increase = int(round(float(final.get("advanceAmount") or 0)))
+            result.lost_updates = result.acked - increase
+        finally:
+            await self.client.delete(f"/api/credit-customers/{customer_id}")
+        return result
+
+    # -- attendance --------------------------------------------------------------
+
+    async def attendance(self) -> ScenarioResult:
+        result = ScenarioResult("attendance", self.writers)
+        employee_id = str(uuid.uuid4())
+        day = self.day.isoformat()
+        for _ in range(self.rounds):
+            def write(i: int) -> Awaitable[httpx.Response]:
+                return self.client.post("/api/attendance", json={
+                    "attendanceDate": day, "employeeId": employee_id,
+                    "status": STATUSES[i % len(STATUSES)], "notes": f"writer {i}",
+                })
+            await self._burst(result, write)
+        rows = _data(await self.client.get("/api/attendance/details", params={"date": day})) or []
+        mine = [r for r in rows if r.get("employeeId") == employee_id]
+        if len(mine) != 1:
+            result.violations.append(f"{len(mine)} attendance records for {employee_id} on {day}, expected 1")
+        elif mine[0].get("status") not in STATUSES:
+            result.violations.append(f"final status {mine[0].get('status')!r} was never sent")
+        return result
+
+    async def attendance_bulk(self) -> ScenarioResult:
+        result = ScenarioResult("attendance-bulk", self.writers)
+        employee_ids = [str(uuid.uuid4()) for _ in range(self.bulk_rows)]
+        day = (self.day + dt.timedelta(days=1)).isoformat()  # not the attendance scenario's day
+        for _ in range(self.rounds):
+            def write(i: int) -> Awaitable[httpx.Response]:
+                return self.client.post("/api/attendance/bulk", params={"ordered": "false"}, json=[
+                    {"attendanceDate": day, "employeeId": employee_id,
+                     "status": STATUSES[(i + j) % len(STATUSES)], "notes": f"writer {i}"}
+                    for j, employee_id in enumerate(employee_ids)
+                ])
+            for response in await self._burst(result, write):
+                if response is None or response.status_code >= 400:
+                    continue
+                for row in response.json().get("results", []):
+                    if row.get("status") in ("created", "updated"):
+                        result.rows += 1
+                    else:
+                        error = str(row.get("error") or row.get("status"))
+                        key = "row: E11000 duplicate key" if "E11000" in error else f"row: {error[:115]}"
+                        result.rejected[key] = result.rejected.get(key, 0) + 1
+        rows = _data(await self.client.get("/api/attendance/details", params={"date": day})) or []
+        per_employee: Dict[str, int] = {}
+        for row in rows:
+            per_employee[row.get("employeeId")] = per_employee.get(row.get("employeeId"), 0) + 1
+        missing = [e for e in employee_ids if per_employee.get(e, 0) == 0]
+        doubled = [e for e in employee_ids if per_employee.get(e, 0) > 1]
+        if missing:
+            result.violations.append(f"{len(missing)} of {len(employee_ids)} employees have no record on {day}")
+        if doubled:
+            result.violations.append(f"{len(doubled)} employees have more than one record on {day}")
+        return result
+
+
+SCENARIOS: Dict[str, Callable[[Contention], Awaitable[ScenarioResult]]] = {
+    "tank-day": Contention.tank_day,
+    "credit-customer": Contention.credit_customer,
+    "attendance": Contention.attendance,
+    "attendance-bulk": Contention.attendance_bulk,
+}
+
+
+async def run_contention(base_url: str = DEFAULT_BASE_URL, scenarios: Sequence[str] = tuple(SCENARIOS),
+                         writers: int = 100, rounds: int = 1, seed: Optional[int] = None,
+                         username: str = DEFAULT_USERNAME, password: str = DEFAULT_PASSWORD,
+                         bulk_rows: int = BULK_ROWS) -> List[ScenarioResult]:
+    limits = httpx.Limits(max_connections=writers, max_keepalive_connections=writers)
+    async with httpx.AsyncClient(base_url=base_url, timeout=REQUEST_TIMEOUT, limits=limits) as client:
+        login = await client.post(LOGIN_PATH, json={"email": username, "password": password})
+        login.raise_for_status()
+        runner = Contention(client, writers, rounds, seed, bulk_rows)
+        return [await SCENARIOS[name](runner) for name in scenarios]
+
+
+def print_results(results: Sequence[ScenarioResult]) -> None:
+    print(f"{'scenario':<17}{'writes':>7}{'acked':>7}{'w/s':>8}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'lost':>6}{'stale':>7}  verdict")
+    for r in results:
+        print(f"{r.name:<17}{r.writes.count:>7}{r.acked:>7}{r.throughput:>8.1f}"
+              f"{r.writes.p50 * 1000:>9.0f}{r.writes.p99 * 1000:>9.0f}{r.lost_updates:>6}"
+              f"{r.stale_reads:>7}  {'ok' if r.ok else 'FAIL'}")
+        if r.rows:
+            print(f"    {r.rows} rows written, {r.rows_per_second:.0f} rows/s")
+        for message, count in sorted(r.rejected.items(), key=lambda kv: -kv[1]):
+            print(f"    rejected x{count}: {message}")
+        for violation in r.violations:
+            print(f"    violation: {violation}")
+
+
+def write_results(results: Sequence[ScenarioResult], path: Path = REPORT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([r.to_dict() for r in results], indent=2))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.contention", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), dest="scenarios",
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--writers", type=int, default=100, help="simultaneous writes per burst")
+    parser.add_argument("--rounds", type=int, default=1, help="bursts per scenario")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bulk-rows", type=int, default=BULK_ROWS, help="employees per attendance-bulk sheet")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_contention(args.base_url, args.scenarios or tuple(SCENARIOS),
+                                         args.writers, args.rounds, args.seed, bulk_rows=args.bulk_rows))
+    for r in results:
+        r.writes.window = r.elapsed
+    write_results(results)
+    print_results(results)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,566 @@
+"""Data-driven step engine for the generated TestSprite flows.
+
+Most ``TC*.py`` files are the same boilerplate around a list of XPath
+``fill``/``click`` steps: launch, wait for the iframes, then one
+``frame.locator(...).nth(0)`` per step.  ``compile`` turns each such file
+into ``flows/<name>.json``:
+
+* ``steps``: the ``goto``/``fill``/``click``/``scroll``/``fail`` actions,
+  each with the comment the generator wrote above it;
+* ``plan``: the matching entry of ``testsprite_frontend_test_plan.json``
+  (same id, closest title);
+* ``features``: the ``standard_prd.json`` features the flow exercises.
+
+One interpreter then runs every flow.  Each distinct step is compiled once
+into a coroutine that all flows share, and a flow's selectors go through a
+per-page locator cache.  Files with hand-written code (the load and perf
+tests) or syntax errors stay as ``TC*.py`` and run as before.
+
+Identical step prefixes run once per run.  Login followed by the same menu
+clicks is the common case.  The first flow to reach a shared prefix runs it
+in its own context, waits for the app to settle and takes a checkpoint:
+storage state plus URL.  The other flows on that prefix start from the
+checkpoint in a fresh context.  Checkpoints are only taken after a
+``click`` or ``goto``, because typed-but-unsubmitted form state is not in
+storage.  ``--no-shared-prefixes`` runs every step of every flow::
+
+    python -m harness.engine compile            # TC*.py -> flows/*.json
+    python -m harness.engine compile --remove   # ...and delete the compiled sources
+    python -m harness.engine list               # shared prefixes and PRD features
+    python -m harness.engine run flows/TC004_Master_Data_CRUD_Operations.json
+    python -m harness -k TC004                  # flows and TC*.py run side by side
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import json
+import re
+import sys
+import types
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from playwright import async_api
+
+from . import waits
+from .loader import (DEFAULT_BASE_URL, GENERATED_BASE_URL, TESTS_DIR, TestCase, is_auth_test,
+                     is_login_selector)
+from .shard import namespaced
+
+FLOWS_DIR = TESTS_DIR / "flows"
+PLAN_FILE = TESTS_DIR / "testsprite_frontend_test_plan.json"
+PRD_FILE = TESTS_DIR / "standard_prd.json"
+
+# What the generated boilerplate does before the first step.
+LAUNCH_ARGS = ["--window-size=1280,720", "--disable-dev-shm-usage", "--ipc=host", "--single-process"]
+DEFAULT_TIMEOUT_MS = 5000
+GOTO_TIMEOUT_MS = 10000
+LOAD_STATE_TIMEOUT_MS = 3000
+
+_TEST_ID_RE = re.compile(r"^(TC\d+)_")
+_WORD_RE = re.compile(r"[a-z]+")
+_STOP_WORDS = {"and", "of", "on", "for", "the", "with", "in", "to", "a", "across", "all", "under"}
+# Fills in the app's main content whose value names what a step creates
+# ("INV-1001", "Test liquid purchase"); numbers, dates, emails and injection
+# payloads are left exactly as generated.
+_APP_FORM_RE = re.compile(r"/main/")
+_CREATE_VALUE_RE = re.compile(r"^(?=.*[A-Za-z])[A-Za-z0-9][A-Za-z0-9 .-]*$")
+
+Step = Dict[str, Any]
+
+
+class Unsupported(ValueError):
+    """A generated file has code the engine cannot express as steps."""
+
+
+# -- compile: TC*.py -> flows/*.json ------------------------------------------
+
+def _string(node: ast.AST) -> str:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    raise Unsupported("expected a string literal")
+
+
+def _call(node: ast.stmt) -> Optional[ast.Call]:
+    """The call in ``await <call>``, or None."""
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Await) \
+            and isinstance(node.value.value, ast.Call):
+        return node.value.value
+    return None
+
+
+def _dotted(node: ast.AST) -> str:
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted(node.value)}.{node.attr}"
+    if isinstance(node, ast.Name):
+        return node.id
+    return "?"
+
+
+def _note(lines: List[str], lineno: int) -> Optional[str]:
+    """The generator's comment block directly above line ``lineno``."""
+    notes = []
+    i = lineno - 2
+    while i >= 0 and not lines[i].strip():
+        i -= 1
+    while i >= 0 and lines[i].strip().startswith("#"):
+        notes.insert(0, lines[i].strip().lstrip("#").strip())
+        i -= 1
+    return " ".join(notes) or None
+
+
+def _relative(url: str) -> str:
+    return url[len(GENERATED_BASE_URL):] or "/" if url.startswith(GENERATED_BASE_URL) else url
+
+
+def extract_steps(source: str, filename: str = "<flow>") -> List[Step]:
+    """The step list of one generated test, or :class:`Unsupported`."""
+    tree = ast.parse(source, filename=filename)
+    lines = source.splitlines()
+    run = next((n for n in tree.body if isinstance(n, ast.AsyncFunctionDef) and n.name == "run_test"), None)
+    body = next((n.body for n in (run.body if run else []) if isinstance(n, ast.Try)), None)
+    if body is None:
+        raise Unsupported("no run_test() try-block")
+    start = next((i for i, n in enumerate(body) if isinstance(n, ast.For)), None)
+    if start is None:
+        raise Unsupported("no iframe wait loop")
+
+    steps: List[Step] = []
+    selector: Optional[Tuple[str, int, Optional[str]]] = None
+    for node in body[start + 1:]:
+        call = _call(node)
+        name = _dotted(call.func) if call else ""
+        if isinstance(node, ast.Assign) and _dotted(node.targets[0]) == "frame" \
+                and ast.unparse(node.value) == "context.pages[-1]":
+            continue
+        if isinstance(node, ast.Assign) and _dotted(node.targets[0]) == "elem":
+            value = node.value
+            nth = 0
+            if isinstance(value, ast.Call) and _dotted(value.func).endswith(".nth"):
+                nth = int(value.args[0].value)
+                value = value.func.value
+            if not (isinstance(value, ast.Call) and _dotted(value.func) == "frame.locator"):
+                raise Unsupported(f"line {node.lineno}: unexpected locator")
+            selector = (_string(value.args[0]), nth, _note(lines, node.lineno))
+        elif name == "waits.actionable":
+            continue
+        elif name in ("elem.fill", "elem.click"):
+            if selector is None:
+                raise Unsupported(f"line {node.lineno}: action without a locator")
+            sel, nth, note = selector
+            step: Step = {"fill": sel, "value": _string(call.args[0])} if name == "elem.fill" \
+                else {"click": sel}
+            if nth:
+                step["nth"] = nth
+            if note:
+                step["note"] = note
+            steps.append(step)
+        elif name == "page.goto":
+            step = {"goto": _relative(_string(call.args[0]))}
+            note = _note(lines, node.lineno)
+            if note:
+                step["note"] = note
+            steps.append(step)
+        elif name == "page.mouse.wheel":
+            # ``window.innerHeight`` is a NameError in Python; the intent is one viewport.
+            steps.append({"scroll": -1 if ast.unparse(call.args[1]).startswith("-") else 1})
+        elif isinstance(node, ast.Assert) and isinstance(node.test, ast.Constant) and not node.test.value:
+            steps.append({"fail": _string(node.msg) if node.msg else "assertion failed"})
+            break
+        elif name == "asyncio.sleep":
+            continue
+        else:
+            raise Unsupported(f"line {node.lineno}: {ast.unparse(node)[:60]}")
+    return steps
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower())) - _STOP_WORDS
+
+
+def _overlap(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def match_plan(name: str, plan: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The plan entry with ``name``'s id whose title is closest to the name.
+
+    The suite has several generations per id (four TC001 files), while the
+    plan has one entry per id, so an entry only counts if the titles share
+    at least a third of their words.
+    """
+    match = _TEST_ID_RE.match(name)
+    if not match:
+        return None
+    words = _words(name[match.end():].replace("_", " "))
+    candidates = [(_overlap(words, _words(entry.get("title", ""))), entry)
+                  for entry in plan if entry.get("id") == match.group(1)]
+    score, entry = max(candidates, key=lambda c: c[0], default=(0.0, None))
+    return entry if score >= 1 / 3 else None
+
+
+def match_features(name: str, prd: Dict[str, Any]) -> List[str]:
+    """PRD features whose name words all appear in the flow name."""
+    words = _words(name.replace("_", " "))
+    features = prd.get("code_summary", {}).get("features", [])
+    return [f["name"] for f in features if _words(f["name"]) and _words(f["name"]) <= words]
+
+
+def compile_suite(directory: Path = TESTS_DIR, out_dir: Path = FLOWS_DIR,
+                  remove: bool = False) -> Tuple[List[Path], Dict[str, str]]:
+    """Write a flow for every compilable ``TC*.py``; return (written, skipped)."""
+    plan = json.loads(PLAN_FILE.read_text()) if PLAN_FILE.exists() else []
+    prd = json.loads(PRD_FILE.read_text()) if PRD_FILE.exists() else {}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written, skipped = [], {}
+    for path in sorted(directory.glob("TC*.py")):
+        try:
+            steps = extract_steps(path.read_text(encoding="utf-8"), str(path))
+        except (Unsupported, SyntaxError) as exc:
+            skipped[path.stem] = str(exc).splitlines()[0]
+            continue
+        flow: Dict[str, Any] = {"name": path.stem}
+        entry = match_plan(path.stem, plan)
+        if entry is not None:
+            flow["plan"] = {k: entry[k] for k in ("id", "title", "category", "priority") if k in entry}
+            flow["plan"]["steps"] = [s.get("description", "") for s in entry.get("steps", [])]
+        flow["features"] = match_features(path.stem, prd)
+        flow["steps"] = steps
+        target = out_dir / f"{path.stem}.json"
+        target.write_text(json.dumps(flow, indent=2) + "\n")
+        written.append(target)
+        if remove:
+            path.unlink()
+    return written, skipped
+
+
+# -- interpreter ---------------------------------------------------------------
+
+def step_key(step: Step) -> Tuple:
+    """Identity of a step for sharing: everything but the comment."""
+    return tuple(sorted((k, v) for k, v in step.items() if k != "note"))
+
+
+_locators: "weakref.WeakKeyDictionary[async_api.Page, Dict[Tuple[str, int], async_api.Locator]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _locator(page: async_api.Page, selector: str, nth: int) -> async_api.Locator:
+    """Per-page locator cache; a page's entries go when the page does."""
+    cache = _locators.setdefault(page, {})
+    locator = cache.get((selector, nth))
+    if locator is None:
+        locator = cache[(selector, nth)] = page.locator(selector).nth(nth)
+    return locator
+
+
+@lru_cache(maxsize=None)
+def compile_step(key: Tuple, base_url: str) -> Callable[[async_api.BrowserContext], Awaitable[None]]:
+    """One shared coroutine per distinct step."""
+    step = dict(key)
+
+    async def act(context: async_api.BrowserContext) -> None:
+        page = context.pages[-1]
+        if "goto" in step:
+            await page.goto(urljoin(base_url + "/", step["goto"].lstrip("/")), timeout=GOTO_TIMEOUT_MS)
+        elif "fill" in step or "click" in step:
+            elem = _locator(page, step.get("fill") or step["click"], step.get("nth", 0))
+            await waits.actionable(elem)
+            if "fill" in step:
+                await elem.fill(step["value"])
+            else:
+                await elem.click(timeout=DEFAULT_TIMEOUT_MS)
+        elif "scroll" in step:
+            await page.mouse.wheel(0, step["scroll"] * (page.viewport_size or {"height": 720})["height"])
+        elif "fail" in step:
+            raise AssertionError(step["fail"])
+        else:
+            raise ValueError(f"unknown step {step}")
+
+    return act
+
+
+def namespace_step(step: Step) -> Step:
+    """``step`` with a created record's name suffixed by the shard namespace.
+
+    Sharded workers on one tenant otherwise create the same invoice numbers
+    and descriptions and trip over each other's records.
+    """
+    if "fill" not in step or not _APP_FORM_RE.search(step["fill"]) \
+            or not _CREATE_VALUE_RE.match(step["value"]):
+        return step
+    value = namespaced(step["value"])
+    return step if value == step["value"] else dict(step, value=value)
+
+
+async def run_steps(context: async_api.BrowserContext, steps: Sequence[Step], base_url: str) -> None:
+    for step in steps:
+        await compile_step(step_key(step), base_url)(context)
+
+
+async def open_app(browser: Any, base_url: str, **options: Any) -> Tuple[Any, async_api.Page]:
+    """New context and page at ``base_url``, as the generated boilerplate opens them."""
+    context = await browser.new_context(**options)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    page = await context.new_page()
+    await page.goto(base_url, wait_until="commit", timeout=GOTO_TIMEOUT_MS)
+    for target in [page, *page.frames]:
+        try:
+            await target.wait_for_load_state("domcontentloaded", timeout=LOAD_STATE_TIMEOUT_MS)
+        except async_api.Error:
+            pass
+    return context, page
+
+
+class Checkpoint:
+    """A step prefix shared by several flows, run once and then restored."""
+
+    def __init__(self, steps: Sequence[Step], parent: Optional["Checkpoint"], base_url: str) -> None:
+        self.steps = list(steps)
+        self.parent = parent
+        self.base_url = base_url
+        self.users = 0
+        self._state: Optional[asyncio.Future] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.steps)
+
+    async def enter(self, browser: Any) -> Tuple[Any, bool]:
+        """A context positioned after this prefix and whether it ran the steps."""
+        if self._state is None:
+            self._state = asyncio.get_running_loop().create_future()
+            # Every waiter may have failed on its own first; do not warn about it.
+            self._state.add_done_callback(lambda f: f.cancelled() or f.exception())
+            try:
+                if self.parent is not None:
+                    context, _ = await self.parent.enter(browser)
+                    done = self.parent.depth
+                else:
+                    context, _ = await open_app(browser, self.base_url)
+                    done = 0
+                await run_steps(context, self.steps[done:], self.base_url)
+                page = context.pages[-1]
+                try:
+                    await waits.query_idle(page)
+                except async_api.Error:
+                    pass
+                self._state.set_result((await context.storage_state(), page.url))
+                return context, True
+            except BaseException as exc:
+                if not self._state.done():
+                    # The builder's own timeout must not look like a cancellation to the others.
+                    self._state.set_exception(RuntimeError("shared prefix was cancelled in another flow")
+                                              if isinstance(exc, asyncio.CancelledError) else exc)
+                raise
+        state, url = await asyncio.shield(self._state)
+        context = await browser.new_context(storage_state=state)
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        page = await context.new_page()
+        await page.goto(url, timeout=GOTO_TIMEOUT_MS)
+        return context, False
+
+
+def _cut_point(step: Step) -> bool:
+    return "click" in step or "goto" in step
+
+
+def plan_checkpoints(flows: Dict[str, List[Step]], base_url: str) -> Dict[str, Checkpoint]:
+    """Deepest shared checkpoint per flow name (flows without one are absent).
+
+    A prefix becomes a checkpoint where at least two flows still agree, the
+    last step is a click or goto, the flows diverge (or one ends) before the
+    next cut point, and it does more than navigate (restoring one costs a
+    navigation itself).
+    """
+    # prefix key -> flows through it
+    through: Dict[Tuple, List[str]] = defaultdict(list)
+    for name, steps in flows.items():
+        for i in range(1, len(steps) + 1):
+            through[tuple(step_key(s) for s in steps[:i])].append(name)
+
+    checkpoints: Dict[Tuple, Checkpoint] = {}
+    chosen: Dict[str, Checkpoint] = {}
+    for name, steps in sorted(flows.items()):
+        keys = [step_key(s) for s in steps]
+        parent: Optional[Checkpoint] = None
+        for i in range(1, len(steps)):
+            prefix = tuple(keys[:i])
+            group = through[prefix]
+            if len(group) < 2 or not _cut_point(steps[i - 1]) or "fail" in steps[i - 1] \
+                    or all("goto" in s or "scroll" in s for s in steps[:i]):
+                continue
+            # Only checkpoint where the group shrinks before the next cut point.
+            j = i
+            while j < len(steps) and not _cut_point(steps[j]):
+                j += 1
+            if j < len(steps) and len(through[tuple(keys[:j + 1])]) == len(group):
+                continue
+            checkpoint = checkpoints.get(prefix)
+            if checkpoint is None:
+                checkpoint = checkpoints[prefix] = Checkpoint(steps[:i], parent, base_url)
+            parent = checkpoint
+        if parent is not None:
+            chosen[name] = parent
+            parent.users += 1
+    return chosen
+
+
+@dataclass
+class Flow:
+    name: str
+    steps: List[Step]
+    path: Path
+    plan: Dict[str, Any] = field(default_factory=dict)
+    features: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "Flow":
+        data = json.loads(path.read_text())
+        return cls(data.get("name", path.stem), data["steps"], path, data.get("plan", {}),
+                   data.get("features", []))
+
+
+def _make_run(module: types.ModuleType, flow: Flow, steps: List[Step], base_url: str,
+              checkpoint: Optional[Checkpoint]) -> Callable[[], Awaitable[None]]:
+    async def run() -> None:
+        # ``module.async_api`` is the session shim under the runner and the
+        # real Playwright module when run standalone.
+        pw = await module.async_api.async_playwright().start()
+        browser = context = None
+        try:
+            browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            done = 0
+            if checkpoint is not None:
+                context, _ = await checkpoint.enter(browser)
+                done = checkpoint.depth
+            else:
+                context, _ = await open_app(browser, base_url)
+            await run_steps(context, steps[done:], base_url)
+        finally:
+            if context:
+                await context.close()
+            if browser:
+                await browser.close()
+            await pw.stop()
+
+    return run
+
+
+def load_flows(paths: Sequence[Path], skip_login: bool = False, base_url: str = DEFAULT_BASE_URL,
+               share_prefixes: bool = True) -> List[TestCase]:
+    """TestCases for ``paths``; flows sharing a step prefix share a checkpoint."""
+    base_url = base_url.rstrip("/")
+    flows = [Flow.load(path) for path in paths]
+    steps: Dict[str, List[Step]] = {}
+    authenticated: Dict[str, bool] = {}
+    for flow in flows:
+        authenticated[flow.name] = skip_login and not is_auth_test(flow.name)
+        steps[flow.name] = [namespace_step(s) for s in flow.steps if not (
+            authenticated[flow.name] and is_login_selector(s.get("fill") or s.get("click") or ""))]
+    chosen = plan_checkpoints(steps, base_url) if share_prefixes else {}
+
+    tests = []
+    for flow in flows:
+        module = types.ModuleType(f"testsprite_tests.flows.{flow.name}")
+        module.__file__ = str(flow.path)
+        module.async_api = async_api
+        module.flow = flow
+        module.steps = steps[flow.name]
+        module.checkpoint = chosen.get(flow.name)
+        run = _make_run(module, flow, steps[flow.name], base_url, chosen.get(flow.name))
+        tests.append(TestCase(path=flow.path, module=module, run=run,
+                              authenticated=authenticated[flow.name]))
+    return tests
+
+
+# -- CLI -----------------------------------------------------------------------
+
+def _describe(step: Step) -> str:
+    for kind in ("goto", "fill", "click", "scroll", "fail"):
+        if kind in step:
+            target = str(step[kind])
+            return f"{kind} {target if len(target) < 50 else '...' + target[-47:]}"
+    return str(step)
+
+
+def print_listing(tests: Sequence[TestCase]) -> None:
+    """Shared prefixes (as flows through each checkpoint) and PRD coverage."""
+    through: Dict[int, List[str]] = defaultdict(list)
+    checkpoints: Dict[int, Checkpoint] = {}
+    features: Dict[str, List[str]] = defaultdict(list)
+    total = 0
+    for test in tests:
+        flow: Flow = test.module.flow
+        total += len(test.module.steps)
+        for feature in flow.features or ["(none)"]:
+            features[feature].append(flow.name)
+        checkpoint = test.module.checkpoint
+        while checkpoint is not None:
+            through[id(checkpoint)].append(flow.name)
+            checkpoints[id(checkpoint)] = checkpoint
+            checkpoint = checkpoint.parent
+    saved = 0
+    for key, names in sorted(through.items(), key=lambda kv: checkpoints[kv[0]].depth):
+        checkpoint = checkpoints[key]
+        own = checkpoint.depth - (checkpoint.parent.depth if checkpoint.parent else 0)
+        saved += own * (len(names) - 1)
+        print(f"{len(names)} flows share steps 1-{checkpoint.depth}, "
+              f"ending '{_describe(checkpoint.steps[-1])}':")
+        for name in names:
+            print(f"    {name}")
+    print(f"\n{len(tests)} flows, {total} steps, {saved} of them saved by shared prefixes")
+    print("\nPRD features:")
+    for feature, names in sorted(features.items()):
+        print(f"  {feature:<32}{len(names)} flows")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness.engine", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = sub.add_parser("compile", help="write flows/*.json from the generated TC*.py files")
+    compile_cmd.add_argument("--remove", action="store_true", help="delete each TC*.py once compiled")
+    listing = sub.add_parser("list", help="show shared prefixes and PRD features")
+    listing.add_argument("--ui-login", action="store_true", help="keep the login steps, as the runner does")
+    run = sub.add_parser("run", help="run flow files standalone with their own browser")
+    run.add_argument("flows", nargs="+", type=Path)
+    run.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "compile":
+        written, skipped = compile_suite(remove=args.remove)
+        print(f"wrote {len(written)} flows to {FLOWS_DIR.relative_to(TESTS_DIR)}/")
+        for name, reason in skipped.items():
+            print(f"  kept {name}.py: {reason}")
+        return 0
+    if args.command == "list":
+        print_listing(load_flows(sorted(FLOWS_DIR.glob("TC*.json")), skip_login=not args.ui_login))
+        return 0
+
+    async def run_all() -> int:
+        failed = 0
+        for test in load_flows(args.flows, base_url=args.base_url, share_prefixes=False):
+            try:
+                await test.run()
+                print(f"passed  {test.name}")
+            except AssertionError as exc:
+                failed += 1
+                print(f"failed  {test.name}: {exc}")
+        return 1 if failed else 0
+
+    return asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Concurrent virtual-user load against the dashboard API.
+
+Each virtual user is one station operator: it logs in with its own
+``httpx.AsyncClient`` (and therefore its own cookie jar), then replays the
+request fan-out ``src/pages/Dashboard.tsx`` issues on every render, all
+requests of one round in parallel as React Query does.  Users arrive as a
+Poisson process at ``arrival_rate`` per second, so the server sees an open
+workload rather than a fixed-size closed loop.
+
+The report keeps every latency sample per endpoint and exposes p50/p95/p99,
+error rate (any non-2xx or transport error, with the server's 504 soft
+timeouts from ``server/index.ts`` counted separately) and throughput, so
+tests can assert on the numbers::
+
+    report = await run_load(LoadConfig(users=20, arrival_rate=5))
+    assert report.endpoints["/api/guest-sales"].p95 < 2.0
+
+Standalone: ``python -m harness.load --users 50 --rate 10 --rounds 3``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME
+from .loader import DEFAULT_BASE_URL
+from .stats import percentile
+
+LOGIN_PATH = "/api/auth/login"
+
+
+def dashboard_requests(today: Optional[dt.date] = None) -> List[Tuple[str, str]]:
+    """``(endpoint, url)`` pairs for one Dashboard render, as in Dashboard.tsx."""
+    today = today or dt.date.today()
+    day = f"from={today.isoformat()}&to={today.isoformat()}"
+    month, year = today.month - 11, today.year
+    if month <= 0:
+        month, year = month + 12, year - 1
+    start = today.replace(year=year, month=month, day=min(today.day, 28))
+    months = f"from={start.isoformat()}&to={today.isoformat()}"
+    return [
+        ("/api/guest-sales", f"/api/guest-sales?{day}"),
+        ("/api/credit-sales", f"/api/credit-sales?{day}"),
+        ("/api/lubricant-sales", f"/api/lubricant-sales?{day}"),
+        ("/api/swipe-transactions", f"/api/swipe-transactions?{day}"),
+        ("/api/recoveries", f"/api/recoveries?{day}"),
+        ("/api/expenses", f"/api/expenses?{day}"),
+        ("/api/guest-sales", f"/api/guest-sales?{months}"),
+        ("/api/credit-customers", "/api/credit-customers"),
+        ("/api/fuel-products", "/api/fuel-products"),
+    ]
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    timeouts: int = 0
+    window: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def _pct(self, q: float) -> float:
+        return percentile(sorted(self.latencies), q)
+
+    @property
+    def p50(self) -> float:
+        return self._pct(50)
+
+    @property
+    def p95(self) -> float:
+        return self._pct(95)
+
+    @property
+    def p99(self) -> float:
+        return self._pct(99)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second over the whole run."""
+        return self.count / self.window if self.window else 0.0
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        self.latencies.append(latency)
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+        if status == 504:
+            self.timeouts += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99,
+            "error_rate": self.error_rate,
+            "timeouts": self.timeouts,
+            "throughput": self.throughput,
+            "statuses": self.statuses,
+        }
+
+
+@dataclass
+class LoadConfig:
+    # Read per instance: the runner sets TESTSPRITE_BASE_URL for --mock-api and
+    # --base-url after this module has been imported.
+    base_url: str = field(default_factory=lambda: os.environ.get("TESTSPRITE_BASE_URL", DEFAULT_BASE_URL))
+    users: int = 10
+    arrival_rate: float = 5.0  # new users per second
+    rounds: int = 3  # dashboard renders per user
+    think_time: float = 1.0  # mean pause between renders, seconds
+    request_timeout: float = 35.0  # above the server's 30 s soft timeout
+    username: str = DEFAULT_USERNAME
+    password: str = DEFAULT_PASSWORD
+    seed: Optional[int] = None
+
+
+@dataclass
+class LoadReport:
+    config: LoadConfig
+    elapsed: float = 0.0
+    endpoints: Dict[str, EndpointStats] = field(default_factory=dict)
+
+    def stats(self, endpoint: str) -> EndpointStats:
+        return self.endpoints.setdefault(endpoint, EndpointStats())
+
+    @property
+    def timeouts(self) -> int:
+        return sum(s.timeouts for s in self.endpoints.values())
+
+    @property
+    def error_rate(self) -> float:
+        total = sum(s.count for s in self.endpoints.values())
+        return sum(s.errors for s in self.endpoints.values()) / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "users": self.config.users,
+            "arrival_rate": self.config.arrival_rate,
+            "elapsed": self.elapsed,
+            "error_rate": self.error_rate,
+            "timeouts": self.timeouts,
+            "endpoints": {k: v.to_dict() for k, v in sorted(self.endpoints.items())},
+        }
+
+    def print_table(self) -> None:
+        print(f"{'endpoint':<28}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'err %':>8}{'504s':>6}{'req/s':>8}")
+        for name, s in sorted(self.endpoints.items()):
+            print(f"{name:<28}{s.count:>6}{s.p50 * 1000:>9.0f}{s.p95 * 1000:>9.0f}"
+                  f"{s.p99 * 1000:>9.0f}{s.error_rate * 100:>8.1f}{s.timeouts:>6}{s.throughput:>8.1f}")
+        print(f"{self.config.users} users in {self.elapsed:.1f}s, "
+              f"overall error rate {self.error_rate * 100:.1f}%")
+
+
+async def _timed(client: httpx.AsyncClient, report: LoadReport, endpoint: str,
+                 method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        await response.aread()
+    except httpx.HTTPError:
+        report.stats(endpoint).record(time.perf_counter() - started, None)
+        return None
+    report.stats(endpoint).record(time.perf_counter() - started, response.status_code)
+    return response
+
+
+async def _virtual_user(config: LoadConfig, report: LoadReport, rng: random.Random) -> None:
+    async with httpx.AsyncClient(base_url=config.base_url, timeout=config.request_timeout) as client:
+        login = await _timed(client, report, LOGIN_PATH, "POST", LOGIN_PATH,
+                             json={"email": config.username, "password": config.password})
+        if login is None or login.status_code != 200:
+            return
+        for round_no in range(config.rounds):
+            await asyncio.gather(*(
+                _timed(client, report, endpoint, "GET", url)
+                for endpoint, url in dashboard_requests()
+            ))
+            if round_no + 1 < config.rounds and config.think_time > 0:
+                await asyncio.sleep(rng.expovariate(1 / config.think_time))
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    """Spawn ``config.users`` virtual users and collect per-endpoint stats."""
+    report = LoadReport(config)
+    rng = random.Random(config.seed)
+    started = time.perf_counter()
+    users = []
+    for i in range(config.users):
+        users.append(asyncio.create_task(_virtual_user(config, report, rng)))
+        if i + 1 < config.users and config.arrival_rate > 0:
+            await asyncio.sleep(rng.expovariate(config.arrival_rate))
+    await asyncio.gather(*users)
+    report.elapsed = time.perf_counter() - started
+    for stats in report.endpoints.values():
+        stats.window = report.elapsed
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.load", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=5.0, help="user arrivals per second")
+    parser.add_argument("--rounds", type=int, default=3, help="dashboard renders per user")
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run_load(LoadConfig(
+        base_url=args.base_url, users=args.users, arrival_rate=args.rate,
+        rounds=args.rounds, think_time=args.think_time, seed=args.seed,
+    )))
+    report.print_table()
+    return 0 if report.error_rate == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+"""Import generated TestSprite scripts without running them.
+
+Every ``TC*.py`` file ends with a module-level ``asyncio.run(run_test())``.
+Importing one normally would start its own browser immediately, so the
+loader parses the source, drops that trailing call and executes the rest in
+a fresh module namespace.  The caller then owns scheduling of ``run_test``.
+
+With ``skip_login`` the loader also removes the generated login-form steps
+from tests that do not exercise authentication themselves; the runner gives
+those tests a context that is already signed in (see :mod:`harness.auth`).
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import re
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+# The generated tests hardcode this origin in every ``page.goto``.
+GENERATED_BASE_URL = "http://localhost:5000"
+DEFAULT_BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", GENERATED_BASE_URL)
+
+_TEST_ID_RE = re.compile(r"^(TC\d+)_")
+
+# Tests that exercise login, logout or session handling keep the UI flow.
+_AUTH_TEST_RE = re.compile(r"auth|login|logout|session", re.IGNORECASE)
+
+# The Auth page form; every app page renders under <header>/<main> instead.
+_LOGIN_XPATH_RE = re.compile(r"^xpath=html/body/div/div\[2\]/div/div\[2\]/div/div\[\d\]/form/")
+
+
+@dataclass
+class TestCase:
+    """A generated test file and its loaded ``run_test`` coroutine function."""
+
+    path: Path
+    module: types.ModuleType
+    run: Callable[[], Awaitable[None]]
+    authenticated: bool = False
+
+    @property
+    def name(self) -> str:
+        """File stem, unique across the suite (ids like TC001 are not)."""
+        return self.path.stem
+
+    @property
+    def test_id(self) -> str:
+        match = _TEST_ID_RE.match(self.path.stem)
+        return match.group(1) if match else self.path.stem
+
+
+def _is_entrypoint_call(node: ast.stmt) -> bool:
+    """Match the generated ``asyncio.run(run_test())`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def is_auth_test(name: str) -> bool:
+    return bool(_AUTH_TEST_RE.search(name))
+
+
+def is_login_selector(selector: str) -> bool:
+    """True for a locator on the Auth page login form."""
+    return bool(_LOGIN_XPATH_RE.match(selector))
+
+
+def _names(node: ast.AST) -> set:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _is_login_locator(node: ast.stmt) -> bool:
+    """Match ``elem = frame.locator('xpath=<login form>...').nth(0)``."""
+    if not isinstance(node, ast.Assign) or _names(node.targets[0]) != {"elem"}:
+        return False
+    return any(
+        isinstance(c, ast.Constant) and isinstance(c.value, str) and _LOGIN_XPATH_RE.match(c.value)
+        for c in ast.walk(node.value)
+    )
+
+
+def _is_frame_lookup(node: ast.stmt) -> bool:
+    return isinstance(node, ast.Assign) and _names(node.targets[0]) == {"frame"}
+
+
+def _strip_login_steps(body: List[ast.stmt]) -> List[ast.stmt]:
+    kept: List[ast.stmt] = []
+    dropping = False
+    for node in body:
+        if _is_login_locator(node):
+            if kept and _is_frame_lookup(kept[-1]):
+                kept.pop()
+            dropping = True
+            continue
+        if dropping and isinstance(node, ast.Expr) and "elem" in _names(node):
+            continue
+        dropping = False
+        kept.append(node)
+    return kept
+
+
+def strip_ui_login(tree: ast.Module) -> int:
+    """Remove generated login-form steps in place; return how many went.
+
+    A step is the ``frame = ...`` lookup, the ``elem = frame.locator(...)``
+    on the Auth page form and the ``await`` statements acting on ``elem``.
+    """
+    removed = 0
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            body = getattr(node, field, None)
+            if isinstance(body, list) and body and isinstance(body[0], ast.stmt):
+                before = sum(_is_login_locator(n) for n in body)
+                if before:
+                    setattr(node, field, _strip_login_steps(body))
+                    removed += before
+    return removed
+
+
+def rebase_urls(tree: ast.Module, base_url: str) -> None:
+    """Point every hardcoded ``http://localhost:5000`` literal at ``base_url``."""
+    base_url = base_url.rstrip("/")
+    if base_url == GENERATED_BASE_URL:
+        return
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) \
+                and node.value.startswith(GENERATED_BASE_URL):
+            node.value = base_url + node.value[len(GENERATED_BASE_URL):]
+
+
+def load_test(path: Path, skip_login: bool = False, base_url: str = DEFAULT_BASE_URL) -> TestCase:
+    """Load ``path`` as a module with its entry-point call stripped.
+
+    ``skip_login`` drops the UI login steps unless the file is itself an
+    authentication test, and marks the case as needing a signed-in context.
+    ``base_url`` replaces the generated ``http://localhost:5000`` origin.
+    """
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint_call(node)]
+    rebase_urls(tree, base_url)
+    authenticated = skip_login and not is_auth_test(path.stem)
+    if authenticated:
+        strip_ui_login(tree)
+
+    module = types.ModuleType(f"testsprite_tests.{path.stem}")
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+
+    run = module.__dict__.get("run_test")
+    if run is None:
+        raise ValueError(f"{path.name} does not define run_test()")
+    return TestCase(path=path, module=module, run=run, authenticated=authenticated)
+
+
+def discover(
+    directory: Path = TESTS_DIR,
+    pattern: str = "TC*.py",
+    select: Optional[List[str]] = None,
+    skip_login: bool = False,
+    names: Optional[List[str]] = None,
+    base_url: str = DEFAULT_BASE_URL,
+    share_prefixes: bool = True,
+) -> List[TestCase]:
+    """Load every generated test under ``directory``.
+
+    ``select`` filters by substring against the file stem, so ``TC004`` picks
+    up all TC004 variants.  ``names`` keeps only exact stems.  Compiled flows
+    in ``directory/flows`` are loaded too (see :mod:`harness.engine`); a
+    ``TC*.py`` with the same name takes precedence.
+    """
+
+    def selected(paths: List[Path]) -> List[Path]:
+        if select:
+            paths = [p for p in paths if any(s in p.stem for s in select)]
+        if names is not None:
+            wanted = set(names)
+            paths = [p for p in paths if p.stem in wanted]
+        return paths
+
+    paths = selected(sorted(directory.glob(pattern)))
+    stems = {p.stem for p in paths}
+    flow_paths = [p for p in selected(sorted((directory / "flows").glob("TC*.json"))) if p.stem not in stems]
+    tests = []
+    if flow_paths:
+        from .engine import load_flows
+
+        tests = load_flows(flow_paths, skip_login=skip_login, base_url=base_url,
+                           share_prefixes=share_prefixes)
+    for path in paths:
+        try:
+            tests.append(load_test(path, skip_login=skip_login, base_url=base_url))
+        except SyntaxError as exc:
+            # Some generated files do not compile; keep them in the run so
+            # they are reported as errors rather than silently dropped.
+            tests.append(_broken_test(path, exc))
+    return sorted(tests, key=lambda t: t.name)
+
+
+def _broken_test(path: Path, exc: SyntaxError) -> TestCase:
+    async def run() -> None:
+        raise exc
+
+    module = types.ModuleType(f"testsprite_tests.{path.stem}")
+    module.__file__ = str(path)
+    return TestCase(path=path, module=module, run=run)
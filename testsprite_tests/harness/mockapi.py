@@ -0,0 +1,972 @@
+"""Local stand-in for the ``/api/*`` routes, backed by ``db_dump.json``.
+
+Browser and API tests against the real server depend on a live MongoDB
+and whatever state earlier runs left behind.  This aiohttp server answers
+the Mongo-branch contract of ``server/routes/relational.ts``,
+``sale_entries.ts``, ``daily_rates.ts`` and ``reports.ts`` (same paths,
+envelopes and field names) from the ``fuelone`` fixtures in
+``db_dump.json``.  Writes go to an in-memory copy, so every server start
+begins from the same data.
+
+* ``POST /api/auth/login`` accepts the harness account
+  (``TESTSPRITE_USERNAME``/``TESTSPRITE_PASSWORD``) and sets the same
+  ``token`` cookie the real server does, signed with the server's
+  ``JWT_SECRET`` when it can be read locally.  Other ``/api/*`` calls
+  without a valid cookie get the real 401.
+* ``--latency``/``--jitter`` add a delay to every API response, to check
+  that waits are event-driven rather than tuned to the real server.
+* A built frontend in ``dist/`` (``npm run build``) is served with the same
+  SPA fallback as ``server/production.ts``, so browser tests run too.
+
+Usage::
+
+    python -m harness.mockapi --port 5100 --latency 50
+    python -m harness --mock-api            # start it for one suite run
+
+Leaving out ``--mock-api`` points the suite back at the real server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import copy
+import datetime as dt
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from aiohttp import web
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME, REPO_ROOT, decode_jwt, encode_jwt, \
+    jwt_signature_valid, server_jwt_secret
+from .loader import TESTS_DIR
+
+DUMP_FILE = REPO_ROOT / "db_dump.json"
+DEFAULT_DATABASE = "fuelone"
+DIST_DIR = REPO_ROOT / "dist"
+DEFAULT_PORT = 5100
+FALLBACK_SECRET = "testsprite-mock-secret"
+TOKEN_TTL = 7 * 24 * 60 * 60  # JWT_EXPIRES_IN = '7d'
+SALE_ENTRY_PAGE_DEFAULT = 200  # page sizes of server/routes/sale_entries.ts
+SALE_ENTRY_PAGE_MAX = 1000
+SALE_ENTRY_STREAM_BATCH = 500
+
+# Routes that skip authenticateToken on the real server.
+_PUBLIC = {"/api/health", "/api/readiness", "/api/auth/login", "/api/auth/logout"}
+
+Handler = Callable[[web.Request], Any]
+
+
+def _now() -> str:
+    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _day(value: Any) -> str:
+    """``"2026-01-10T00:00:00.000Z"`` -> ``"2026-01-10"``."""
+    return str(value or "")[:10]
+
+
+def _parse_date(value: str) -> Optional[dt.datetime]:
+    """``new Date(value)`` for the ISO dates the app sends; None where it is NaN."""
+    try:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _with_id(doc: dict) -> dict:
+    return {**doc, "id": doc["_id"]}
+
+
+def _rows(rows: List[dict], **extra: Any) -> web.Response:
+    return web.json_response({"success": True, "ok": True, "data": rows, "rows": rows, **extra})
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"success": False, "error": message}, status=status)
+
+
+def _sale_entry_key(entry: dict) -> tuple:
+    """Keyset order of ``GET /api/sale-entries``: (saleDate, createdAt, _id)."""
+    return (str(entry.get("saleDate") or ""), str(entry.get("createdAt") or ""), str(entry["_id"]))
+
+
+def _encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(value: str) -> Optional[tuple]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not (isinstance(key, list) and len(key) == 3 and all(isinstance(k, str) for k in key)):
+        return None
+    return tuple(key)
+
+
+class Store:
+    """In-memory collections keyed by mongoose collection name."""
+
+    def __init__(self, collections: Dict[str, List[dict]]) -> None:
+        self.collections = {name: list(docs) for name, docs in collections.items()}
+
+    @classmethod
+    def from_dump(cls, path: Path = DUMP_FILE, database: str = DEFAULT_DATABASE) -> "Store":
+        dump = json.loads(path.read_text(encoding="utf-8"))
+        for db in dump.get("databases", []):
+            if db["name"] == database:
+                return cls({c["name"]: copy.deepcopy(c["sample"]) for c in db["collections"]})
+        raise ValueError(f"database {database!r} not found in {path}")
+
+    def all(self, name: str) -> List[dict]:
+        return self.collections.setdefault(name, [])
+
+    def find(self, name: str, predicate: Callable[[dict], bool] = lambda d: True) -> List[dict]:
+        return [doc for doc in self.all(name) if predicate(doc)]
+
+    def get(self, name: str, doc_id: Any) -> Optional[dict]:
+        doc_id = str(doc_id)
+        return next((doc for doc in self.all(name) if str(doc["_id"]) == doc_id), None)
+
+    def insert(self, name: str, doc: dict) -> dict:
+        now = _now()
+        doc = {"_id": doc.get("_id") or os.urandom(12).hex(), **doc, "createdAt": now, "updatedAt": now}
+        self.all(name).append(doc)
+        return doc
+
+    def update(self, name: str, doc_id: Any, fields: dict) -> Optional[dict]:
+        doc = self.get(name, doc_id)
+        if doc is not None:
+            doc.update(fields, updatedAt=_now())
+        return doc
+
+    def delete(self, name: str, doc_id: Any) -> bool:
+        doc = self.get(name, doc_id)
+        if doc is None:
+            return False
+        self.all(name).remove(doc)
+        return True
+
+
+def _date_filter(request: web.Request, field: str) -> Callable[[dict], bool]:
+    start, end = request.query.get("from"), request.query.get("to")
+
+    def keep(doc: dict) -> bool:
+        day = _day(doc.get(field))
+        return (not start or day >= start) and (not end or day <= end)
+
+    return keep
+
+
+def _camel(key: str) -> str:
+    head, *rest = key.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+class MockApi:
+    """Route table for the mock; one instance per server."""
+
+    def __init__(self, store: Store, latency: float = 0.0, jitter: float = 0.0,
+                 username: Optional[str] = None, password: Optional[str] = None) -> None:
+        self.store = store
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.username = (username or os.environ.get("TESTSPRITE_USERNAME", DEFAULT_USERNAME)).lower()
+        self.password = password or os.environ.get("TESTSPRITE_PASSWORD", DEFAULT_PASSWORD)
+        self.secret = server_jwt_secret() or FALLBACK_SECRET
+
+    # -- plumbing -----------------------------------------------------------
+
+    def app(self, dist_dir: Optional[Path] = DIST_DIR) -> web.Application:
+        app = web.Application(middlewares=[self._middleware], client_max_size=50 * 1024 * 1024)
+        self._register(app.router)
+        if dist_dir is not None and (dist_dir / "index.html").exists():
+            index = dist_dir / "index.html"
+
+            async def spa(request: web.Request) -> web.StreamResponse:
+                path = (dist_dir / request.match_info["tail"]).resolve()
+                if path.is_file() and dist_dir.resolve() in path.parents:
+                    return web.FileResponse(path)
+                return web.FileResponse(index)
+
+            app.router.add_get("/{tail:(?!api/).*}", spa)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        if not request.path.startswith("/api/"):
+            return await handler(request)
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        if request.path not in _PUBLIC:
+            claims = self._claims(request)
+            if claims is None:
+                return web.json_response({"error": "Authentication required"}, status=401)
+            request["user"] = claims
+        return await handler(request)
+
+    def _claims(self, request: web.Request) -> Optional[dict]:
+        token = request.cookies.get("token")
+        auth = request.headers.get("Authorization", "")
+        if not token and auth.startswith("Bearer "):
+            token = auth[len("Bearer "):]
+        if not token:
+            return None
+        try:
+            if not jwt_signature_valid(token, self.secret):
+                return None
+            claims = decode_jwt(token)
+        except (ValueError, IndexError):
+            return None
+        return claims if claims.get("exp", 0) > time.time() else None
+
+    def _register(self, router: web.UrlDispatcher) -> None:
+        router.add_get("/health", self.health)
+        router.add_get("/api/health", self.health)
+        router.add_get("/api/readiness", self.readiness)
+        router.add_post("/api/auth/login", self.login)
+        router.add_post("/api/auth/logout", self.logout)
+        router.add_get("/api/auth/me", self.me)
+
+        # relational.ts
+        router.add_get("/api/fuel-products", self.list_fuel_products)
+        router.add_post("/api/fuel-products", self.create_fuel_product)
+        router.add_put("/api/fuel-products/{id}", self.update_fuel_product)
+        router.add_delete("/api/fuel-products/{id}", self.soft_delete("fuelproducts", "Product not found"))
+        router.add_get("/api/lubricants", self.list_lubricants)
+        router.add_post("/api/lubricants", self.create("lubricantproducts", self._lubricant_fields))
+        router.add_put("/api/lubricants/{id}", self.update("lubricantproducts", self._lubricant_fields))
+        router.add_delete("/api/lubricants/{id}", self.soft_delete("lubricantproducts", "Lubricant not found"))
+        router.add_get("/api/guest-sales", self.list_guest_sales)
+        router.add_post("/api/guest-sales", self.create_guest_sale)
+        router.add_get("/api/credit-customers", self.listing("creditcustomers", active_only=True))
+        router.add_post("/api/credit-customers", self.create("creditcustomers", self._customer_fields))
+        router.add_put("/api/credit-customers/{id}", self.update("creditcustomers", self._customer_fields))
+        router.add_delete("/api/credit-customers/{id}",
+                          self.soft_delete("creditcustomers", "Customer not found", softDeleted=True))
+        router.add_post("/api/attendance", self.save_attendance)
+        router.add_post("/api/attendance/bulk", self.save_attendance_bulk)
+        router.add_get("/api/attendance/list", self.listing("attendances", date_field="attendanceDate"))
+        router.add_get("/api/attendance/details", self.attendance_details)
+        router.add_get("/api/tank-daily-readings", self.list_tank_readings)
+        router.add_post("/api/tank-daily-readings", self.save_tank_reading)
+        for path, collection, date_field in (
+            ("interest-transactions", "interesttransactions", "transactionDate"),
+            ("day-cash-movements", "daycashmovements", "date"),
+            ("tanker-sales", "tankersales", "saleDate"),
+            ("credit-requests", "creditrequests", "requestDate"),
+            ("expiry-items", "expiryitems", "issueDate"),
+            ("feedback", "feedbacks", None),
+            ("employees", "employees", None),
+            ("duty-shifts", "dutyshifts", None),
+            ("expenses", "expenses", "expenseDate"),
+            ("recoveries", "recoveries", "recoveryDate"),
+            ("credit-sales", "creditsales", "saleDate"),
+            ("lubricant-sales", "lubsales", "saleDate"),
+            ("swipe-transactions", "swipetransactions", "transactionDate"),
+            ("denominations", "denominations", None),
+            ("employee-cash-recovery", "employeecashrecoveries", None),
+            ("day-settlements", "daysettlements", None),
+            ("categories", "expirycategories", None),
+        ):
+            router.add_get(f"/api/{path}", self.listing(collection, date_field=date_field))
+            router.add_post(f"/api/{path}", self.create(collection))
+            router.add_put(f"/api/{path}/{{id}}", self.update(collection))
+            router.add_delete(f"/api/{path}/{{id}}", self.remove(collection))
+        for path, collection in (
+            ("sheet-records", "sheetrecords"),
+            ("duty-pay/entry", "dutypayrecords"),
+            ("sales-officer", "salesofficerinspections"),
+        ):
+            router.add_post(f"/api/{path}", self.create(collection))
+
+        # sale_entries.ts
+        router.add_get("/api/nozzles-with-last-readings", self.nozzles_with_last_readings)
+        router.add_get("/api/sale-entries", self.list_sale_entries)
+        router.add_get("/api/sale-entries/totals", self.sale_entry_totals)
+        router.add_post("/api/sale-entries", self.create_sale_entries)
+        router.add_delete("/api/sale-entries/{id}", self.remove("saleentries"))
+        router.add_delete("/api/sale-entries-batch", self.delete_sale_entries_batch)
+
+        # daily_rates.ts
+        router.add_get("/api/daily-sale-rates", self.list_daily_rates)
+        router.add_post("/api/daily-sale-rates", self.save_daily_rates)
+        router.add_delete("/api/daily-sale-rates/{id}", self.delete_daily_rate)
+
+        # reports.ts
+        router.add_get("/api/reports/all-credit-customers", self.report_credit_customers)
+        router.add_get("/api/reports/vendor-transactions", self.report_vendor_transactions)
+        router.add_get("/api/reports/receivables-payables", self.report_receivables_payables)
+        router.add_get("/api/reports/{name}", self.report_empty)
+        router.add_post("/api/reports/run", self.report_empty)
+
+        router.add_route("*", "/api/{tail:.*}", self.not_found)
+
+    # -- generic collection handlers ------------------------------------------
+
+    def listing(self, collection: str, date_field: Optional[str] = None,
+                active_only: bool = False) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            keep = _date_filter(request, date_field) if date_field else (lambda d: True)
+            docs = self.store.find(collection, lambda d: keep(d) and (not active_only or d.get("isActive")))
+            docs.sort(key=lambda d: d.get("createdAt") or "", reverse=True)
+            return _rows([_with_id(d) for d in docs])
+        return handler
+
+    def create(self, collection: str, fields: Callable[[dict], dict] = dict) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            body = await request.json()
+            doc = self.store.insert(collection, {**fields(body), "createdBy": request["user"].get("userId")})
+            return web.json_response({"success": True, "ok": True, "data": _with_id(doc)})
+        return handler
+
+    def update(self, collection: str, fields: Callable[[dict], dict] = dict) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            doc = self.store.update(collection, request.match_info["id"], fields(await request.json()))
+            if doc is None:
+                return _error(404, "Not found")
+            return web.json_response({"success": True, "ok": True, "data": _with_id(doc)})
+        return handler
+
+    def remove(self, collection: str) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            self.store.delete(collection, request.match_info["id"])
+            return web.json_response({"success": True, "ok": True})
+        return handler
+
+    def soft_delete(self, collection: str, missing: str, **extra: Any) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            if self.store.update(collection, request.match_info["id"], {"isActive": False}) is None:
+                return _error(404, missing)
+            return web.json_response({"success": True, "ok": True, **extra})
+        return handler
+
+    async def not_found(self, request: web.Request) -> web.Response:
+        return web.json_response({"error": f"{request.method} {request.path} is not mocked"}, status=404)
+
+    # -- health and auth ------------------------------------------------------
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "service": "api", "time": _now()})
+
+    async def readiness(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "db": "up", "latencyMs": 0})
+
+    def _user(self, login: str) -> Optional[dict]:
+        login = login.lower()
+        for user in self.store.all("users"):
+            if login in (str(user.get("email", "")).lower(), str(user.get("username", "")).lower()):
+                return user
+        return None
+
+    async def login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        email, password = str(body.get("email") or ""), str(body.get("password") or "")
+        if not email or not password:
+            return web.json_response({"error": "Email/username and password are required"}, status=400)
+        if email.lower() != self.username or password != self.password:
+            return web.json_response({"error": "Invalid email/username or password"}, status=401)
+        tenants = self.store.all("tenants")
+        tenant = next((t for t in tenants if t.get("status") == "active"), tenants[0] if tenants else None)
+        if tenant is None:
+            return web.json_response({"error": "No active organization found for this user"}, status=400)
+        user = self._user(email) or {"_id": "mock-user", "email": email, "username": email,
+                                     "fullName": email, "roles": ["super_admin"]}
+        now = int(time.time())
+        token = encode_jwt({"userId": str(user["_id"]), "email": user.get("email", email),
+                            "tenantId": str(tenant["_id"]), "iat": now, "exp": now + TOKEN_TTL},
+                           self.secret)
+        response = web.json_response({
+            "user": {"id": str(user["_id"]), "email": user.get("email"), "username": user.get("username"),
+                     "fullName": user.get("fullName"), "roles": user.get("roles") or [user.get("role")]},
+            "tenant": {"id": str(tenant["_id"]), "organizationName": tenant.get("organizationName")},
+        })
+        response.set_cookie("token", token, httponly=True, samesite="Lax", path="/", max_age=TOKEN_TTL)
+        return response
+
+    async def logout(self, request: web.Request) -> web.Response:
+        response = web.json_response({"message": "Logged out successfully"})
+        response.del_cookie("token", path="/")
+        return response
+
+    async def me(self, request: web.Request) -> web.Response:
+        claims = request["user"]
+        user = self.store.get("users", claims.get("userId")) or {}
+        tenant = self.store.get("tenants", claims.get("tenantId"))
+        email = claims.get("email", "")
+        return web.json_response({
+            "id": claims.get("userId"),
+            "email": email,
+            "username": user.get("username", email.split("@")[0]),
+            "fullName": user.get("fullName") or email.split("@")[0],
+            "roles": user.get("roles") or [user.get("role", "super_admin")],
+            "tenant": {"id": str(tenant["_id"]), "organizationName": tenant.get("organizationName")}
+            if tenant else None,
+        })
+
+    # -- relational.ts --------------------------------------------------------
+
+    def _product_names(self) -> Dict[str, str]:
+        return {str(p["_id"]): p.get("productName", "") for p in self.store.all("fuelproducts")}
+
+    async def list_fuel_products(self, request: web.Request) -> web.Response:
+        docs = sorted(self.store.all("fuelproducts"), key=lambda d: d.get("createdAt") or "")
+        return _rows([{
+            "id": d["_id"],
+            "product_name": d.get("productName"),
+            "short_name": d.get("shortName"),
+            "wgt_percentage": d.get("wgtPercentage"),
+            "tds_percentage": d.get("tdsPercentage"),
+            "gst_percentage": d.get("gstPercentage"),
+            "lfrn": d.get("lfrn"),
+            "isActive": d.get("isActive"),
+            "created_at": d.get("createdAt"),
+        } for d in docs])
+
+    @staticmethod
+    def _fuel_product_fields(body: dict) -> dict:
+        fields = {_camel(k): v for k, v in body.items()
+                  if k in ("product_name", "short_name", "wgt_percentage", "tds_percentage",
+                           "gst_percentage", "lfrn")}
+        if "isActive" in body:
+            fields["isActive"] = body["isActive"]
+        return fields
+
+    async def create_fuel_product(self, request: web.Request) -> web.Response:
+        doc = self.store.insert("fuelproducts", {**self._fuel_product_fields(await request.json()),
+                                                 "isActive": True})
+        return web.json_response({"success": True, "ok": True, "data": doc})
+
+    async def update_fuel_product(self, request: web.Request) -> web.Response:
+        fields = self._fuel_product_fields(await request.json())
+        doc = self.store.update("fuelproducts", request.match_info["id"], fields)
+        if doc is None:
+            return _error(404, "Product not found")
+        return web.json_response({"success": True, "ok": True, "data": doc})
+
+    @staticmethod
+    def _lubricant_fields(body: dict) -> dict:
+        fields = {_camel(k): v for k, v in body.items() if k != "lubricant_name"}
+        if "lubricant_name" in body:
+            fields["productName"] = body["lubricant_name"]
+        fields.setdefault("isActive", True)
+        return fields
+
+    async def list_lubricants(self, request: web.Request) -> web.Response:
+        docs = self.store.find("lubricantproducts", lambda d: d.get("isActive"))
+        docs.sort(key=lambda d: d.get("createdAt") or "", reverse=True)
+        return _rows([{
+            **d,
+            "id": d["_id"],
+            "lubricant_name": d.get("productName"),
+            "gst_percentage": d.get("gstPercentage"),
+            "mrp_rate": d.get("mrpRate"),
+            "sale_rate": d.get("saleRate"),
+            "current_stock": d.get("currentStock"),
+            "minimum_stock": d.get("minimumStock"),
+            "is_active": d.get("isActive"),
+            "created_at": d.get("createdAt"),
+        } for d in docs])
+
+    async def list_guest_sales(self, request: web.Request) -> web.Response:
+        keep = _date_filter(request, "saleDate")
+        mobile = request.query.get("mobile")
+        docs = self.store.find("guestsales", lambda d: keep(d) and (
+            not mobile or mobile in str(d.get("mobileNumber", ""))))
+        docs.sort(key=lambda d: d.get("createdAt") or "", reverse=True)
+        names = self._product_names()
+        return _rows([{**_with_id(d), "productName": names.get(str(d.get("fuelProductId")), "")}
+                      for d in docs])
+
+    async def create_guest_sale(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        amount = body.pop("amount", None)
+        total = _num(amount) if amount else \
+            _num(body.get("quantity")) * _num(body.get("pricePerUnit")) - _num(body.get("discount"))
+        doc = self.store.insert("guestsales", {**body, "totalAmount": total,
+                                               "createdBy": request["user"].get("userId")})
+        return web.json_response({"success": True, "data": _with_id(doc)})
+
+    @staticmethod
+    def _customer_fields(body: dict) -> dict:
+        fields = {_camel(k): v for k, v in body.items() if k not in ("phone_number", "is_active")}
+        if "phone_number" in body:
+            fields["mobileNumber"] = fields["phoneNumber"] = body["phone_number"]
+        if "alt_phone_no" in body:
+            fields["altPhone"] = fields.pop("altPhoneNo")
+        if "is_active" in body:
+            fields["isActive"] = body["is_active"]
+        fields.setdefault("isActive", True)
+        return fields
+
+    def _upsert_attendance(self, row: dict, user_id: Optional[str]) -> dict:
+        day = _day(row.get("attendanceDate")) or dt.date.today().isoformat()
+        fields = {**row, "attendanceDate": f"{day}T00:00:00.000Z", "createdBy": user_id}
+        existing = next((a for a in self.store.all("attendances")
+                         if _day(a.get("attendanceDate")) == day
+                         and a.get("employeeId") == row.get("employeeId")), None)
+        if existing is not None:
+            return self.store.update("attendances", existing["_id"], fields)
+        return self.store.insert("attendances", fields)
+
+    async def save_attendance(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not body.get("employeeId") or not body.get("status"):
+            return _error(400, "employeeId and status are required")
+        doc = self._upsert_attendance(body, request["user"].get("userId"))
+        return web.json_response({"success": True, "data": _with_id(doc)})
+
+    async def save_attendance_bulk(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not isinstance(body, list):
+            return _error(400, "Expected array")
+        ordered = request.query.get("ordered") != "false"
+        results: List[dict] = []
+        for index, row in enumerate(body):
+            valid = isinstance(row, dict) and all(isinstance(row.get(k), str) and row.get(k)
+                                                  for k in ("attendanceDate", "employeeId", "status"))
+            error = None if valid else "attendanceDate, employeeId and status are required"
+            if valid and _parse_date(row["attendanceDate"]) is None:
+                valid, error = False, "attendanceDate: Invalid date"
+            results.append({"index": index, "status": "pending" if valid else "invalid",
+                            **({} if valid else {"error": error})})
+        invalid = [r for r in results if r["status"] == "invalid"]
+        if ordered and invalid:
+            return web.json_response({"success": False, "error": "Invalid attendance rows", "results": invalid},
+                                     status=400)
+        saved = []
+        for result in results:
+            if result["status"] != "pending":
+                continue
+            row = body[result["index"]]
+            existed = any(_day(a.get("attendanceDate")) == _day(row["attendanceDate"])
+                          and a.get("employeeId") == row["employeeId"] for a in self.store.all("attendances"))
+            doc = self._upsert_attendance(row, request["user"].get("userId"))
+            result.update(status="updated" if existed else "created", id=doc["_id"])
+            saved.append(_with_id(doc))
+        summary = {status: sum(r["status"] == status for r in results)
+                   for status in ("created", "updated", "failed", "skipped", "invalid")}
+        written = summary["created"] + summary["updated"]
+        return web.json_response({"success": not invalid, "count": written, **summary,
+                                  "results": results, "data": saved}, status=200 if written or not invalid else 400)
+
+    async def attendance_details(self, request: web.Request) -> web.Response:
+        day = request.query.get("date")
+        if not day:
+            return web.json_response({"error": "Date is required"}, status=400)
+        employees = {str(e["_id"]): e for e in self.store.all("employees")}
+        docs = self.store.find("attendances", lambda a: _day(a.get("attendanceDate")) == _day(day))
+        return web.json_response({"success": True, "data": [{
+            **_with_id(a),
+            "employeeName": employees.get(str(a.get("employeeId")), {}).get("employeeName", "Unknown"),
+            "designation": employees.get(str(a.get("employeeId")), {}).get("designation", ""),
+        } for a in docs]})
+
+    async def save_tank_reading(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        day = _day(body.get("readingDate"))
+        previous_day = (dt.date.fromisoformat(day) - dt.timedelta(days=1)).isoformat()
+        readings = self.store.all("tankdailyreadings")
+        existing = next((r for r in readings if r.get("tankId") == body.get("tankId")
+                         and _day(r.get("readingDate")) == day), None)
+        previous = next((r for r in readings if r.get("tankId") == body.get("tankId")
+                         and _day(r.get("readingDate")) == previous_day), None)
+        opening = _num(previous.get("closingStock")) if previous else 0.0
+        received, closing = _num(body.get("stockReceived")), _num(body.get("closingStock"))
+        meter, testing = _num(body.get("meterSale")), _num(body.get("testing"))
+        fields = {
+            "readingDate": body.get("readingDate"),
+            "tankId": body.get("tankId"),
+            "openingStock": opening,
+            "stockReceived": received,
+            "closingStock": closing,
+            "meterSale": meter,
+            "testing": testing,
+            "variation": (meter - testing) - ((opening + received) - closing),
+            "notes": body.get("notes"),
+            "createdBy": request["user"].get("userId"),
+        }
+        if existing is not None:
+            doc = self.store.update("tankdailyreadings", existing["_id"], fields)
+        else:
+            doc = self.store.insert("tankdailyreadings", fields)
+        return web.json_response({"success": True, "data": _with_id(doc)})
+
+    async def list_tank_readings(self, request: web.Request) -> web.Response:
+        day, product = request.query.get("date"), request.query.get("fuelProductId")
+        tank_ids = None
+        if product:
+            tank_ids = {str(t["_id"]) for t in self.store.all("tanks") if t.get("fuelProductId") == product}
+            if not tank_ids:
+                return web.json_response({"success": True, "rows": []})
+        docs = self.store.find("tankdailyreadings", lambda r: (not day or _day(r.get("readingDate")) == day)
+                               and (tank_ids is None or r.get("tankId") in tank_ids))
+        docs.sort(key=lambda r: r.get("readingDate") or "", reverse=True)
+        rows = []
+        for r in docs:
+            receipts = sum(_num(s.get("tankerSaleQuantity")) for s in self.store.all("tankersales")
+                           if s.get("tankId") == r.get("tankId")
+                           and _day(s.get("saleDate")) == _day(r.get("readingDate")))
+            previous, current = _num(r.get("openingStock")), _num(r.get("closingStock"))
+            meter, testing = _num(r.get("meterSale")), _num(r.get("testing"))
+            actual, dip = meter - testing, previous + receipts - current
+            variation = actual - dip
+            rows.append({
+                "id": r["_id"], "date": r.get("readingDate"),
+                "tankId": r.get("tankId"), "tank_id": r.get("tankId"),
+                "previousStock": f"{previous:.2f}", "receipts": f"{receipts:.2f}",
+                "totalStock": f"{previous + receipts:.2f}",
+                "currentStock": f"{current:.2f}", "closing_stock": f"{current:.2f}",
+                "meterSales": f"{meter:.2f}", "meter_sale": f"{meter:.2f}",
+                "testing": f"{testing:.2f}", "actualSales": f"{actual:.2f}",
+                "dipSales": f"{dip:.2f}", "variation": f"{variation:.2f}",
+                "variLimit": f"{actual * 0.006:.2f}",
+                "limit": f"{variation / actual * 100:.2f}%" if actual else "0.00%",
+                "limit4": f"{actual * 0.04:.2f}",
+                "dipReading": r.get("closingStock"), "dip_reading": r.get("closingStock"),
+                "notes": r.get("notes"),
+            })
+        return web.json_response({"success": True, "rows": rows})
+
+    # -- sale_entries.ts ------------------------------------------------------
+
+    async def nozzles_with_last_readings(self, request: web.Request) -> web.Response:
+        day = request.query.get("date") or dt.date.today().isoformat()
+        tanks = {str(t["_id"]): t.get("tankNumber") for t in self.store.all("tanks")}
+        names = self._product_names()
+        rates = {r.get("fuelProductId"): r.get("closeRate") for r in self.store.all("dailysalerates")
+                 if _day(r.get("rateDate")) == day}
+        last: Dict[str, dict] = {}
+        for entry in self.store.all("saleentries"):
+            key = (entry.get("saleDate") or "", entry.get("createdAt") or "")
+            seen = last.get(entry.get("nozzleId"))
+            if seen is None or key > (seen.get("saleDate") or "", seen.get("createdAt") or ""):
+                last[entry.get("nozzleId")] = entry
+        nozzles = self.store.find("nozzles", lambda n: n.get("isActive"))
+        nozzles.sort(key=lambda n: (n.get("pumpStation") or "", n.get("nozzleNumber") or ""))
+        rows = [{
+            "id": n["_id"],
+            "nozzle_number": n.get("nozzleNumber"),
+            "tank_number": tanks.get(n.get("tankId"), ""),
+            "pump_station": n.get("pumpStation"),
+            "fuel_product_id": n.get("fuelProductId"),
+            "product_name": names.get(n.get("fuelProductId"), ""),
+            "last_closing_reading": last[str(n["_id"])]["closingReading"] if str(n["_id"]) in last else "0",
+            "current_rate": rates.get(n.get("fuelProductId")) or 0,
+        } for n in nozzles]
+        return web.json_response({"success": True, "ok": True, "rows": rows})
+
+    def _sale_entries(self, query: Any) -> List[dict]:
+        """Entries matching ``from``/``to``/``product``/``shift_id``, newest first by (saleDate, createdAt, _id)."""
+        start, end = query.get("from") or query.get("from_date"), query.get("to") or query.get("to_date")
+        product, shift = query.get("product"), query.get("shift_id")
+        product_id = None
+        if product and product != "All":
+            product_id = next((str(p["_id"]) for p in self.store.all("fuelproducts")
+                               if p.get("productName") == product), "non_existent")
+
+        def keep(e: dict) -> bool:
+            day = _day(e.get("saleDate"))
+            in_range = not (start and end) or start <= day <= end
+            return in_range and (product_id is None or e.get("fuelProductId") == product_id) \
+                and (not shift or e.get("shiftId") == shift)
+
+        entries = self.store.find("saleentries", keep)
+        entries.sort(key=_sale_entry_key, reverse=True)
+        return entries
+
+    def _sale_entry_rows(self, entries: Sequence[dict]) -> List[dict]:
+        lookup = {name: {str(d["_id"]): d for d in self.store.all(name)}
+                  for name in ("nozzles", "tanks", "fuelproducts", "dutyshifts", "employees", "users")}
+        rows = []
+        for e in entries:
+            nozzle = lookup["nozzles"].get(e.get("nozzleId"), {})
+            user = lookup["users"].get(e.get("createdBy"), {})
+            rows.append({
+                "id": e["_id"],
+                "sale_date": _day(e.get("saleDate")),
+                "pump_station": e.get("pumpStation"),
+                "tank_number": lookup["tanks"].get(nozzle.get("tankId"), {}).get("tankNumber", ""),
+                "product_name": lookup["fuelproducts"].get(e.get("fuelProductId"), {}).get("productName", ""),
+                "shift": lookup["dutyshifts"].get(e.get("shiftId"), {}).get("shiftName", ""),
+                "nozzle_number": nozzle.get("nozzleNumber", ""),
+                "opening_reading": e.get("openingReading"),
+                "closing_reading": e.get("closingReading"),
+                "price_per_unit": e.get("pricePerUnit"),
+                "quantity": e.get("quantity"),
+                "net_sale_amount": e.get("netSaleAmount"),
+                "employee_name": lookup["employees"].get(e.get("employeeId"), {}).get("employeeName", ""),
+                "created_at": e.get("createdAt"),
+                "created_by": user.get("fullName") or user.get("username") or "",
+            })
+        return rows
+
+    async def list_sale_entries(self, request: web.Request) -> web.StreamResponse:
+        query = request.query
+        after = None
+        if query.get("cursor"):
+            after = _decode_cursor(query["cursor"])
+            if after is None:
+                return _error(400, "Invalid cursor")
+        entries = self._sale_entries(query)
+        if after is not None:
+            entries = [e for e in entries if _sale_entry_key(e) < after]
+
+        if query.get("stream") == "1" or "application/x-ndjson" in request.headers.get("Accept", ""):
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            for i in range(0, len(entries), SALE_ENTRY_STREAM_BATCH):
+                rows = self._sale_entry_rows(entries[i:i + SALE_ENTRY_STREAM_BATCH])
+                await response.write("".join(json.dumps(r) + "\n" for r in rows).encode())
+            await response.write_eof()
+            return response
+
+        if "limit" not in query and after is None:
+            return web.json_response({"success": True, "ok": True, "rows": self._sale_entry_rows(entries)})
+        try:
+            limit = int(query.get("limit") or SALE_ENTRY_PAGE_DEFAULT)
+        except ValueError:
+            limit = SALE_ENTRY_PAGE_DEFAULT
+        limit = min(max(limit, 1), SALE_ENTRY_PAGE_MAX)
+        page = entries[:limit]
+        next_cursor = _encode_cursor(_sale_entry_key(page[-1])) if len(page) == limit else None
+        return web.json_response({"success": True, "ok": True, "rows": self._sale_entry_rows(page),
+                                  "nextCursor": next_cursor})
+
+    async def sale_entry_totals(self, request: web.Request) -> web.Response:
+        names = self._product_names()
+        totals: Dict[str, dict] = {}
+        for e in self._sale_entries(request.query):
+            product_id = str(e.get("fuelProductId"))
+            row = totals.setdefault(product_id, {
+                "fuel_product_id": product_id, "product_name": names.get(product_id, ""),
+                "entries": 0, "quantity": 0.0, "net_sale_amount": 0.0})
+            row["entries"] += 1
+            row["quantity"] += _num(e.get("quantity"))
+            row["net_sale_amount"] += _num(e.get("netSaleAmount"))
+        rows = sorted(totals.values(), key=lambda r: r["product_name"])
+        total = {key: sum(r[key] for r in rows) for key in ("entries", "quantity", "net_sale_amount")}
+        return web.json_response({"success": True, "ok": True, "rows": rows, "total": total})
+
+    async def create_sale_entries(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not isinstance(body, list):
+            return _error(400, "Expected array of entries")
+        # Validate the whole sheet before writing any of it, like the server.
+        # price_per_unit may be left out when net_sale_amount is given.
+        numeric = ("opening_reading", "closing_reading", "test_qty", "price_per_unit")
+        errors = []
+        for index, entry in enumerate(body):
+            entry = entry if isinstance(entry, dict) else {}
+            optional = {"test_qty"} | ({"price_per_unit"} if entry.get("net_sale_amount") else set())
+            bad = [f for f in numeric
+                   if _num(entry.get(f) or (0 if f in optional else entry.get(f)), None) is None]
+            if bad:
+                errors.append({"index": index, "error": f"{', '.join(bad)} must be numeric"})
+        if errors:
+            return web.json_response({"success": False, "error": "Invalid sale entries", "errors": errors},
+                                     status=400)
+        ids = []
+        for entry in body:
+            opening, closing = _num(entry.get("opening_reading")), _num(entry.get("closing_reading"))
+            test, price = _num(entry.get("test_qty")), _num(entry.get("price_per_unit"))
+            quantity = round(max(0.0, closing - opening - test), 2)
+            net = entry.get("net_sale_amount") or round(quantity * price, 2)
+            ids.append(self.store.insert("saleentries", {
+                "saleDate": entry.get("sale_date"),
+                "shiftId": entry.get("shift_id"),
+                "pumpStation": entry.get("pump_station"),
+                "nozzleId": entry.get("nozzle_id"),
+                "fuelProductId": entry.get("fuel_product_id"),
+                "openingReading": opening,
+                "closingReading": closing,
+                "testQty": test,
+                "pricePerUnit": price,
+                "quantity": quantity,
+                "netSaleAmount": _num(net),
+                "employeeId": entry.get("employee_id"),
+                "createdBy": request["user"].get("userId"),
+            })["_id"])
+        return web.json_response({"success": True, "ok": True, "count": len(ids), "ids": ids})
+
+    async def delete_sale_entries_batch(self, request: web.Request) -> web.Response:
+        ids = (await request.json()).get("ids") if request.can_read_body else None
+        if not ids or not isinstance(ids, list):
+            return _error(400, "No IDs provided")
+        for entry_id in ids:
+            self.store.delete("saleentries", entry_id)
+        return web.json_response({"success": True, "ok": True})
+
+    # -- daily_rates.ts -------------------------------------------------------
+
+    async def list_daily_rates(self, request: web.Request) -> web.Response:
+        day, start, end = (request.query.get(k) for k in ("date", "from", "to"))
+
+        def keep(r: dict) -> bool:
+            rate_day = _day(r.get("rateDate"))
+            if day:
+                return rate_day == day
+            return not (start and end) or start <= rate_day <= end
+
+        names = self._product_names()
+        docs = sorted(self.store.find("dailysalerates", keep), key=lambda r: r.get("rateDate") or "",
+                      reverse=True)
+        return web.json_response({"success": True, "ok": True, "rows": [{
+            "id": r["_id"],
+            "rate_date": _day(r.get("rateDate")),
+            "open_rate": r.get("openRate"),
+            "close_rate": r.get("closeRate"),
+            "variation_amount": r.get("variationAmount"),
+            "fuel_product_id": r.get("fuelProductId"),
+            "product_name": names.get(r.get("fuelProductId"), "Unknown"),
+            "created_at": r.get("createdAt"),
+        } for r in docs]})
+
+    async def save_daily_rates(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        results = []
+        for rate in body if isinstance(body, list) else [body]:
+            day = _day(rate.get("rateDate")) or dt.date.today().isoformat()
+            fields = {
+                "rateDate": f"{day}T00:00:00.000Z",
+                "fuelProductId": rate.get("fuelProductId"),
+                "openRate": rate.get("openRate"),
+                "closeRate": rate.get("closeRate"),
+                "variationAmount": rate.get("variationAmount"),
+                "createdBy": request["user"].get("userId"),
+            }
+            existing = next((r for r in self.store.all("dailysalerates")
+                             if _day(r.get("rateDate")) == day
+                             and r.get("fuelProductId") == rate.get("fuelProductId")), None)
+            if existing is not None:
+                doc = self.store.update("dailysalerates", existing["_id"], fields)
+            else:
+                doc = self.store.insert("dailysalerates", fields)
+            results.append(_with_id(doc))
+        return web.json_response({"success": True, "ok": True, "data": results})
+
+    async def delete_daily_rate(self, request: web.Request) -> web.Response:
+        if not self.store.delete("dailysalerates", request.match_info["id"]):
+            return _error(404, "Rate not found")
+        return web.json_response({"success": True, "ok": True})
+
+    # -- reports.ts -----------------------------------------------------------
+
+    async def report_credit_customers(self, request: web.Request) -> web.Response:
+        tenant = request["user"].get("tenantId")
+        customers = self.store.find("creditcustomers",
+                                    lambda c: c.get("tenantId") == tenant and c.get("isActive"))
+        return web.json_response({"ok": True, "rows": [{
+            "id": c["_id"],
+            "organization_name": c.get("organizationName"),
+            "phone_number": c.get("mobileNumber"),
+            "mobile_number": c.get("mobileNumber"),
+            "credit_limit": c.get("creditLimit"),
+            "current_balance": c.get("openingBalance"),
+        } for c in customers]})
+
+    async def report_vendor_transactions(self, request: web.Request) -> web.Response:
+        query = request.query
+        vendors = {str(v["_id"]): v for v in self.store.all("vendors")}
+        vendor_id = query.get("vendor_id") or query.get("party")
+        vendor_type = query.get("vendor_type") or query.get("type")
+
+        def keep(t: dict) -> bool:
+            day = str(t.get("transactionDate") or "")
+            vendor = vendors.get(str(t.get("vendorId")), {})
+            return ((not query.get("from") or day >= query["from"])
+                    and (not query.get("to") or day <= query["to"])
+                    and (not vendor_id or str(t.get("vendorId")) == vendor_id)
+                    and (not vendor_type or vendor_type == "All"
+                         or str(vendor.get("vendorType", "")).lower() == vendor_type.lower()))
+
+        rows = [{
+            "transaction_date": t.get("transactionDate"),
+            "vendor_name": vendors.get(str(t.get("vendorId")), {}).get("vendorName"),
+            "vendor_type": vendors.get(str(t.get("vendorId")), {}).get("vendorType"),
+            "transaction_type": t.get("transactionType"),
+            "amount": t.get("amount"),
+            "payment_mode": t.get("paymentMode"),
+            "description": t.get("description"),
+        } for t in self.store.find("vendortransactions", keep)]
+        return web.json_response({"ok": True, "rows": rows})
+
+    async def report_receivables_payables(self, request: web.Request) -> web.Response:
+        receivables = sum(_num(c.get("currentBalance")) for c in self.store.all("creditcustomers"))
+        payables = 0.0
+        for t in self.store.all("vendortransactions"):
+            if t.get("transactionType") == "Credit":
+                payables += _num(t.get("amount"))
+            elif t.get("transactionType") == "Debit":
+                payables -= _num(t.get("amount"))
+        return web.json_response({"ok": True, "rows": [
+            {"total_receivables": f"{receivables:.2f}", "total_payables": f"{payables:.2f}"}]})
+
+    async def report_empty(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "rows": []})
+
+
+def build_app(dump: Path = DUMP_FILE, database: str = DEFAULT_DATABASE, latency: float = 0.0,
+              jitter: float = 0.0, dist_dir: Optional[Path] = DIST_DIR) -> web.Application:
+    return MockApi(Store.from_dump(dump, database), latency=latency, jitter=jitter).app(dist_dir)
+
+
+@contextmanager
+def serving(port: int = DEFAULT_PORT, latency: float = 0.0, jitter: float = 0.0,
+            timeout: float = 30.0) -> Iterator[str]:
+    """Run the mock in a child process for the duration of the block; yields its URL."""
+    cmd = [sys.executable, "-m", "harness.mockapi", "--port", str(port),
+           "--latency", str(latency), "--jitter", str(jitter)]
+    proc = subprocess.Popen(cmd, cwd=TESTS_DIR, stdout=subprocess.DEVNULL)
+    base_url = f"http://localhost:{port}"
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"{base_url}/api/health", timeout=2):
+                    break
+            except (urllib.error.URLError, OSError):
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"mock API did not start on port {port}")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.mockapi", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--dump", type=Path, default=DUMP_FILE, help="fixture file (default: db_dump.json)")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="database inside the dump")
+    parser.add_argument("--latency", type=float, default=0.0, help="added delay per API call, ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- uniform jitter on the delay, ms")
+    args = parser.parse_args(argv)
+    web.run_app(build_app(args.dump, args.database, args.latency, args.jitter),
+                host=args.host, port=args.port, print=lambda msg: print(msg, flush=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+"""Third-party blocking and a shared on-disk asset cache for test contexts.
+
+Every test opens a fresh ``BrowserContext``, so every test downloads the whole
+Vite bundle again and asks Google Fonts for Roboto (``src/index.css``
+imports it; the CSP in ``server/index.ts`` allows it).  Offline, those font
+requests hang until they time out.  :class:`NetworkPlugin` routes each
+context's non-API traffic:
+
+* ``fonts.googleapis.com`` stylesheets are answered with an empty
+  stylesheet and ``fonts.gstatic.com`` files are aborted, so the page falls
+  back to system fonts immediately;
+* any other host that is not the app server is aborted;
+* same-origin static assets are served from ``artifacts/netcache/``.  Each
+  URL has a metadata file holding its current ``ETag``; bodies are stored
+  under a key of URL + ETag.  Content-hashed files (``/assets/index-3f9a1c.js``,
+  Vite's ``?v=`` dependency URLs) are immutable and served straight from
+  disk; anything else with an ETag is revalidated with ``If-None-Match`` and
+  served from disk on ``304``.
+
+The cache is shared by every context in a run and by every shard process.
+Per-test counts of blocked requests, bytes served from disk and the
+download time that saved (the original fetch time of each hit) are appended
+to ``artifacts/netcache/savings.jsonl``.  ``python -m harness --net-cache``
+enables the plugin and prints the totals.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Error, Route
+
+from .browser import SessionPlugin
+from .loader import DEFAULT_BASE_URL, TESTS_DIR, TestCase
+
+CACHE_DIR = TESTS_DIR / "artifacts" / "netcache"
+SAVINGS_LOG = CACHE_DIR / "savings.jsonl"
+
+FONT_CSS_HOSTS = frozenset({"fonts.googleapis.com"})
+FONT_FILE_HOSTS = frozenset({"fonts.gstatic.com"})
+
+# Vite build output (name-<hash>.ext) and optimized dependencies (?v=<hash>).
+_HASHED_RE = re.compile(r"/assets/[^/]+-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+_VERSIONED_RE = re.compile(r"[?&]v=[0-9a-f]{6,}")
+_KEEP_HEADERS = ("content-type", "etag", "cache-control", "last-modified")
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def is_immutable(url: str) -> bool:
+    return bool(_HASHED_RE.search(urlparse(url).path) or _VERSIONED_RE.search(url))
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    size: int
+    fetch_ms: float
+
+
+class AssetCache:
+    """URL -> (ETag, body) store that is safe to share between processes."""
+
+    def __init__(self, directory: Path = CACHE_DIR) -> None:
+        self.directory = directory
+        (directory / "meta").mkdir(parents=True, exist_ok=True)
+        (directory / "body").mkdir(parents=True, exist_ok=True)
+
+    def _meta_path(self, url: str) -> Path:
+        return self.directory / "meta" / f"{_key(url)}.json"
+
+    def _body_path(self, url: str, etag: Optional[str]) -> Path:
+        return self.directory / "body" / _key(url, etag or "")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        try:
+            entry = CacheEntry(**json.loads(self._meta_path(url).read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if self._body_path(url, entry.etag).exists() else None
+
+    def body(self, entry: CacheEntry) -> bytes:
+        return self._body_path(entry.url, entry.etag).read_bytes()
+
+    def store(self, entry: CacheEntry, body: bytes) -> None:
+        self._write(self._body_path(entry.url, entry.etag), body)
+        self._write(self._meta_path(entry.url), json.dumps(asdict(entry)).encode())
+
+
+@dataclass
+class NetworkStats:
+    blocked: int = 0
+    stubbed: int = 0
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+    bytes_fetched: int = 0
+    ms_saved: float = 0.0
+
+    def add(self, other: "NetworkStats") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+class NetworkPlugin(SessionPlugin):
+    """Runner plugin routing every test context through :class:`AssetCache`."""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, cache: Optional[AssetCache] = None,
+                 allow_hosts: Iterable[str] = (), log: Optional[Path] = SAVINGS_LOG) -> None:
+        self.origin_host = urlparse(base_url).hostname
+        self.allow_hosts = set(allow_hosts)
+        self.cache = cache or AssetCache()
+        self.log = log
+        self.totals = NetworkStats()
+        self.per_test: Dict[str, NetworkStats] = {}
+        self._by_context: Dict[int, NetworkStats] = {}
+
+    async def context_created(self, test: TestCase, context: Any) -> None:
+        stats = NetworkStats()
+        self._by_context[id(context)] = stats
+
+        async def handle(route: Route) -> None:
+            try:
+                await self._handle(route, stats)
+            except Error:
+                # The page navigated away or closed mid-request.
+                pass
+
+        await context.route(lambda url: not urlparse(url).path.startswith("/api/"), handle)
+
+    async def context_closing(self, test: TestCase, context: Any) -> None:
+        stats = self._by_context.pop(id(context), None)
+        if stats is None:
+            return
+        self.per_test.setdefault(test.name, NetworkStats()).add(stats)
+        self.totals.add(stats)
+        if self.log is not None:
+            with self.log.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps({"test": test.name, **asdict(stats)}) + "\n")
+
+    async def _handle(self, route: Route, stats: NetworkStats) -> None:
+        request = route.request
+        url = request.url
+        host = urlparse(url).hostname
+        if host in FONT_CSS_HOSTS:
+            stats.stubbed += 1
+            await route.fulfill(status=200, content_type="text/css", body="")
+            return
+        if host in FONT_FILE_HOSTS or (host != self.origin_host and host not in self.allow_hosts):
+            stats.blocked += 1
+            await route.abort("blockedbyclient")
+            return
+        if request.method != "GET" or request.resource_type == "document":
+            await route.fallback()
+            return
+
+        cached = self.cache.lookup(url)
+        if cached is not None and is_immutable(url):
+            await self._serve(route, cached, stats)
+            return
+
+        headers = dict(request.headers)
+        if cached is not None and cached.etag:
+            headers["if-none-match"] = cached.etag
+        started = time.perf_counter()
+        response = await route.fetch(headers=headers)
+        if response.status == 304 and cached is not None:
+            stats.revalidated += 1
+            await self._serve(route, cached, stats)
+            return
+        body = await response.body()
+        fetch_ms = (time.perf_counter() - started) * 1000
+        stats.misses += 1
+        stats.bytes_fetched += len(body)
+        etag = response.headers.get("etag")
+        if response.status == 200 and (etag or is_immutable(url)):
+            kept = {k: v for k, v in response.headers.items() if k.lower() in _KEEP_HEADERS}
+            self.cache.store(CacheEntry(url, etag, 200, kept, len(body), fetch_ms), body)
+        await route.fulfill(response=response, body=body)
+
+    async def _serve(self, route: Route, entry: CacheEntry, stats: NetworkStats) -> None:
+        stats.hits += 1
+        stats.bytes_saved += entry.size
+        stats.ms_saved += entry.fetch_ms
+        await route.fulfill(status=entry.status, headers=entry.headers, body=self.cache.body(entry))
+
+    def print_summary(self) -> None:
+        t = self.totals
+        print(f"network: {t.hits} cache hits ({t.revalidated} revalidated), {t.misses} fetched, "
+              f"{t.blocked} blocked, {t.stubbed} font stylesheets stubbed; "
+              f"{t.bytes_saved / 1024 / 1024:.1f} MiB and {t.ms_saved / 1000:.1f}s of downloads saved")
+
+
+def summarize(log: Path = SAVINGS_LOG) -> List[Dict[str, Any]]:
+    """Per-test totals from the savings log, most bytes saved first."""
+    per_test: Dict[str, NetworkStats] = {}
+    with log.open(encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                entry = json.loads(line)
+                name = entry.pop("test")
+                per_test.setdefault(name, NetworkStats()).add(NetworkStats(**entry))
+    rows = [{"test": name, **asdict(stats)} for name, stats in per_test.items()]
+    rows.sort(key=lambda r: r["bytes_saved"], reverse=True)
+    return rows
@@ -0,0 +1,179 @@
+"""Browser-side performance capture for the dashboard tests.
+
+:class:`PerfCapture` records, per page:
+
+* ``performance.getEntriesByType('navigation')`` and ``('resource')``;
+* ``longtask`` entries, buffered by an init script from the first byte;
+* ``performance.mark`` entries, including the ones :meth:`mark_visible`
+  adds when a selector (a KPI value, a Recharts surface) first shows up;
+* CDP ``Performance.getMetrics`` snapshots (``JSHeapUsedSize``,
+  ``LayoutDuration``, ``ScriptDuration`` ...) taken at named points.
+
+Everything is written to ``artifacts/perf/<test>.json`` so time-to-KPI-visible
+and the render costs of ``src/pages/Dashboard.tsx`` can be compared across
+runs.  Tests use it directly::
+
+    perf = await PerfCapture.install(context, "TC009")
+    page = await context.new_page()
+    ...
+    kpi_ms = await perf.mark_visible(page, "text=Fuel Sale:", "kpi-visible")
+    await perf.write()
+
+or the runner's ``--perf`` flag installs it on every context through
+:class:`PerfPlugin`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import BrowserContext, CDPSession, Error, Page
+
+from .browser import SessionContext, SessionPlugin
+from .loader import TESTS_DIR, TestCase
+
+PERF_DIR = TESTS_DIR / "artifacts" / "perf"
+
+CDP_METRICS = (
+    "JSHeapUsedSize",
+    "JSHeapTotalSize",
+    "LayoutDuration",
+    "RecalcStyleDuration",
+    "ScriptDuration",
+    "TaskDuration",
+    "Nodes",
+    "LayoutCount",
+)
+
+_OBSERVER_JS = """(() => {
+  if (window.__TS_LONG_TASKS__) return;
+  window.__TS_LONG_TASKS__ = [];
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) {
+        window.__TS_LONG_TASKS__.push({ name: e.name, startTime: e.startTime, duration: e.duration });
+      }
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) { /* longtask unsupported */ }
+})();"""
+
+_COLLECT_JS = """() => {
+  const pick = (e, keys) => Object.fromEntries(keys.map((k) => [k, e[k]]));
+  const nav = ['name', 'startTime', 'duration', 'domainLookupEnd', 'connectEnd', 'requestStart',
+               'responseStart', 'responseEnd', 'domInteractive', 'domContentLoadedEventEnd',
+               'loadEventEnd', 'transferSize', 'decodedBodySize'];
+  const res = ['name', 'initiatorType', 'startTime', 'duration', 'responseStart',
+               'transferSize', 'encodedBodySize', 'decodedBodySize'];
+  return {
+    url: location.href,
+    navigation: performance.getEntriesByType('navigation').map((e) => pick(e, nav)),
+    resources: performance.getEntriesByType('resource').map((e) => pick(e, res)),
+    marks: performance.getEntriesByType('mark').map((e) => ({ name: e.name, startTime: e.startTime })),
+    longTasks: window.__TS_LONG_TASKS__ || [],
+  };
+}"""
+
+
+class PerfCapture:
+    """Performance data for every page of one context."""
+
+    _by_context: Dict[int, "PerfCapture"] = {}
+
+    def __init__(self, name: str, out_dir: Path = PERF_DIR) -> None:
+        self.name = name
+        self.out_dir = out_dir
+        self._pages: List[Page] = []
+        self._cdp: Dict[int, CDPSession] = {}
+        self._metrics: Dict[int, List[Dict[str, Any]]] = {}
+        self._collected: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    async def install(cls, context: BrowserContext, name: str,
+                      out_dir: Path = PERF_DIR) -> "PerfCapture":
+        """Attach a capture to ``context``, or return the one already there.
+
+        Must run before the pages to be measured are created so the
+        long-task observer is in place from the first byte.
+        """
+        raw = context.context if isinstance(context, SessionContext) else context
+        existing = cls._by_context.get(id(raw))
+        if existing is not None:
+            return existing
+        capture = cls(name, out_dir)
+        cls._by_context[id(raw)] = capture
+        await raw.add_init_script(_OBSERVER_JS)
+        raw.on("page", capture._pages.append)
+        raw.on("close", lambda _: cls._by_context.pop(id(raw), None))
+        capture._pages.extend(raw.pages)
+        return capture
+
+    async def _session(self, page: Page) -> CDPSession:
+        session = self._cdp.get(id(page))
+        if session is None:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Performance.enable")
+            self._cdp[id(page)] = session
+        return session
+
+    async def snapshot(self, page: Page, label: str) -> Dict[str, float]:
+        """Record the CDP performance metrics for ``page`` under ``label``."""
+        session = await self._session(page)
+        result = await session.send("Performance.getMetrics")
+        metrics = {m["name"]: m["value"] for m in result["metrics"] if m["name"] in CDP_METRICS}
+        metrics["label"] = label
+        metrics["wallTime"] = time.time()
+        self._metrics.setdefault(id(page), []).append(metrics)
+        return metrics
+
+    async def mark_visible(self, page: Page, selector: str, name: str,
+                           timeout: float = 15000) -> float:
+        """Wait for ``selector`` to be visible, mark it, return ms since navigation."""
+        await page.locator(selector).first.wait_for(state="visible", timeout=timeout)
+        at = await page.evaluate("(n) => performance.mark(n).startTime", name)
+        await self.snapshot(page, name)
+        return at
+
+    async def collect(self) -> List[Dict[str, Any]]:
+        """Pull timing entries from every live page into the capture.
+
+        Closed pages keep whatever was collected from them last.
+        """
+        for page in self._pages:
+            if page.is_closed():
+                continue
+            try:
+                entry = await page.evaluate(_COLLECT_JS)
+                if id(page) not in self._metrics:
+                    await self.snapshot(page, "final")
+            except Error:
+                continue
+            entry["cdp"] = self._metrics.get(id(page), [])
+            self._collected[id(page)] = entry
+        return list(self._collected.values())
+
+    async def write(self) -> Path:
+        """Collect and write ``<out_dir>/<name>.json``; returns the path."""
+        pages = await self.collect()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"{self.name}.json"
+        path.write_text(json.dumps({"test": self.name, "pages": pages}, indent=2))
+        return path
+
+
+class PerfPlugin(SessionPlugin):
+    """Runner plugin installing :class:`PerfCapture` on every test context."""
+
+    def __init__(self, out_dir: Path = PERF_DIR) -> None:
+        self.out_dir = out_dir
+        self._captures: Dict[int, PerfCapture] = {}
+
+    async def context_created(self, test: TestCase, context: BrowserContext) -> None:
+        self._captures[id(context)] = await PerfCapture.install(context, test.name, self.out_dir)
+
+    async def context_closing(self, test: TestCase, context: BrowserContext) -> None:
+        capture: Optional[PerfCapture] = self._captures.pop(id(context), None)
+        if capture is not None:
+            await capture.write()
@@ -0,0 +1,371 @@
+"""Per-step CPU profiles and timeline traces of the frontend, over CDP.
+
+When a flow is slow, the suite report cannot say whether the time went to
+the network or to rendering: ``src/App.tsx`` imports all ~90 pages
+statically and ``Dashboard.tsx`` renders several Recharts charts on every
+refetch.  :class:`ProfilePlugin` slices each test into steps and records
+every step with the ``Profiler`` and ``Tracing`` CDP domains of its page.
+
+A step starts when the page opens (``00-load``) and at every
+:func:`harness.waits.actionable` call, which the generated tests make
+before each ``fill``/``click``.  So step *n* covers waiting for element *n*
+to become actionable, including the network and rendering triggered by the
+previous action.  For each step, ``artifacts/profiles/<test>/`` gets:
+
+* ``NN-<selector>.cpuprofile``, which opens in the DevTools Performance
+  panel or speedscope;
+* ``NN-<selector>.trace.json``, a ``devtools.timeline`` trace for the
+  Performance panel;
+* an entry in ``summary.json`` with the step's wall time, main-thread
+  time split into scripting / rendering / painting / GC / loading (the
+  remainder is idle, usually waiting on the network), the top self-time
+  JS functions, and the top components.  Components are PascalCase
+  functions from ``/src/`` and only have names in dev builds (``npm run
+  dev``).
+
+Chromium allows one trace per browser at a time.  With several contexts
+running, a step whose trace cannot start still gets its CPU profile.  Use
+``--max-contexts 1`` for complete traces::
+
+    python -m harness --profile -k TC004 --max-contexts 1
+    python -m harness.profiler artifacts/profiles/TC004_.../03-xpath-....cpuprofile
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from playwright.async_api import BrowserContext, CDPSession, Error, Locator, Page
+
+from . import waits
+from .browser import SessionPlugin
+from .loader import TESTS_DIR, TestCase
+
+PROFILE_DIR = TESTS_DIR / "artifacts" / "profiles"
+SAMPLING_INTERVAL_US = 200
+TOP_N = 10
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+]
+
+# Trace event name -> main-thread category (self time, as in the DevTools summary).
+_CATEGORIES = {
+    "scripting": ("FunctionCall", "EvaluateScript", "v8.compile", "v8.compileModule", "v8.evaluateModule",
+                  "V8.Execute", "TimerFire", "EventDispatch", "FireAnimationFrame", "RunMicrotasks",
+                  "FireIdleCallback", "v8.produceCache", "CompileScript", "CompileCode"),
+    "rendering": ("Layout", "UpdateLayoutTree", "RecalculateStyles", "HitTest", "PrePaint", "Layerize",
+                  "UpdateLayerTree", "ScheduleStyleRecalculation"),
+    "painting": ("Paint", "PaintImage", "CompositeLayers", "Rasterize", "Decode Image", "ImageDecodeTask"),
+    "gc": ("MinorGC", "MajorGC", "V8.GCScavenger", "V8.GCFinalizeMC", "V8.GCIncrementalMarking",
+           "BlinkGC.AtomicPhase", "ThreadState::performIdleLazySweep", "GCEvent"),
+    "loading": ("ParseHTML", "ParseAuthorStyleSheet", "ResourceReceivedData", "ResourceFinish"),
+}
+_CATEGORY_OF = {name: category for category, names in _CATEGORIES.items() for name in names}
+_COMPONENT_RE = re.compile(r"^[A-Z][A-Za-z0-9]*$")
+_SELECTOR_RE = re.compile(r"selector='(.*)'>?$")
+# Only one page can own the browser-wide trace at a time.
+_trace_owner: Optional[int] = None
+
+
+# -- summaries -------------------------------------------------------------
+
+def _location(frame: Dict[str, Any]) -> str:
+    url = frame.get("url") or ""
+    path = url.split("?", 1)[0]
+    short = path[path.find("/src/") + 1:] if "/src/" in path else path.rsplit("/", 1)[-1]
+    return f"{short}:{frame.get('lineNumber', -1) + 1}" if short else "(native)"
+
+
+def summarize_profile(profile: Dict[str, Any], top: int = TOP_N) -> Dict[str, Any]:
+    """Top self-time functions and components of a ``.cpuprofile``, in ms."""
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    self_us: Dict[int, float] = defaultdict(float)
+    samples, deltas = profile.get("samples", []), profile.get("timeDeltas", [])
+    # timeDeltas[i + 1] is the time from sample i to the next one.
+    for i, node_id in enumerate(samples):
+        self_us[node_id] += deltas[i + 1] if i + 1 < len(deltas) else 0.0
+
+    functions: Dict[Tuple[str, str], float] = defaultdict(float)
+    components: Dict[str, float] = defaultdict(float)
+    idle = 0.0
+    for node_id, micros in self_us.items():
+        frame = nodes[node_id]["callFrame"]
+        name = frame.get("functionName") or "(anonymous)"
+        if name in ("(idle)", "(program)"):
+            idle += micros
+            continue
+        functions[(name, _location(frame))] += micros
+        if _COMPONENT_RE.match(name) and "/src/" in (frame.get("url") or ""):
+            components[name] += micros
+
+    def ranked(items: Dict[Any, float]) -> List[Tuple[Any, float]]:
+        return sorted(items.items(), key=lambda kv: -kv[1])[:top]
+
+    total = sum(self_us.values())
+    return {
+        "sampled_ms": total / 1000,
+        "busy_ms": (total - idle) / 1000,
+        "top_functions": [{"function": name, "location": where, "self_ms": us / 1000}
+                          for (name, where), us in ranked(functions)],
+        "top_components": [{"component": name, "self_ms": us / 1000} for name, us in ranked(components)],
+    }
+
+
+def summarize_trace(events: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Main-thread self time per category of a trace, in ms."""
+    main = next(((e["pid"], e["tid"]) for e in events
+                 if e.get("ph") == "M" and e.get("name") == "thread_name"
+                 and e.get("args", {}).get("name") == "CrRendererMain"), None)
+    if main is None:
+        return {}
+    spans = sorted(((e["ts"], e["ts"] + e.get("dur", 0), e["name"]) for e in events
+                    if e.get("ph") == "X" and (e.get("pid"), e.get("tid")) == main),
+                   key=lambda s: (s[0], -s[1]))
+    totals: Dict[str, float] = defaultdict(float)
+    stack: List[list] = []  # [end, name, self_us]
+
+    def close(entry: list) -> None:
+        totals[_CATEGORY_OF.get(entry[1], "other")] += entry[2]
+
+    for start, end, name in spans:
+        while stack and stack[-1][0] <= start:
+            close(stack.pop())
+        if stack:
+            stack[-1][2] -= min(end, stack[-1][0]) - start  # the child's time is not the parent's
+        stack.append([end, name, end - start])
+    while stack:
+        close(stack.pop())
+    return {f"{category}_ms": max(us, 0.0) / 1000 for category, us in sorted(totals.items())}
+
+
+# -- capture ---------------------------------------------------------------
+
+@dataclass
+class StepProfile:
+    index: int
+    label: str
+    wall_ms: float = 0.0
+    cpu: Dict[str, Any] = field(default_factory=dict)
+    main_thread: Dict[str, float] = field(default_factory=dict)
+    files: List[str] = field(default_factory=list)
+    trace_skipped: Optional[str] = None
+
+
+def _slug(locator: Optional[Locator]) -> str:
+    if locator is None:
+        return "load"
+    match = _SELECTOR_RE.search(str(locator))
+    selector = match.group(1) if match else str(locator)
+    return re.sub(r"[^A-Za-z0-9]+", "-", selector[-40:]).strip("-") or "step"
+
+
+class PageProfiler:
+    """Profiles one page, one step at a time."""
+
+    def __init__(self, page: Page, out_dir: Path, trace: bool = True) -> None:
+        self.page = page
+        self.out_dir = out_dir
+        self.trace = trace
+        self.steps: List[StepProfile] = []
+        self._session: Optional[CDPSession] = None
+        self._current: Optional[StepProfile] = None
+        self._started = 0.0
+        self._tracing = False
+        self._trace_done: Optional[asyncio.Future] = None
+
+    async def _cdp(self) -> CDPSession:
+        if self._session is None:
+            self._session = await self.page.context.new_cdp_session(self.page)
+            await self._session.send("Profiler.enable")
+            await self._session.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+            self._session.on("Tracing.tracingComplete", self._on_trace_complete)
+        return self._session
+
+    def _on_trace_complete(self, params: Dict[str, Any]) -> None:
+        if self._trace_done is not None and not self._trace_done.done():
+            self._trace_done.set_result(params.get("stream"))
+
+    async def begin(self, label: str) -> None:
+        global _trace_owner
+        session = await self._cdp()
+        step = StepProfile(len(self.steps), label)
+        await session.send("Profiler.start")
+        if self.trace:
+            if _trace_owner not in (None, id(self)):
+                step.trace_skipped = "another page is tracing"
+            else:
+                try:
+                    await session.send("Tracing.start", {
+                        "transferMode": "ReturnAsStream",
+                        "traceConfig": {"includedCategories": TRACE_CATEGORIES},
+                    })
+                    _trace_owner, self._tracing = id(self), True
+                except Error as exc:
+                    step.trace_skipped = str(exc).splitlines()[0]
+        self._current, self._started = step, time.perf_counter()
+
+    async def _read_stream(self, handle: str) -> str:
+        chunks = []
+        while True:
+            chunk = await self._session.send("IO.read", {"handle": handle})
+            chunks.append(chunk.get("data", ""))
+            if chunk.get("eof"):
+                break
+        await self._session.send("IO.close", {"handle": handle})
+        return "".join(chunks)
+
+    async def end(self) -> Optional[StepProfile]:
+        global _trace_owner
+        step, self._current = self._current, None
+        if step is None or self._session is None:
+            return None
+        step.wall_ms = (time.perf_counter() - self._started) * 1000
+        base = self.out_dir / f"{step.index:02d}-{step.label}"
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            profile = (await self._session.send("Profiler.stop"))["profile"]
+            path = base.with_suffix(".cpuprofile")
+            path.write_text(json.dumps(profile))
+            step.files.append(path.name)
+            step.cpu = summarize_profile(profile)
+            if self._tracing:
+                self._trace_done = asyncio.get_running_loop().create_future()
+                await self._session.send("Tracing.end")
+                handle = await asyncio.wait_for(self._trace_done, timeout=30)
+                raw = await self._read_stream(handle)
+                path = base.with_suffix(".trace.json")
+                path.write_text(raw)
+                step.files.append(path.name)
+                data = json.loads(raw)
+                step.main_thread = summarize_trace(data.get("traceEvents", data) if isinstance(data, dict)
+                                                   else data)
+        except (Error, asyncio.TimeoutError) as exc:
+            # The page closed under us: keep what was written.
+            step.trace_skipped = step.trace_skipped or str(exc).splitlines()[0]
+        finally:
+            if self._tracing:
+                self._tracing = False
+                _trace_owner = None
+        self.steps.append(step)
+        return step
+
+    async def step(self, label: str) -> None:
+        await self.end()
+        await self.begin(label)
+
+
+class ProfilePlugin(SessionPlugin):
+    """Runner plugin profiling every page of every test context, per step."""
+
+    def __init__(self, out_dir: Path = PROFILE_DIR, trace: bool = True) -> None:
+        self.out_dir = out_dir
+        self.trace = trace
+        self.per_test: Dict[str, List[StepProfile]] = {}
+        self._pages: Dict[int, Dict[int, PageProfiler]] = {}  # context -> page -> profiler
+        self._tests: Dict[int, TestCase] = {}
+        waits.add_step_listener(self._on_step)
+
+    def _profiler(self, context_id: int, page: Page) -> Optional[PageProfiler]:
+        pages = self._pages.get(context_id)
+        if pages is None:
+            return None
+        profiler = pages.get(id(page))
+        if profiler is None:
+            test = self._tests[context_id]
+            suffix = f"-page{len(pages)}" if pages else ""
+            profiler = PageProfiler(page, self.out_dir / f"{test.name}{suffix}", self.trace)
+            pages[id(page)] = profiler
+        return profiler
+
+    async def context_created(self, test: TestCase, context: BrowserContext) -> None:
+        self._pages[id(context)] = {}
+        self._tests[id(context)] = test
+
+        async def on_page(page: Page) -> None:
+            profiler = self._profiler(id(context), page)
+            if profiler is not None and profiler._current is None and not profiler.steps:
+                try:
+                    await profiler.begin(_slug(None))
+                except Error:
+                    pass
+
+        context.on("page", on_page)
+
+    async def _on_step(self, locator: Locator) -> None:
+        page = locator.page
+        profiler = self._profiler(id(page.context), page)
+        if profiler is None:
+            return
+        try:
+            await profiler.step(_slug(locator))
+        except Error:
+            pass
+
+    async def context_closing(self, test: TestCase, context: BrowserContext) -> None:
+        pages = self._pages.pop(id(context), {})
+        self._tests.pop(id(context), None)
+        steps: List[StepProfile] = []
+        for profiler in pages.values():
+            await profiler.end()
+            steps.extend(profiler.steps)
+            self._write(profiler)
+        self.per_test.setdefault(test.name, []).extend(steps)
+
+    def _write(self, profiler: PageProfiler) -> None:
+        if not profiler.steps:
+            return
+        profiler.out_dir.mkdir(parents=True, exist_ok=True)
+        (profiler.out_dir / "summary.json").write_text(
+            json.dumps([asdict(s) for s in profiler.steps], indent=2))
+
+    def close(self) -> None:
+        waits.remove_step_listener(self._on_step)
+
+    def print_summary(self, limit: int = 10) -> None:
+        """The slowest steps of the run and where their main-thread time went."""
+        rows = [(test, s) for test, steps in self.per_test.items() for s in steps]
+        rows.sort(key=lambda r: -r[1].wall_ms)
+        print(f"\nslowest profiled steps (artifacts in {self.out_dir}):")
+        for test, s in rows[:limit]:
+            cats = s.main_thread
+            busy = sum(cats.values())
+            split = ", ".join(f"{k[:-3]} {v:.0f}" for k, v in sorted(cats.items(), key=lambda kv: -kv[1])[:3])
+            hot = s.cpu.get("top_functions", [])[:1]
+            hottest = f"; hottest {hot[0]['function']} ({hot[0]['location']}) {hot[0]['self_ms']:.0f} ms" \
+                if hot else ""
+            print(f"  {test[:40]:<41}{s.index:02d} {s.label[:30]:<31}{s.wall_ms:>7.0f} ms wall, "
+                  f"{busy:.0f} ms main thread ({split or 'no trace'}){hottest}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.profiler",
+                                     description="Summarize saved .cpuprofile / .trace.json files.")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--top", type=int, default=TOP_N)
+    args = parser.parse_args(argv)
+    for path in args.files:
+        data = json.loads(path.read_text())
+        if path.name.endswith(".cpuprofile"):
+            summary: Any = summarize_profile(data, args.top)
+        else:
+            summary = summarize_trace(data.get("traceEvents", data) if isinstance(data, dict) else data)
+        print(f"{path}:\n{json.dumps(summary, indent=2)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
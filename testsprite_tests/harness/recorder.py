@@ -0,0 +1,151 @@
+"""Per-request API timing recorded from the browser during a suite run.
+
+:class:`RequestRecorder` listens to ``requestfinished``/``requestfailed``
+on every test context and appends one JSON line per ``/api/*`` call::
+
+    {"test": "TC004_...", "method": "POST", "url": "/api/guest-sales/:id",
+     "status": 200, "request_bytes": 412, "response_bytes": 1873,
+     "ttfb_ms": 38.2, "duration_ms": 41.0}
+
+``url`` is a route template: UUIDs, Mongo ObjectIds and numeric ids are
+replaced with ``:id`` so calls aggregate per server route.  Timings come
+from Playwright's ``Request.timing`` (``responseStart`` - ``requestStart``
+for TTFB, ``responseEnd`` for the total).
+
+``python -m harness.recorder [FILE]`` ranks endpoints by cumulative time,
+which shows which server routes dominate UI latency across the suite.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+from urllib.parse import urlparse
+
+from .browser import SessionPlugin
+from .loader import TESTS_DIR, TestCase
+from .stats import percentile
+
+DEFAULT_LOG = TESTS_DIR / "artifacts" / "requests.jsonl"
+
+_ID_SEGMENT_RE = re.compile(
+    r"^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{24}|\d+)$",
+    re.IGNORECASE,
+)
+
+
+def url_template(url: str) -> str:
+    """``/api/credit-customers/6f1c...`` -> ``/api/credit-customers/:id``."""
+    path = urlparse(url).path
+    return "/".join(":id" if _ID_SEGMENT_RE.match(seg) else seg for seg in path.split("/"))
+
+
+def is_api_call(url: str) -> bool:
+    return urlparse(url).path.startswith("/api/")
+
+
+class RequestRecorder(SessionPlugin):
+    """Runner plugin appending one JSON line per API request."""
+
+    def __init__(self, path: Path = DEFAULT_LOG, truncate: bool = True) -> None:
+        self.path = path
+        self._pending: Dict[int, Set[asyncio.Task]] = defaultdict(set)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if truncate:
+            path.write_text("")
+
+    async def context_created(self, test: TestCase, context: Any) -> None:
+        key = id(context)
+
+        def _on_done(request: Any, failed: bool = False) -> None:
+            if not is_api_call(request.url):
+                return
+            task = asyncio.ensure_future(self._record(test.name, request, failed))
+            self._pending[key].add(task)
+            task.add_done_callback(self._pending[key].discard)
+
+        context.on("requestfinished", _on_done)
+        context.on("requestfailed", lambda request: _on_done(request, failed=True))
+
+    async def context_closing(self, test: TestCase, context: Any) -> None:
+        pending = self._pending.pop(id(context), set())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _record(self, test_name: str, request: Any, failed: bool) -> None:
+        timing = request.timing
+        status: Optional[int] = None
+        sizes: Dict[str, int] = {}
+        if not failed:
+            response = await request.response()
+            status = response.status if response else None
+            sizes = await request.sizes()
+        ttfb = timing["responseStart"] - timing["requestStart"] if timing["responseStart"] >= 0 else None
+        entry = {
+            "test": test_name,
+            "method": request.method,
+            "url": url_template(request.url),
+            "status": status,
+            "request_bytes": sizes.get("requestBodySize", 0) + sizes.get("requestHeadersSize", 0),
+            "response_bytes": sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0),
+            "ttfb_ms": ttfb,
+            "duration_ms": timing["responseEnd"] if timing["responseEnd"] >= 0 else None,
+            "failure": request.failure if failed else None,
+        }
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+
+
+def summarize(path: Path = DEFAULT_LOG) -> List[Dict[str, Any]]:
+    """Aggregate the log per ``METHOD /template``, slowest cumulative first."""
+    groups: Dict[str, List[dict]] = defaultdict(list)
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                entry = json.loads(line)
+                groups[f"{entry['method']} {entry['url']}"].append(entry)
+
+    rows = []
+    for route, entries in groups.items():
+        durations = sorted(e["duration_ms"] for e in entries if e.get("duration_ms") is not None)
+        ttfbs = sorted(e["ttfb_ms"] for e in entries if e.get("ttfb_ms") is not None)
+        rows.append({
+            "route": route,
+            "count": len(entries),
+            "total_ms": sum(durations),
+            "mean_ms": sum(durations) / len(durations) if durations else 0.0,
+            "p95_ms": percentile(durations, 95) if durations else 0.0,
+            "ttfb_p50_ms": percentile(ttfbs, 50) if ttfbs else 0.0,
+            "response_bytes": sum(e.get("response_bytes") or 0 for e in entries),
+            "errors": sum(1 for e in entries if e.get("status") is None or e["status"] >= 400),
+            "tests": len({e["test"] for e in entries}),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.recorder",
+                                     description="Rank API routes by cumulative time.")
+    parser.add_argument("log", nargs="?", type=Path, default=DEFAULT_LOG)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    rows = summarize(args.log)
+    grand = sum(r["total_ms"] for r in rows) or 1.0
+    print(f"{'route':<52}{'n':>6}{'total s':>9}{'share':>7}{'mean ms':>9}"
+          f"{'p95 ms':>9}{'ttfb ms':>9}{'KiB':>8}{'err':>5}")
+    for r in rows[:args.top]:
+        print(f"{r['route'][:51]:<52}{r['count']:>6}{r['total_ms'] / 1000:>9.2f}"
+              f"{r['total_ms'] / grand:>7.1%}{r['mean_ms']:>9.0f}{r['p95_ms']:>9.0f}"
+              f"{r['ttfb_p50_ms']:>9.0f}{r['response_bytes'] / 1024:>8.0f}{r['errors']:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,378 @@
+"""Re-drive recorded production traffic against a local server at N x speed.
+
+Two input formats are understood, line by line:
+
+* ``server_requests.log`` as written by ``auditReqToFile`` in
+  ``server/index.ts``: ``<ISO time> <METHOD> <path> headers=<JSON>`` - no
+  query string, body, status or timing;
+* the JSON-lines capture ``server/index.ts`` writes when started with
+  ``REQUEST_CAPTURE_FILE=capture.jsonl``: full URL, status, duration, the
+  session's decoded claims (never the token itself) and the body of writes
+  (except ``/api/auth``, password-like fields redacted).
+
+Requests are grouped into per-user streams by the ``userId`` claim of the
+``token`` cookie or the capture's claims (falling back to the user agent),
+and every stream is
+replayed open-loop: request *i* is sent at ``(t_i - t_0) / speed`` after the
+start, whether or not earlier responses have arrived, as browsers do.  All
+streams share one ``httpx.AsyncClient`` on one event loop, so thousands of
+sessions fit in one process; ``lag`` in the report shows when the replayer
+itself fell behind schedule.
+
+Authentication per stream (``--auth``):
+
+* ``resign`` (default when ``JWT_SECRET`` is readable locally) - the
+  recorded claims re-signed with the local secret and a fresh ``exp``;
+* ``token`` - the recorded cookie as-is (same secret, unexpired tokens;
+  plain log only, captures hold no tokens);
+* ``login`` - every stream uses one ``--username`` login (default when
+  the secret is unknown and the events carry no tokens).
+
+Only ``GET`` requests under ``/api/`` are replayed unless
+``--include-writes`` is given, and writes are replayed only from the
+capture format, which has their bodies.  The report compares p50/p95 and
+error rate per route with the original (from the capture) or with a
+reference replay at 1x (``--reference``, for the plain log)::
+
+    python -m harness.replay server_requests.log --from 06:00 --to 07:00 --speed 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import httpx
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME, decode_jwt, encode_jwt, server_jwt_secret
+from .load import LOGIN_PATH, EndpointStats
+from .loader import DEFAULT_BASE_URL, TESTS_DIR
+from .recorder import url_template
+
+DEFAULT_LOG = TESTS_DIR.parent / "server_requests.log"
+REPORT_FILE = TESTS_DIR / "artifacts" / "replay.json"
+TOKEN_TTL = 7 * 24 * 60 * 60
+
+
+@dataclass
+class Event:
+    at: float  # epoch seconds
+    method: str
+    url: str
+    token: Optional[str] = None
+    agent: Optional[str] = None
+    body: Any = None
+    status: Optional[int] = None  # original, capture format only
+    duration_ms: Optional[float] = None
+    claims: Optional[Dict[str, Any]] = None  # session claims, capture format only
+
+    @property
+    def route(self) -> str:
+        return f"{self.method} {url_template(self.url)}"
+
+
+def _cookie_token(cookie: Optional[str]) -> Optional[str]:
+    for part in (cookie or "").split(";"):
+        name, _, value = part.strip().partition("=")
+        if name == "token" and value:
+            return value
+    return None
+
+
+def _epoch(iso: str) -> float:
+    return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp()
+
+
+def parse_line(line: str) -> Optional[Event]:
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        entry = json.loads(line)
+        return Event(_epoch(entry["ts"]), entry["method"], entry["url"], _cookie_token(entry.get("cookie")),
+                     entry.get("ua"), entry.get("body"), entry.get("status"), entry.get("durationMs"),
+                     entry.get("user"))
+    stamp, method, rest = line.split(" ", 2)
+    path, _, headers = rest.partition(" headers=")
+    try:
+        header_map = json.loads(headers) if headers else {}
+    except ValueError:
+        header_map = {}
+    return Event(_epoch(stamp), method, path, _cookie_token(header_map.get("cookie")),
+                 header_map.get("user-agent"))
+
+
+def read_events(path: Path) -> Iterator[Event]:
+    with path.open(encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            try:
+                event = parse_line(line)
+            except (ValueError, KeyError):
+                continue
+            if event is not None:
+                yield event
+
+
+def user_key(event: Event) -> str:
+    if event.claims:
+        return str(event.claims.get("userId") or event.claims.get("email"))
+    if event.token:
+        try:
+            claims = decode_jwt(event.token)
+            return str(claims.get("userId") or claims.get("sub") or claims.get("email"))
+        except (ValueError, IndexError):
+            pass
+    return f"ua:{event.agent or 'unknown'}"
+
+
+def _clock(value: Optional[str], day: dt.date) -> Optional[float]:
+    """``"06:30"`` on ``day`` (UTC) or a full ISO timestamp -> epoch seconds."""
+    if not value:
+        return None
+    if "T" in value:
+        return _epoch(value)
+    return dt.datetime.combine(day, dt.time.fromisoformat(value), dt.timezone.utc).timestamp()
+
+
+def build_streams(events: Iterable[Event], start: Optional[str] = None, end: Optional[str] = None,
+                  include_writes: bool = False, all_paths: bool = False,
+                  max_users: Optional[int] = None) -> Dict[str, List[Event]]:
+    """Filter events and group them into per-user, time-ordered streams."""
+    kept = [e for e in events
+            if (all_paths or e.url.startswith("/api/"))
+            and not e.url.startswith("/api/auth/login")
+            and (e.method == "GET" or (include_writes and e.body is not None))]
+    if not kept:
+        return {}
+    kept.sort(key=lambda e: e.at)
+    day = dt.datetime.fromtimestamp(kept[0].at, dt.timezone.utc).date()
+    lo, hi = _clock(start, day), _clock(end, day)
+    streams: Dict[str, List[Event]] = defaultdict(list)
+    for event in kept:
+        if (lo is None or event.at >= lo) and (hi is None or event.at < hi):
+            streams[user_key(event)].append(event)
+    if max_users is not None:
+        busiest = sorted(streams, key=lambda k: len(streams[k]), reverse=True)[:max_users]
+        return {k: streams[k] for k in busiest}
+    return dict(streams)
+
+
+@dataclass
+class ReplayResult:
+    speed: float
+    sessions: int = 0
+    elapsed: float = 0.0
+    routes: Dict[str, EndpointStats] = field(default_factory=dict)
+    lag: List[float] = field(default_factory=list)
+    per_second: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def requests(self) -> int:
+        return sum(s.count for s in self.routes.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(s.errors for s in self.routes.values())
+
+    def to_dict(self) -> dict:
+        lag = sorted(self.lag)
+        return {
+            "speed": self.speed,
+            "sessions": self.sessions,
+            "elapsed": self.elapsed,
+            "requests": self.requests,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "peak_rps": max(self.per_second.values(), default=0),
+            "lag_p99": EndpointStats(lag).p99 if lag else 0.0,
+            "routes": {k: v.to_dict() for k, v in sorted(self.routes.items())},
+        }
+
+
+def original_stats(streams: Dict[str, List[Event]]) -> Optional[Dict[str, EndpointStats]]:
+    """Per-route stats as recorded in a capture file; None for the plain log."""
+    routes: Dict[str, EndpointStats] = {}
+    for stream in streams.values():
+        for event in stream:
+            if event.status is None or event.duration_ms is None:
+                return None
+            routes.setdefault(event.route, EndpointStats()).record(event.duration_ms / 1000, event.status)
+    return routes
+
+
+class Authenticator:
+    def __init__(self, mode: str, client: httpx.AsyncClient, username: str, password: str) -> None:
+        self.mode = mode
+        self.client = client
+        self.username = username
+        self.password = password
+        self.secret = server_jwt_secret() if mode == "resign" else None
+        if mode == "resign" and not self.secret:
+            raise RuntimeError("--auth resign needs JWT_SECRET (env, .env or .local.env)")
+        self._login_cookie: Optional[str] = None
+        self._resigned: Dict[str, str] = {}
+
+    async def prepare(self) -> None:
+        if self.mode == "login":
+            response = await self.client.post(LOGIN_PATH, json={"email": self.username, "password": self.password})
+            response.raise_for_status()
+            self._login_cookie = response.cookies.get("token")
+
+    def cookie(self, event: Event) -> Optional[str]:
+        if self.mode == "login":
+            token = self._login_cookie
+        elif self.mode == "resign" and (event.token or event.claims):
+            key = event.token or json.dumps(event.claims, sort_keys=True)
+            token = self._resigned.get(key)
+            if token is None:
+                claims = dict(event.claims) if event.claims else decode_jwt(event.token)
+                now = int(time.time())
+                claims.update(iat=now, exp=now + TOKEN_TTL)
+                token = self._resigned[key] = encode_jwt(claims, self.secret)
+        else:
+            token = event.token
+        return f"token={token}" if token else None
+
+
+async def _send(client: httpx.AsyncClient, auth: Authenticator, event: Event,
+                result: ReplayResult, started: float) -> None:
+    headers = {}
+    cookie = auth.cookie(event)
+    if cookie:
+        headers["Cookie"] = cookie
+    if event.agent:
+        headers["User-Agent"] = event.agent
+    stats = result.routes.setdefault(event.route, EndpointStats())
+    sent = time.perf_counter()
+    result.per_second[int(sent - started)] += 1
+    try:
+        response = await client.request(event.method, event.url, headers=headers,
+                                        json=event.body if event.method != "GET" else None)
+        await response.aread()
+    except httpx.HTTPError:
+        stats.record(time.perf_counter() - sent, None)
+        return
+    stats.record(time.perf_counter() - sent, response.status_code)
+
+
+async def _session(client: httpx.AsyncClient, auth: Authenticator, stream: List[Event], t0: float,
+                   speed: float, result: ReplayResult, started: float) -> None:
+    inflight = []
+    for event in stream:
+        due = started + (event.at - t0) / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result.lag.append(max(0.0, time.perf_counter() - due))
+        inflight.append(asyncio.create_task(_send(client, auth, event, result, started)))
+    await asyncio.gather(*inflight)
+
+
+async def replay(streams: Dict[str, List[Event]], base_url: str = DEFAULT_BASE_URL, speed: float = 1.0,
+                 auth_mode: Optional[str] = None, username: str = DEFAULT_USERNAME,
+                 password: str = DEFAULT_PASSWORD, max_connections: int = 1000,
+                 timeout: float = 35.0) -> ReplayResult:
+    """Replay every stream concurrently; ``speed`` 4 compresses an hour into 15 min."""
+    result = ReplayResult(speed, sessions=len(streams))
+    if not streams:
+        return result
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        if auth_mode is None:
+            has_tokens = any(event.token for stream in streams.values() for event in stream)
+            auth_mode = "resign" if server_jwt_secret() else "token" if has_tokens else "login"
+        auth = Authenticator(auth_mode, client, username, password)
+        await auth.prepare()
+        t0 = min(stream[0].at for stream in streams.values())
+        started = time.perf_counter()
+        await asyncio.gather(*(_session(client, auth, stream, t0, speed, result, started)
+                               for stream in streams.values()))
+        result.elapsed = time.perf_counter() - started
+    for stats in result.routes.values():
+        stats.window = result.elapsed
+    return result
+
+
+def print_comparison(result: ReplayResult, reference: Optional[Dict[str, EndpointStats]],
+                     label: str, top: int = 30) -> None:
+    print(f"{'route':<50}{'n':>7}{label + ' p95':>12}{'p95 ms':>9}{'change':>8}"
+          f"{label + ' err':>11}{'err %':>7}")
+    rows = sorted(result.routes.items(), key=lambda kv: kv[1].count, reverse=True)[:top]
+    for route, s in rows:
+        ref = (reference or {}).get(route)
+        ref_p95 = f"{ref.p95 * 1000:.0f}" if ref else "-"
+        change = f"{s.p95 / ref.p95 - 1:+.0%}" if ref and ref.p95 else "-"
+        ref_err = f"{ref.error_rate * 100:.1f}" if ref else "-"
+        print(f"{route[:49]:<50}{s.count:>7}{ref_p95:>12}{s.p95 * 1000:>9.0f}{change:>8}"
+              f"{ref_err:>11}{s.error_rate * 100:>7.1f}")
+    summary = result.to_dict()
+    print(f"{summary['requests']} requests from {result.sessions} sessions in {result.elapsed:.1f}s "
+          f"at {result.speed:g}x; peak {summary['peak_rps']} req/s, error rate "
+          f"{summary['error_rate'] * 100:.1f}%, replay lag p99 {summary['lag_p99'] * 1000:.0f} ms")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.replay", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", nargs="?", type=Path, default=DEFAULT_LOG,
+                        help="server_requests.log or a REQUEST_CAPTURE_FILE capture")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression factor (default: 1)")
+    parser.add_argument("--from", dest="start", metavar="HH:MM[:SS]|ISO",
+                        help="window start (UTC, on the log's first day)")
+    parser.add_argument("--to", dest="end", metavar="HH:MM[:SS]|ISO", help="window end (UTC)")
+    parser.add_argument("--max-users", type=int, help="replay only the N busiest sessions")
+    parser.add_argument("--auth", choices=("resign", "token", "login"),
+                        help="how streams authenticate (default: resign if JWT_SECRET is known, "
+                             "else token for plain logs and login for captures)")
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--include-writes", action="store_true",
+                        help="also replay POST/PUT/DELETE that have a captured body")
+    parser.add_argument("--all-paths", action="store_true", help="replay non-/api requests too")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--reference", action="store_true",
+                        help="replay once at 1x first and compare against that (for logs without timings)")
+    args = parser.parse_args(argv)
+
+    streams = build_streams(read_events(args.log), args.start, args.end, args.include_writes,
+                            args.all_paths, args.max_users)
+    if not streams:
+        print("no requests to replay in that window", file=sys.stderr)
+        return 2
+
+    def run(speed: float) -> ReplayResult:
+        return asyncio.run(replay(streams, args.base_url, speed, args.auth, args.username,
+                                  args.password, args.max_connections))
+
+    reference, label = original_stats(streams), "orig"
+    ref_result = None
+    if args.reference:
+        ref_result = run(1.0)
+        reference, label = ref_result.routes, "1x"
+    elif reference is None:
+        print("the log has no timings; use a REQUEST_CAPTURE_FILE capture or --reference "
+              "to compare against something", file=sys.stderr)
+    result = run(args.speed)
+    print_comparison(result, reference, label)
+
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_FILE.write_text(json.dumps({
+        "log": str(args.log),
+        "reference": label,
+        "reference_run": ref_result.to_dict() if ref_result else None,
+        "original": {k: v.to_dict() for k, v in sorted(reference.items())} if label == "orig" and reference else None,
+        "replay": result.to_dict(),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""Run the TestSprite suite concurrently on one event loop.
+
+Usage (from ``testsprite_tests``)::
+
+    python -m harness                      # all TC*.py, shared browser
+    python -m harness -k TC004 -k TC007    # subset by file-name substring
+    python -m harness --serial             # old one-file-at-a-time mode
+    python -m harness --fixed-waits        # old 3 s sleeps before each step
+    python -m harness --ui-login           # type credentials in every test
+    python -m harness --no-shared-prefixes # replay shared flow prefixes per test (harness.engine)
+    python -m harness --perf               # write artifacts/perf/<test>.json
+    python -m harness --profile            # per-step CPU profiles/traces, see harness.profiler
+    python -m harness --record             # API timings to artifacts/requests.jsonl
+    python -m harness.shard -j 8           # split across 8 worker processes
+    python -m harness --mock-api           # against harness.mockapi, not the real server
+    python -m harness --api-gate           # harness.apisuite first, browsers only if it passes
+    python -m harness --server             # boot server/production.ts once (harness.server)
+    python -m harness --net-cache          # block fonts/third parties, cache static assets
+    python -m harness --repeat 3 --baseline --fail-on-regression 20
+                                           # p95 regression gate, see harness.baseline
+
+``--serial`` runs each file as its own ``python TCxxx.py`` process, exactly
+as before, and stores the timings as the baseline that later concurrent runs
+compute their speedup against.  Without a baseline the speedup is estimated
+from the summed test time plus one measured browser launch per test.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .loader import DEFAULT_BASE_URL, TESTS_DIR, TestCase, discover
+
+ARTIFACTS_DIR = TESTS_DIR / "artifacts"
+LAST_RUN_FILE = ARTIFACTS_DIR / "last_run.json"
+SERIAL_BASELINE_FILE = ARTIFACTS_DIR / "serial_baseline.json"
+
+
+@dataclass
+class TestResult:
+    name: str
+    test_id: str
+    status: str  # "passed" | "failed" | "error"
+    duration: float
+    error: Optional[str] = None
+
+
+@dataclass
+class SuiteReport:
+    mode: str
+    wall_time: float
+    results: List[TestResult]
+    launch_seconds: float = 0.0
+    serial_time: Optional[float] = None
+    serial_time_source: Optional[str] = None
+    waits: str = "event"
+    repeat: int = 1
+    regressions: Optional[dict] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if not self.serial_time or not self.wall_time:
+            return None
+        return self.serial_time / self.wall_time
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"passed": 0, "failed": 0, "error": 0}
+        for result in self.results:
+            counts[result.status] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "waits": self.waits,
+            "repeat": self.repeat,
+            "wall_time": self.wall_time,
+            "launch_seconds": self.launch_seconds,
+            "serial_time": self.serial_time,
+            "serial_time_source": self.serial_time_source,
+            "speedup": self.speedup,
+            "counts": self.counts(),
+            "results": [asdict(r) for r in self.results],
+            "regressions": self.regressions,
+        }
+
+
+async def run_one(test: TestCase, session, timeout: float) -> TestResult:
+    """Run a single loaded test against ``session``."""
+    session.bind(test)
+    started = time.perf_counter()
+    status, error = "passed", None
+    try:
+        await asyncio.wait_for(test.run(), timeout)
+    except AssertionError as exc:
+        status, error = "failed", str(exc) or "AssertionError"
+    except asyncio.TimeoutError:
+        status, error = "error", f"timed out after {timeout:.0f}s"
+    except Exception:
+        status, error = "error", traceback.format_exc(limit=3)
+    finally:
+        await session.release(test)
+    return TestResult(test.name, test.test_id, status, time.perf_counter() - started, error)
+
+
+async def run_concurrent(tests: Sequence[TestCase], args: argparse.Namespace) -> SuiteReport:
+    from .auth import AuthCache
+    from .browser import BrowserSession
+
+    auth = None if args.ui_login else AuthCache(args.base_url)
+    plugins = []
+    if args.perf:
+        from .perf import PerfPlugin
+
+        plugins.append(PerfPlugin())
+    profiler = None
+    if args.profile:
+        from .profiler import ProfilePlugin
+
+        profiler = ProfilePlugin(trace=not args.no_trace)
+        plugins.append(profiler)
+    if args.record:
+        from .recorder import RequestRecorder
+
+        plugins.append(RequestRecorder(args.record))
+    network = None
+    if args.net_cache:
+        from .netcache import NetworkPlugin
+
+        network = NetworkPlugin(args.base_url, allow_hosts=args.allow_host or ())
+        plugins.append(network)
+    started = time.perf_counter()
+    async with BrowserSession(
+        max_contexts=args.max_contexts, headless=not args.headed, auth=auth, plugins=plugins
+    ) as session:
+        results = []
+        for _ in range(args.repeat):
+            results += await asyncio.gather(*(run_one(t, session, args.timeout) for t in tests))
+    if network is not None:
+        network.print_summary()
+    if profiler is not None:
+        profiler.close()
+        profiler.print_summary()
+    return SuiteReport(
+        mode="concurrent",
+        wall_time=time.perf_counter() - started,
+        results=results,
+        launch_seconds=session.launch_seconds,
+        repeat=args.repeat,
+    )
+
+
+def run_serial(tests: Sequence[TestCase], timeout: float) -> SuiteReport:
+    """Run each file in its own interpreter, one after another."""
+    from . import waits
+
+    env = dict(os.environ, TESTSPRITE_FIXED_WAITS="1" if waits.fixed_waits_enabled() else "0")
+    results = []
+    started = time.perf_counter()
+    for test in tests:
+        t0 = time.perf_counter()
+        # Compiled flows have no script of their own; the engine runs them.
+        cmd = [sys.executable, "-m", "harness.engine", "run", str(test.path)] \
+            if test.path.suffix == ".json" else [sys.executable, str(test.path)]
+        try:
+            proc = subprocess.run(
+                cmd,
+                cwd=TESTS_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+            if proc.returncode == 0:
+                status, error = "passed", None
+            else:
+                tail = proc.stderr.strip().splitlines()[-1:] or ["exit %d" % proc.returncode]
+                status = "failed" if "AssertionError" in proc.stderr else "error"
+                error = tail[0]
+        except subprocess.TimeoutExpired:
+            status, error = "error", f"timed out after {timeout:.0f}s"
+        results.append(TestResult(test.name, test.test_id, status, time.perf_counter() - t0, error))
+    wall = time.perf_counter() - started
+    return SuiteReport(mode="serial", wall_time=wall, results=results, serial_time=wall,
+                       serial_time_source="measured")
+
+
+def attach_serial_baseline(report: SuiteReport, baseline_file: Path = SERIAL_BASELINE_FILE) -> None:
+    """Fill in ``report.serial_time`` from a stored serial run or an estimate."""
+    names = {r.name for r in report.results}
+    if baseline_file.exists():
+        baseline = json.loads(baseline_file.read_text())
+        durations = {r["name"]: r["duration"] for r in baseline.get("results", [])}
+        if names <= durations.keys():
+            report.serial_time = sum(durations[n] for n in names) * report.repeat
+            report.serial_time_source = "measured"
+            return
+    report.serial_time = sum(r.duration for r in report.results) + report.launch_seconds * len(report.results)
+    report.serial_time_source = "estimated"
+
+
+def print_report(report: SuiteReport) -> None:
+    width = max((len(r.name) for r in report.results), default=10)
+    for result in sorted(report.results, key=lambda r: r.duration, reverse=True):
+        print(f"  {result.name:<{width}}  {result.status:<6}  {result.duration:8.2f}s")
+    counts = report.counts()
+    print(
+        f"\n{len(report.results)} tests: {counts['passed']} passed, "
+        f"{counts['failed']} failed, {counts['error']} errors "
+        f"in {report.wall_time:.2f}s ({report.mode}, {report.waits} waits)"
+    )
+    if report.mode != "serial" and report.speedup:
+        print(
+            f"serial mode: {report.serial_time:.2f}s ({report.serial_time_source}), "
+            f"speedup {report.speedup:.2f}x"
+        )
+
+
+def write_report(report: SuiteReport, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report.to_dict(), indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="select", action="append",
+                        help="only run files whose name contains this (repeatable)")
+    parser.add_argument("--max-contexts", type=int, default=8,
+                        help="size of the shared BrowserContext pool (default: 8)")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="per-test timeout in seconds (default: 300)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL,
+                        help="app server URL used for the API login (default: %(default)s)")
+    parser.add_argument("--ui-login", action="store_true",
+                        help="keep the generated login steps instead of reusing a cached session")
+    parser.add_argument("--perf", action="store_true",
+                        help="capture navigation/resource timing, long tasks and CDP metrics per test")
+    parser.add_argument("--profile", action="store_true",
+                        help="save a CPU profile and timeline trace per test step to artifacts/profiles")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="with --profile: CPU profiles only, no timeline traces")
+    parser.add_argument("--record", nargs="?", type=Path, const=TESTS_DIR / "artifacts" / "requests.jsonl",
+                        metavar="FILE", help="append one JSON line per API call (default file: artifacts/requests.jsonl)")
+    parser.add_argument("--net-cache", action="store_true",
+                        help="stub Google Fonts, block other third-party hosts and serve static "
+                             "assets from artifacts/netcache")
+    parser.add_argument("--allow-host", action="append", metavar="HOST",
+                        help="third-party host --net-cache lets through (repeatable)")
+    parser.add_argument("--no-shared-prefixes", action="store_true",
+                        help="run every step of every compiled flow instead of sharing common prefixes")
+    parser.add_argument("--fixed-waits", action="store_true",
+                        help="sleep 3 s before each step instead of waiting on readiness signals")
+    parser.add_argument("--serial", action="store_true",
+                        help="run one file per process, sequentially, and store the baseline")
+    parser.add_argument("--mock-api", nargs="?", type=int, const=5100, metavar="PORT",
+                        help="start harness.mockapi on PORT (default: 5100) and run against it")
+    parser.add_argument("--mock-latency", type=float, default=0.0, metavar="MS",
+                        help="delay the mock adds to every API call")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N",
+                        help="run the selected tests N times in the same browser (default: 1)")
+    parser.add_argument("--baseline", nargs="?", type=Path, const=True, metavar="FILE",
+                        help="compare timings with a baseline file and report regressions "
+                             "(default file: perf_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="fold this run's timings into the baseline file")
+    parser.add_argument("--fail-on-regression", type=float, metavar="PCT",
+                        help="exit 1 if any test or endpoint p95 regressed significantly by more than PCT%%")
+    parser.add_argument("--api-gate", action="store_true",
+                        help="run the httpx API suite first and skip the browser tests if it fails")
+    parser.add_argument("--server", nargs="?", const=True, metavar="CMD",
+                        help="start the app server on the --base-url port unless it is already up, "
+                             "wait until it is ready and restart it if it crashes "
+                             "(default CMD: npx tsx server/production.ts)")
+    parser.add_argument("--prewarm", type=Path, metavar="FILE",
+                        help="with --server: log in as each {username, password} in FILE to warm tenant pools")
+    parser.add_argument("--tests-from", type=Path, metavar="FILE",
+                        help="only run the test names listed in FILE, one per line (used by harness.shard)")
+    parser.add_argument("--report", type=Path, default=LAST_RUN_FILE,
+                        help=f"JSON report path (default: {LAST_RUN_FILE.relative_to(TESTS_DIR)})")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.mock_api is not None:
+        from .mockapi import serving
+
+        # A separate namespace keeps the mock's session cookie out of the
+        # real server's cached login.
+        os.environ.setdefault("TESTSPRITE_NAMESPACE", "mock")
+        with serving(args.mock_api, latency=args.mock_latency) as base_url:
+            os.environ["TESTSPRITE_BASE_URL"] = base_url
+            args.base_url = base_url
+            return _run(args)
+    if args.server:
+        from urllib.parse import urlparse
+
+        from .server import DEFAULT_CMD, AppServer
+
+        cmd = args.server if isinstance(args.server, str) else DEFAULT_CMD
+        port = urlparse(args.base_url).port or 80
+        with AppServer(port, cmd, accounts=args.prewarm) as server:
+            print(server.summary())
+            code = _run(args)
+        if server.metrics.restarts:
+            print(server.summary())
+        return code
+    return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    # Tests that build their own clients (LoadConfig in TC011/TC014) read this.
+    os.environ["TESTSPRITE_BASE_URL"] = args.base_url
+    names = args.tests_from.read_text().split() if args.tests_from else None
+    tests = discover(select=args.select, skip_login=not (args.ui_login or args.serial),
+                     names=names, base_url=args.base_url, share_prefixes=not args.no_shared_prefixes)
+    if not tests:
+        print("no tests selected", file=sys.stderr)
+        return 2
+
+    if args.fixed_waits:
+        from . import waits
+
+        waits.set_fixed_waits(True)
+
+    if args.api_gate and not api_gate(args.base_url):
+        return 1
+
+    comparing = args.baseline or args.update_baseline or args.fail_on_regression is not None
+    if comparing:
+        from .baseline import BASELINE_FILE
+
+        if not isinstance(args.baseline, Path):
+            args.baseline = BASELINE_FILE
+        if not args.record and not args.serial:
+            from .recorder import DEFAULT_LOG
+
+            args.record = DEFAULT_LOG
+
+    if args.serial:
+        report = run_serial(tests, args.timeout)
+        write_report(report, SERIAL_BASELINE_FILE)
+    else:
+        report = asyncio.run(run_concurrent(tests, args))
+        attach_serial_baseline(report)
+    if args.fixed_waits:
+        report.waits = "fixed"
+
+    print_report(report)
+    regressed = _check_baseline(report, args) if comparing else False
+    write_report(report, args.report)
+    if regressed:
+        return 1
+    return 0 if report.counts()["passed"] == len(report.results) else 1
+
+
+def api_gate(base_url: str) -> bool:
+    """Run :mod:`harness.apisuite`; False (and a message) if it failed."""
+    from .apisuite import run_suite, write_result
+
+    result = asyncio.run(run_suite(base_url))
+    write_result(result)
+    if result.passed:
+        print(f"API suite: {result.checks} checks passed in {result.elapsed:.2f}s")
+        return True
+    result.print_table()
+    print("API suite failed; skipping the browser tests", file=sys.stderr)
+    return False
+
+
+def _check_baseline(report: SuiteReport, args: argparse.Namespace) -> bool:
+    """Compare with the baseline; return True if the p95 gate tripped."""
+    from . import baseline as bl
+
+    stored = bl.load_baseline(args.baseline)
+    tests = bl.test_samples(report.results)
+    endpoints = bl.endpoint_samples(args.record) if args.record else {}
+    rows = bl.compare(stored, tests, endpoints)
+    report.regressions = bl.regression_section(rows, stored)
+    bl.print_regressions(rows)
+    bl.write_markdown(rows, stored)
+
+    failed = bl.gate(rows, args.fail_on_regression) if args.fail_on_regression is not None else []
+    for row in failed:
+        print(f"p95 regression over {args.fail_on_regression:.0f}%: {row.kind} {row.name} "
+              f"({row.change:+.0%})", file=sys.stderr)
+    if args.update_baseline:
+        if failed:
+            print("baseline not updated: the run regressed", file=sys.stderr)
+        else:
+            bl.write_baseline(bl.update_baseline(stored, tests, endpoints), args.baseline)
+    return bool(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
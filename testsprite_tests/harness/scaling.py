@@ -0,0 +1,588 @@
+"""Dataset-size scaling benchmark for the unpaginated list and report routes.
+
+``GET /api/reports/vendor-transactions``, ``/api/reports/receivables-payables``,
+``/api/guest-sales``, ``/api/credit-requests``, ``/api/tank-daily-readings``
+and ``/api/sale-entries`` return whole collections: no limit, no projection,
+and for tank readings one ``TankerSale.find`` per reading.  This module measures how they degrade as a
+station accumulates history.  For each size in :data:`SIZES` it:
+
+1. builds a tenant whose driving collections (vendor transactions, guest
+   sales, credit requests, tank daily readings, sale entries) each hold that
+   many rows, with the supporting collections scaled alongside (one tanker
+   delivery every third tank-day, one credit customer per hundred rows);
+2. loads it into a scratch Mongo tenant database (``--mongo``/``--db``) or
+   into :mod:`harness.mockapi` (``--mock``);
+3. calls every endpoint ``--repeat`` times after one warm-up call, recording
+   latency, response bytes and the server's resident set size (sampled
+   every :data:`RSS_INTERVAL` seconds over the server's process tree) and,
+   when the server runs with ``RUNTIME_METRICS=1``, the Mongo queries each
+   call sends (the ``mongo.commands`` counters of ``/api/runtime-metrics``).
+
+Per endpoint, the p50 latencies are fitted against O(n), O(n log n) and
+O(n^2) (least squares on relative error, with a constant term) and the
+log-log slope is reported next to the best fit.  The fit is extrapolated to
+the row count at which p50 crosses ``--budget-ms``, which ranks the
+endpoints by how soon they fall over.  Results go to
+``artifacts/scaling/results.json`` and a markdown table to
+``artifacts/scaling/scaling.md``::
+
+    python -m harness.scaling --mock --sizes 1000 10000 100000
+    python -m harness.scaling --mongo mongodb://localhost:27017 --db scratch_tenant --pid 4242
+
+``--db`` collections are dropped and replaced, so never point it at a
+tenant whose data matters.  An endpoint that times out is not called again
+at larger sizes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import math
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME, decode_jwt
+from .load import LOGIN_PATH
+from .loader import DEFAULT_BASE_URL, TESTS_DIR
+from .server import AppServer, tree_rss
+from .stats import percentile
+from .synth import PAYMENT_MODES, Dataset, SynthConfig, Table, generate
+
+SCALING_DIR = TESTS_DIR / "artifacts" / "scaling"
+RESULTS_FILE = SCALING_DIR / "results.json"
+TABLE_FILE = SCALING_DIR / "scaling.md"
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+ENDPOINTS = (
+    "/api/reports/vendor-transactions",
+    "/api/reports/receivables-payables",
+    "/api/guest-sales",
+    "/api/credit-requests",
+    "/api/tank-daily-readings",
+    "/api/sale-entries",
+)
+MODELS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n^2)": lambda n: n * n,
+}
+
+SPAN_DAYS = 5 * 365  # history the row-indexed collections are spread over
+MAX_TANK_DAYS = 10 * 365  # more readings than this add tanks instead of days
+VENDORS = 25
+NOZZLES = 12
+SHIFTS = ("Morning", "Evening", "Night")
+USERS = 5  # distinct createdBy ids on sale entries
+METRICS_PATH = "/api/runtime-metrics"
+QUERY_COMMANDS = ("find", "aggregate", "count", "distinct", "getMore")
+VENDOR_TYPES = np.array(["Liquid", "Lubricant", "Service"])
+RSS_INTERVAL = 0.05
+DEFAULT_TIMEOUT = 300.0
+DEFAULT_BUDGET_MS = 2000.0
+MOCK_PORT = 5190
+
+
+# -- data --------------------------------------------------------------------
+
+def _ids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """``n`` ObjectId-shaped hex strings (``vendorId`` is an ObjectId ref)."""
+    return np.array([bytes(row).hex() for row in rng.integers(0, 256, (n, 12), dtype=np.uint8)])
+
+
+def scaled_dataset(rows: int, seed: int = 0, tenant_id: Optional[str] = None) -> Dataset:
+    """A tenant whose benchmarked collections each hold ``rows`` documents."""
+    base = generate(SynthConfig.preset("small", seed=seed, credit_customers=max(20, rows // 100)))
+    rng = np.random.default_rng([seed, rows])
+    tenant = dict(base.tenant, _id=tenant_id or base.tenant["_id"])
+    end = np.datetime64(base.config.end_date)
+    tables = {name: base.tables[name] for name in ("fuel_products", "credit_customers", "employees")}
+    for table in tables.values():
+        if "tenantId" in table.columns:
+            table.columns["tenantId"] = np.full(len(table), tenant["_id"])
+    # Products and employees are looked up by _id, which mongoose casts to ObjectId.
+    for name in ("fuel_products", "employees"):
+        table = tables[name]
+        tables[name] = Table(table.collection, dict(table.columns, id=_ids(rng, len(table))),
+                             object_ids=("id",))
+    product_ids = tables["fuel_products"].columns["id"]
+    customer_ids = tables["credit_customers"].columns["id"]
+    employee_ids = tables["employees"].columns["id"]
+
+    def days(n: int) -> np.ndarray:
+        return end - rng.integers(0, SPAN_DAYS, n).astype("timedelta64[D]")
+
+    vendor_ids = _ids(rng, VENDORS)
+    tables["vendors"] = Table("vendors", {
+        "id": vendor_ids,
+        "tenantId": np.full(VENDORS, tenant["_id"]),
+        "vendorName": np.char.add("Vendor ", (np.arange(VENDORS) + 1).astype(str)),
+        "vendorType": rng.choice(VENDOR_TYPES, VENDORS),
+        "isActive": np.ones(VENDORS, dtype=bool),
+    }, object_ids=("id",))
+    tx_day = days(rows)
+    tables["vendor_transactions"] = Table("vendortransactions", {
+        "id": _ids(rng, rows),
+        "tenantId": np.full(rows, tenant["_id"]),
+        "transactionDate": tx_day,
+        "vendorId": vendor_ids[rng.integers(0, VENDORS, rows)],
+        "transactionType": rng.choice(np.array(["Credit", "Debit"]), rows, p=[0.6, 0.4]),
+        "amount": np.round(rng.uniform(1_000, 200_000, rows), -1),
+        "paymentMode": rng.choice(np.array(["Cash", "Bank", "UPI"]), rows),
+        "description": np.char.add("Invoice ", (np.arange(rows) + 1).astype(str)),
+        "createdAt": tx_day,
+    }, string_dates=("transactionDate",), object_ids=("id", "vendorId"))
+
+    request_day = days(rows)
+    tables["credit_requests"] = Table("creditrequests", {
+        "id": _ids(rng, rows),
+        "requestDate": request_day,
+        "creditCustomerId": customer_ids[rng.integers(0, len(customer_ids), rows)],
+        "fuelProductId": product_ids[rng.integers(0, len(product_ids), rows)],
+        "quantity": np.round(rng.uniform(50, 2_000, rows), 0),
+        "status": rng.choice(np.array(["Pending", "Approved", "Rejected"]), rows, p=[0.2, 0.7, 0.1]),
+        "vehicleNumber": np.char.add("KA01", rng.integers(1000, 9999, rows).astype(str)),
+        "createdAt": request_day,
+    })
+
+    g_day = days(rows)
+    g_product = rng.integers(0, len(product_ids), rows)
+    g_qty = np.round(rng.lognormal(2.3, 0.6, rows), 2)
+    g_price = np.round(rng.uniform(88, 111, rows), 2)
+    tables["guest_sales"] = Table("guestsales", {
+        "id": _ids(rng, rows),
+        "saleDate": g_day,
+        "mobileNumber": rng.integers(6_000_000_000, 9_999_999_999, rows).astype(str),
+        "billNo": (np.arange(rows) + 1).astype(str),
+        "fuelProductId": product_ids[g_product],
+        "pricePerUnit": g_price,
+        "quantity": g_qty,
+        "totalAmount": np.round(g_qty * g_price, 2),
+        "paymentMode": rng.choice(PAYMENT_MODES, rows),
+        "createdAt": g_day,
+    })
+
+    # Readings: one per tank and day, consecutive days per tank.
+    n_tanks = max(len(product_ids), math.ceil(rows / MAX_TANK_DAYS))
+    per_tank = math.ceil(rows / n_tanks)
+    tank_ids = _ids(rng, n_tanks)
+    slot = np.arange(rows)
+    r_tank, r_offset = slot // per_tank, slot % per_tank
+    r_day = end - r_offset.astype("timedelta64[D]")
+    opening = np.round(rng.uniform(4_000, 20_000, rows), 3)
+    meter = np.round(rng.uniform(500, 3_000, rows), 3)
+    tables["tanks"] = Table("tanks", {
+        "id": tank_ids,
+        "tankNumber": np.char.add("T-", (np.arange(n_tanks) + 1).astype(str)),
+        "fuelProductId": product_ids[np.arange(n_tanks) % len(product_ids)],
+        "capacity": np.full(n_tanks, 25_000.0),
+        "isActive": np.ones(n_tanks, dtype=bool),
+    }, object_ids=("id",))
+    tables["tank_daily_readings"] = Table("tankdailyreadings", {
+        "id": _ids(rng, rows),
+        "readingDate": r_day,
+        "tankId": tank_ids[r_tank],
+        "openingStock": opening,
+        "closingStock": np.round(opening - meter, 3),
+        "meterSale": meter,
+        "testing": np.zeros(rows),
+        "createdAt": r_day,
+    })
+    delivered = r_offset % 3 == 0
+    n_deliveries = int(delivered.sum())
+    tables["tanker_sales"] = Table("tankersales", {
+        "id": _ids(rng, n_deliveries),
+        "saleDate": r_day[delivered],
+        "tankId": tank_ids[r_tank[delivered]],
+        "fuelProductId": product_ids[r_tank[delivered] % len(product_ids)],
+        "tankerSaleQuantity": np.full(n_deliveries, 8_000.0),
+        "createdAt": r_day[delivered],
+    })
+
+    # Sale entries over a fixed forecourt: every row references a nozzle (and
+    # through it a tank), a product, a shift, an employee and a user.
+    nozzle_ids = _ids(rng, NOZZLES)
+    nozzle_tank = np.arange(NOZZLES) % n_tanks
+    tables["nozzles"] = Table("nozzles", {
+        "id": nozzle_ids,
+        "nozzleNumber": np.char.add("N-", (np.arange(NOZZLES) + 1).astype(str)),
+        "pumpStation": np.char.add("P", (np.arange(NOZZLES) // 2 + 1).astype(str)),
+        "tankId": tank_ids[nozzle_tank],
+        "fuelProductId": tables["tanks"].columns["fuelProductId"][nozzle_tank],
+        "isActive": np.ones(NOZZLES, dtype=bool),
+    }, object_ids=("id",))
+    shift_ids = _ids(rng, len(SHIFTS))
+    tables["duty_shifts"] = Table("dutyshifts", {
+        "id": shift_ids,
+        "shiftName": np.array(SHIFTS),
+    }, object_ids=("id",))
+    e_day = days(rows)
+    e_nozzle = rng.integers(0, NOZZLES, rows)
+    e_opening = np.round(rng.uniform(10_000, 500_000, rows), 2)
+    e_qty = np.round(rng.gamma(4.0, 45.0, rows), 2)
+    e_price = np.round(rng.uniform(88, 111, rows), 2)
+    tables["sale_entries"] = Table("saleentries", {
+        "id": _ids(rng, rows),
+        "saleDate": e_day,
+        "shiftId": shift_ids[rng.integers(0, len(SHIFTS), rows)],
+        "pumpStation": tables["nozzles"].columns["pumpStation"][e_nozzle],
+        "nozzleId": nozzle_ids[e_nozzle],
+        "fuelProductId": tables["nozzles"].columns["fuelProductId"][e_nozzle],
+        "openingReading": e_opening,
+        "closingReading": np.round(e_opening + e_qty, 2),
+        "pricePerUnit": e_price,
+        "quantity": e_qty,
+        "netSaleAmount": np.round(e_qty * e_price, 2),
+        "employeeId": employee_ids[rng.integers(0, len(employee_ids), rows)],
+        "createdBy": _ids(rng, USERS)[rng.integers(0, USERS, rows)],
+        "createdAt": e_day,
+    })
+    return Dataset(base.config, tenant, tables)
+
+
+def write_dump(data: Dataset, path: Path, database: str = "synthetic") -> Path:
+    """Write ``data`` in the ``db_dump.json`` layout ``harness.mockapi --dump`` reads."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"databases": [{"name": database, "collections": [
+        {"name": name, "count": len(docs), "sample": docs}
+        for name, docs in data.to_collections().items()
+    ]}]}, default=str))
+    return path
+
+
+# -- server memory -----------------------------------------------------------
+
+class RssSampler:
+    """Peak :func:`tree_rss` of a process while the block runs."""
+
+    def __init__(self, pid: Optional[int]) -> None:
+        self.pid = pid
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        rss = tree_rss(self.pid) if self.pid else None
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(RSS_INTERVAL):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self._sample()
+        if self.pid:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+
+
+# -- measurement -------------------------------------------------------------
+
+@dataclass
+class Measurement:
+    endpoint: str
+    rows: int
+    samples: List[float] = field(default_factory=list)  # seconds
+    bytes: Optional[int] = None
+    rows_returned: Optional[int] = None
+    rss_before: Optional[int] = None
+    rss_peak: Optional[int] = None
+    queries: Optional[float] = None  # Mongo queries per call
+    error: Optional[str] = None
+
+    @property
+    def p50(self) -> Optional[float]:
+        return percentile(sorted(self.samples), 50) if self.samples else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        return percentile(sorted(self.samples), 95) if self.samples else None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "p50": self.p50, "p95": self.p95}
+
+
+def login(client: httpx.Client, username: str, password: str) -> Optional[str]:
+    """Log in and return the session's ``tenantId`` claim."""
+    response = client.post(LOGIN_PATH, json={"email": username, "password": password})
+    response.raise_for_status()
+    token = client.cookies.get("token")
+    return decode_jwt(token).get("tenantId") if token else None
+
+
+def query_count(client: httpx.Client) -> Optional[int]:
+    """Mongo queries the server has sent so far, or None without runtime metrics."""
+    try:
+        response = client.get(METRICS_PATH)
+    except httpx.HTTPError:
+        return None
+    if response.status_code != 200:
+        return None
+    commands = response.json().get("mongo", {}).get("commands")
+    if commands is None:
+        return None
+    return sum(commands.get(name, 0) for name in QUERY_COMMANDS)
+
+
+def measure(client: httpx.Client, endpoint: str, rows: int, repeat: int,
+            pid: Optional[int], count_queries: bool = False) -> Measurement:
+    result = Measurement(endpoint, rows, rss_before=tree_rss(pid) if pid else None)
+    before = query_count(client) if count_queries else None
+    calls = 0
+    with RssSampler(pid) as sampler:
+        try:
+            for attempt in range(repeat + 1):
+                calls += 1
+                started = time.perf_counter()
+                response = client.get(endpoint)
+                elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    result.error = f"HTTP {response.status_code}"
+                    break
+                if attempt:  # the first call warms caches and connection pools
+                    result.samples.append(elapsed)
+                result.bytes = len(response.content)
+                body = response.json()
+                result.rows_returned = len(body.get("rows") or body.get("data") or [])
+        except httpx.TimeoutException:
+            result.error = "timeout"
+        except httpx.HTTPError as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+    result.rss_peak = sampler.peak
+    after = query_count(client) if before is not None else None
+    if after is not None and not result.error:
+        result.queries = (after - before) / calls
+    return result
+
+
+# -- complexity fit ----------------------------------------------------------
+
+@dataclass
+class Fit:
+    endpoint: str
+    model: Optional[str]
+    intercept: float
+    coefficient: float
+    rel_error: float
+    slope: Optional[float]  # d log(p50) / d log(n)
+    rows_at_budget: Optional[float]
+
+
+def fit_endpoint(endpoint: str, sizes: Sequence[int], seconds: Sequence[float],
+                 budget: float) -> Fit:
+    """Best of :data:`MODELS` for ``p50 = a + b * f(n)``, by RMS relative error."""
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(seconds, dtype=float)
+    slope = float(np.polyfit(np.log(n), np.log(t), 1)[0]) if len(n) >= 2 else None
+    best = Fit(endpoint, None, float("nan"), float("nan"), float("nan"), slope, None)
+    if len(n) < 3:
+        return best
+    for name, f in MODELS.items():
+        x = f(n)
+        design = np.column_stack([np.ones_like(x), x]) / t[:, None]  # weight rows by 1/t
+        (a, b), *_ = np.linalg.lstsq(design, np.ones_like(t), rcond=None)
+        if b <= 0:
+            continue
+        error = float(np.sqrt(np.mean(((a + b * x) - t) ** 2 / t ** 2)))
+        if best.model is None or error < best.rel_error:
+            best = Fit(endpoint, name, float(a), float(b), error, slope, None)
+    if best.model is not None:
+        best.rows_at_budget = _solve(MODELS[best.model], best.intercept, best.coefficient, budget)
+    return best
+
+
+def _solve(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, budget: float) -> Optional[float]:
+    """Smallest n in [1, 1e12] with ``a + b * f(n) >= budget`` (bisection on log n)."""
+    if a >= budget:
+        return 1.0
+    low, high = 0.0, 12.0
+    if a + b * float(f(np.float64(10 ** high))) < budget:
+        return None
+    for _ in range(60):
+        mid = (low + high) / 2
+        if a + b * float(f(np.float64(10 ** mid))) >= budget:
+            high = mid
+        else:
+            low = mid
+    return 10 ** high
+
+
+def fits(measurements: Sequence[Measurement], budget: float) -> List[Fit]:
+    """One :class:`Fit` per endpoint, soonest to cross the budget first."""
+    rows: List[Fit] = []
+    for endpoint in dict.fromkeys(m.endpoint for m in measurements):
+        ok = [m for m in measurements if m.endpoint == endpoint and m.p50]
+        rows.append(fit_endpoint(endpoint, [m.rows for m in ok], [m.p50 for m in ok], budget))
+    rows.sort(key=lambda f: f.rows_at_budget if f.rows_at_budget is not None else float("inf"))
+    return rows
+
+
+# -- reporting ---------------------------------------------------------------
+
+def _size(n: float) -> str:
+    for unit, div in (("M", 1e6), ("k", 1e3)):
+        if n >= div:
+            return f"{n / div:.3g}{unit}"
+    return f"{n:.0f}"
+
+
+def _mib(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / 1024 / 1024:.0f} MiB"
+
+
+def _queries(counts: Sequence[float]) -> str:
+    if not counts:
+        return "n/a"
+    if len(counts) == 1 or counts[0] == counts[-1]:
+        return f"{counts[-1]:.0f}"
+    return f"{counts[0]:.0f} → {counts[-1]:.0f}"
+
+
+def markdown(measurements: Sequence[Measurement], fitted: Sequence[Fit], budget: float) -> str:
+    sizes = sorted({m.rows for m in measurements})
+    by_key = {(m.endpoint, m.rows): m for m in measurements}
+    lines = [
+        "## Endpoint Scaling",
+        "",
+        f"p50 latency by rows per collection ({dt.date.today().isoformat()}). "
+        f"Bytes and peak server RSS at the largest size measured; "
+        f"\"rows at budget\" extrapolates the best fit to a {budget:.0f} ms p50. "
+        f"Queries are Mongo queries per call at the smallest and largest size.",
+        "",
+        "| Endpoint | " + " | ".join(_size(n) for n in sizes)
+        + " | Bytes | Peak RSS | Queries | Slope | Best fit | Rows at budget |",
+        "|---|" + "---|" * len(sizes) + "---|---|---|---|---|---|",
+    ]
+    for fit in fitted:
+        cells, largest = [], None
+        queries = [m.queries for n in sizes
+                   if (m := by_key.get((fit.endpoint, n))) is not None and m.queries is not None]
+        for n in sizes:
+            m = by_key.get((fit.endpoint, n))
+            if m is None:
+                cells.append("-")
+            elif m.p50 is None:
+                cells.append(m.error or "-")
+            else:
+                cells.append(f"{m.p50 * 1000:.0f} ms")
+                largest = m
+        slope = "n/a" if fit.slope is None else f"{fit.slope:.2f}"
+        at_budget = "n/a" if fit.rows_at_budget is None else _size(fit.rows_at_budget)
+        lines.append(f"| `{fit.endpoint}` | " + " | ".join(cells)
+                     + f" | {_size(largest.bytes) + 'B' if largest and largest.bytes else 'n/a'}"
+                     + f" | {_mib(largest.rss_peak if largest else None)} | {_queries(queries)} | {slope}"
+                     + f" | {fit.model or 'n/a'} | {at_budget} |")
+    return "\n".join(lines) + "\n"
+
+
+def write_results(measurements: Sequence[Measurement], fitted: Sequence[Fit], budget: float,
+                  directory: Path = SCALING_DIR) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / RESULTS_FILE.name).write_text(json.dumps({
+        "budget_ms": budget,
+        "measurements": [m.to_dict() for m in measurements],
+        "fits": [asdict(f) for f in fitted],
+    }, indent=2))
+    (directory / TABLE_FILE.name).write_text(markdown(measurements, fitted, budget))
+
+
+# -- driver ------------------------------------------------------------------
+
+def run(sizes: Sequence[int], endpoints: Sequence[str] = ENDPOINTS, *, mock: bool = False,
+        mongo: Optional[str] = None, database: Optional[str] = None, master_db: Optional[str] = None,
+        base_url: str = DEFAULT_BASE_URL, pid: Optional[int] = None, repeat: int = 5,
+        timeout: float = DEFAULT_TIMEOUT, seed: int = 0, username: str = DEFAULT_USERNAME,
+        password: str = DEFAULT_PASSWORD) -> List[Measurement]:
+    """Load each size, time every endpoint, and return all measurements."""
+    measurements: List[Measurement] = []
+    given_up: set = set()
+    tenant_id: Optional[str] = None
+    count_queries = False
+    if not mock:
+        with httpx.Client(base_url=base_url, timeout=timeout) as client:
+            tenant_id = login(client, username, password)
+            count_queries = query_count(client) is not None
+
+    for rows in sorted(sizes):
+        started = time.perf_counter()
+        data = scaled_dataset(rows, seed, tenant_id)
+        server: Optional[AppServer] = None
+        if mock:
+            dump = write_dump(data, SCALING_DIR / f"dump-{rows}.json")
+            cmd = (f"{sys.executable} -m harness.mockapi --port {MOCK_PORT} "
+                   f"--dump {dump} --database synthetic")
+            server = AppServer(MOCK_PORT, cmd, env={"PYTHONPATH": str(TESTS_DIR)},
+                               watch=False, build=False).start()
+            url, server_pid = server.base_url, server.pid
+        else:
+            data.load_mongo(mongo, database, master_db)
+            url, server_pid = base_url, pid
+        print(f"{_size(rows)} rows loaded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        try:
+            with httpx.Client(base_url=url, timeout=timeout) as client:
+                login(client, username, password)
+                for endpoint in endpoints:
+                    if endpoint in given_up:
+                        continue
+                    m = measure(client, endpoint, rows, repeat, server_pid, count_queries)
+                    measurements.append(m)
+                    if m.error:
+                        given_up.add(endpoint)
+                    p50 = f"{m.p50 * 1000:.0f} ms" if m.p50 else m.error
+                    queries = "" if m.queries is None else f"  {m.queries:.0f} queries"
+                    print(f"  {endpoint:<40}{p50:>12}  {_mib(m.rss_peak)}{queries}", file=sys.stderr)
+        finally:
+            if server is not None:
+                server.stop()
+    return measurements
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.scaling", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mock", action="store_true", help="serve each dataset from harness.mockapi")
+    target.add_argument("--mongo", metavar="URI", help="load each dataset into this MongoDB")
+    parser.add_argument("--db", help="scratch tenant database the server reads (dropped per size)")
+    parser.add_argument("--master-db", help="also register the tenant in this Mongo database")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--pid", type=int, help="server process whose RSS to sample (with --mongo)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--endpoint", action="append", dest="endpoints", metavar="PATH",
+                        help="endpoint to time (repeatable; default: all six)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per endpoint and size")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-call timeout, s")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.mongo and not args.db:
+        parser.error("--mongo needs --db (a scratch tenant database)")
+
+    measurements = run(args.sizes, args.endpoints or ENDPOINTS, mock=args.mock, mongo=args.mongo,
+                       database=args.db, master_db=args.master_db, base_url=args.base_url,
+                       pid=args.pid, repeat=args.repeat, timeout=args.timeout, seed=args.seed)
+    fitted = fits(measurements, args.budget_ms / 1000)
+    write_results(measurements, fitted, args.budget_ms)
+    print(markdown(measurements, fitted, args.budget_ms))
+    print(f"results in {RESULTS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
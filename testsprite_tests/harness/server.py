@@ -0,0 +1,337 @@
+"""Boot the production app server once per suite and keep it alive.
+
+Every generated test starts with ``page.goto("http://localhost:5000")`` and
+a 10 s timeout, assuming someone already started the server.  A cold
+``server/index.ts`` compiles the frontend through the Vite middleware on
+the first page load, so the first few tests fail at random.
+:class:`AppServer` pays the cold start once instead:
+
+1. if something already answers ``/api/health`` on the port, it is reused;
+2. otherwise ``dist/`` is built if missing or not built by the harness
+   (``npm run build:client`` with ``VITE_E2E_HOOKS=1``, which exposes the
+   React Query client to :mod:`harness.waits`) and ``server/production.ts``
+   is started with ``PORT`` set;
+3. ``/api/health`` (process up) and then ``/api/readiness`` (database
+   reachable) are polled until they answer ``200``;
+4. optionally, every account in an ``--accounts`` file logs in and makes
+   one API call, so ``attachTenantDb`` has looked up each tenant and opened
+   its pool before the first test;
+5. a watchdog thread restarts the server if the process exits or
+   :data:`UNHEALTHY_LIMIT` health probes in a row fail.
+
+Phase timings and restarts are written to ``artifacts/server/startup.json``
+and printed at the end of the run.  The server's output goes to
+``artifacts/server/server-<port>.log``::
+
+    with AppServer(port=5000) as server:
+        ...  # server.base_url is warm
+    print(server.metrics.ready_seconds)
+
+``python -m harness --server`` wraps a suite run in it; ``harness.shard
+--server-cmd`` uses one per worker port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from http.cookiejar import CookieJar
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .loader import TESTS_DIR
+
+REPO_ROOT = TESTS_DIR.parent
+SERVER_DIR = TESTS_DIR / "artifacts" / "server"
+METRICS_FILE = SERVER_DIR / "startup.json"
+DEFAULT_CMD = "npx tsx server/production.ts"
+BUILD_CMD = "npm run build:client"
+# Written next to a dist/ built with VITE_E2E_HOOKS=1.
+BUILD_MARKER = REPO_ROOT / "dist" / ".e2e-hooks"
+
+READY_TIMEOUT = 180.0
+POLL_INTERVAL = 0.25
+WATCH_INTERVAL = 2.0
+UNHEALTHY_LIMIT = 3
+MAX_RESTARTS = 3
+
+_metrics_lock = threading.Lock()
+_PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+@dataclass
+class StartupMetrics:
+    port: int
+    reused: bool = False
+    build_seconds: Optional[float] = None
+    health_seconds: Optional[float] = None  # spawn -> /api/health 200
+    ready_seconds: Optional[float] = None  # spawn -> /api/readiness 200
+    prewarm_seconds: Optional[float] = None
+    prewarmed_tenants: int = 0
+    restarts: List[dict] = field(default_factory=list)
+
+
+def ensure_build() -> Optional[float]:
+    """Build ``dist/`` with the E2E hooks unless the harness already did.
+
+    A ``dist/`` from a plain ``npm run build`` does not expose the React Query
+    client, so it is rebuilt.  Returns the build time, or None if it existed.
+    """
+    if (REPO_ROOT / "dist" / "index.html").exists() and BUILD_MARKER.exists():
+        return None
+    started = time.perf_counter()
+    subprocess.run(BUILD_CMD, shell=True, cwd=REPO_ROOT, check=True, env=dict(os.environ, VITE_E2E_HOOKS="1"),
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    BUILD_MARKER.write_text("VITE_E2E_HOOKS=1\n")
+    return time.perf_counter() - started
+
+
+def process_tree(pid: int) -> List[int]:
+    """``pid`` and all its live descendants (``npx -> tsx -> node``)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        if Path(f"/proc/{current}").exists():
+            tree.append(current)
+            stack.extend(children.get(current, ()))
+    return tree
+
+
+def tree_rss(pid: int) -> Optional[int]:
+    """Resident bytes of ``pid`` and its descendants; None once it is gone."""
+    total, seen = 0, False
+    for member in process_tree(pid):
+        try:
+            total += int(Path(f"/proc/{member}/statm").read_text().split()[1]) * _PAGE
+            seen = True
+        except (OSError, IndexError, ValueError):
+            continue
+    return total if seen else None
+
+
+def _get(url: str, timeout: float = 5.0) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def answers_health(base_url: str) -> bool:
+    """True if an app server at ``base_url`` answers ``/api/health`` with 200."""
+    return _get(f"{base_url}/api/health") == 200
+
+
+class AppServer:
+    """Context manager owning (or reusing) the app server on one port."""
+
+    def __init__(self, port: int = 5000, cmd: str = DEFAULT_CMD, accounts: Optional[Path] = None,
+                 env: Optional[dict] = None, ready_timeout: float = READY_TIMEOUT,
+                 watch: bool = True, build: bool = True) -> None:
+        self.port = port
+        self.cmd = cmd
+        self.accounts = accounts
+        self.env = dict(os.environ, **(env or {}), PORT=str(port))
+        self.env.setdefault("NODE_ENV", "production")
+        self.ready_timeout = ready_timeout
+        self.watch = watch
+        self.build = build
+        self.base_url = f"http://localhost:{port}"
+        self.log_path = SERVER_DIR / f"server-{port}.log"
+        self.metrics = StartupMetrics(port)
+        self._proc: Optional[subprocess.Popen] = None
+        self._stopping = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the spawned process group leader; None when reused or stopped."""
+        return self._proc.pid if self._proc is not None else None
+
+    def healthy(self) -> bool:
+        return answers_health(self.base_url)
+
+    def _wait(self, path: str, started: float) -> float:
+        deadline = started + self.ready_timeout
+        while True:
+            if self._proc is not None and self._proc.poll() is not None:
+                raise RuntimeError(f"server exited with {self._proc.returncode} during startup; "
+                                   f"see {self.log_path}")
+            if _get(f"{self.base_url}{path}") == 200:
+                return time.perf_counter() - started
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"{self.base_url}{path} not ready after {self.ready_timeout:.0f}s")
+            time.sleep(POLL_INTERVAL)
+
+    def _spawn(self) -> float:
+        SERVER_DIR.mkdir(parents=True, exist_ok=True)
+        log = self.log_path.open("ab")
+        started = time.perf_counter()
+        # Own process group: npx -> tsx -> node must all go on stop().
+        self._proc = subprocess.Popen(self.cmd, shell=True, cwd=REPO_ROOT, env=self.env,
+                                      stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        log.close()
+        return started
+
+    def _prewarm(self) -> None:
+        if not self.accounts:
+            return
+        started = time.perf_counter()
+        for account in json.loads(self.accounts.read_text()):
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+            body = json.dumps({"email": account["username"], "password": account["password"]}).encode()
+            login = urllib.request.Request(f"{self.base_url}/api/auth/login", data=body,
+                                           headers={"Content-Type": "application/json"})
+            try:
+                opener.open(login, timeout=30).close()
+                opener.open(f"{self.base_url}/api/fuel-products", timeout=60).close()
+                self.metrics.prewarmed_tenants += 1
+            except (urllib.error.URLError, OSError) as exc:
+                print(f"pre-warm failed for {account['username']}: {exc}", file=sys.stderr)
+        self.metrics.prewarm_seconds = time.perf_counter() - started
+
+    def _boot(self) -> None:
+        started = self._spawn()
+        self.metrics.health_seconds = self._wait("/api/health", started)
+        self.metrics.ready_seconds = self._wait("/api/readiness", started)
+
+    def start(self) -> "AppServer":
+        if self.healthy():
+            self.metrics.reused = True
+        else:
+            if self.build:
+                self.metrics.build_seconds = ensure_build()
+            self._boot()
+            if self.watch:
+                self._watchdog = threading.Thread(target=self._watch, name=f"server-{self.port}",
+                                                  daemon=True)
+                self._watchdog.start()
+        self._prewarm()
+        self.write_metrics()
+        return self
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+        except ProcessLookupError:
+            pass
+
+    def _restart(self, reason: str) -> None:
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            started = time.perf_counter()
+            self._kill()
+            try:
+                self._boot()
+                ok = True
+            except RuntimeError as exc:
+                reason, ok = f"{reason}; restart failed: {exc}", False
+            self.metrics.restarts.append({"reason": reason, "seconds": time.perf_counter() - started,
+                                          "ok": ok, "at": time.time()})
+            print(f"app server on :{self.port} restarted ({reason})", file=sys.stderr)
+
+    def _watch(self) -> None:
+        misses = 0
+        while not self._stopping.wait(WATCH_INTERVAL):
+            if len(self.metrics.restarts) >= MAX_RESTARTS:
+                return
+            proc = self._proc
+            if proc is not None and proc.poll() is not None:
+                self._restart(f"exited with {proc.returncode}")
+                misses = 0
+                continue
+            misses = 0 if self.healthy() else misses + 1
+            if misses >= UNHEALTHY_LIMIT:
+                self._restart(f"{misses} failed health probes")
+                misses = 0
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=WATCH_INTERVAL + 1)
+        with self._lock:
+            self._kill()
+        self.write_metrics()
+
+    def write_metrics(self, path: Path = METRICS_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _metrics_lock:
+            existing = json.loads(path.read_text()) if path.exists() else {}
+            existing[str(self.port)] = asdict(self.metrics)
+            path.write_text(json.dumps(existing, indent=2))
+
+    def summary(self) -> str:
+        m = self.metrics
+        if m.reused:
+            return f"app server on :{m.port} was already running (reused)"
+        parts = [f"healthy {m.health_seconds:.1f}s", f"ready {m.ready_seconds:.1f}s"]
+        if m.build_seconds is not None:
+            parts.insert(0, f"build {m.build_seconds:.1f}s")
+        if m.prewarm_seconds is not None:
+            parts.append(f"{m.prewarmed_tenants} tenants pre-warmed in {m.prewarm_seconds:.1f}s")
+        parts.append(f"{len(m.restarts)} restarts")
+        return f"app server on :{m.port}: " + ", ".join(parts)
+
+    def __enter__(self) -> "AppServer":
+        try:
+            return self.start()
+        except BaseException:
+            self.stop()
+            raise
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.server", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--cmd", default=DEFAULT_CMD, help="server command (default: %(default)s)")
+    parser.add_argument("--accounts", type=Path, metavar="FILE",
+                        help="JSON list of {username, password} whose tenants to pre-warm")
+    parser.add_argument("--no-build", action="store_true", help="do not build dist/ when it is missing")
+    args = parser.parse_args(argv)
+    with AppServer(args.port, args.cmd, args.accounts, build=not args.no_build) as server:
+        print(server.summary())
+        print(f"serving on {server.base_url}; Ctrl-C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
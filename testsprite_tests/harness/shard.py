@@ -0,0 +1,301 @@
+"""Split the suite across worker processes by historical duration.
+
+One Python process driving one Chromium tops out at a single core long
+before the context pool is exhausted.  ``python -m harness.shard -j 8``
+instead starts eight ``python -m harness`` workers, each with its own
+Chromium, and hands every worker a list of tests packed with
+longest-processing-time-first over the durations of the previous run
+(``artifacts/last_run.json``, falling back to the serial baseline).  Tests
+with no history are assumed to take the median known duration.
+
+Each worker ``i`` gets an isolated namespace:
+
+* ``TESTSPRITE_BASE_URL=http://localhost:<base-port + i>`` - with
+  ``--server-cmd`` the shard launcher starts one :class:`~harness.server.AppServer`
+  per port (``PORT`` is set for it, crashed servers are restarted),
+  otherwise the servers must already be up (every port is probed first and
+  the run stops if one does not answer);
+  ``--same-server`` points every worker at ``--base-url`` instead;
+* ``TESTSPRITE_NAMESPACE=w<i>`` - its own cached login file and the suffix
+  :func:`namespaced` appends to names a test creates (the API suite's
+  records and the text compiled flows type into create forms, see
+  :func:`harness.engine.namespace_step`);
+* optionally its own tenant login from ``--accounts FILE`` (a JSON list of
+  ``{"username": ..., "password": ...}``, one per worker), so write-heavy
+  tests such as ``TC008_Purchase_and_automatic_stock_management`` change a
+  different tenant's stock in every worker;
+* with ``--tenants`` (and ``--server-cmd``), its own throwaway database
+  cloned from a template snapshot (:mod:`harness.tenants`).  No worker sees
+  another's writes, and the database is dropped in the background as soon
+  as the worker is done.
+
+Worker reports land in ``artifacts/shards/`` and are merged into one
+``SuiteReport`` (mode ``sharded``) at ``artifacts/last_run.json``, which is
+also what the next run packs from.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .loader import DEFAULT_BASE_URL, TESTS_DIR, TestCase, discover
+from .runner import (
+    ARTIFACTS_DIR,
+    LAST_RUN_FILE,
+    SERIAL_BASELINE_FILE,
+    SuiteReport,
+    TestResult,
+    api_gate,
+    attach_serial_baseline,
+    print_report,
+    write_report,
+)
+from .server import AppServer, answers_health, ensure_build
+
+if TYPE_CHECKING:
+    from .tenants import TenantPool
+
+SHARDS_DIR = ARTIFACTS_DIR / "shards"
+DEFAULT_DURATION = 60.0
+
+
+def namespaced(value: str) -> str:
+    """Suffix ``value`` with this worker's namespace, if running sharded.
+
+    ``namespaced("Test Customer")`` -> ``"Test Customer w3"`` in worker 3 and
+    ``"Test Customer"`` in an unsharded run.
+    """
+    namespace = os.environ.get("TESTSPRITE_NAMESPACE")
+    return f"{value} {namespace}" if namespace else value
+
+
+def load_durations(*paths: Path) -> Dict[str, float]:
+    """``name -> duration`` from the first report that exists, later ones filling gaps."""
+    durations: Dict[str, float] = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        try:
+            report = json.loads(path.read_text())
+        except ValueError:
+            continue
+        for result in report.get("results", []):
+            durations.setdefault(result["name"], result["duration"])
+    return durations
+
+
+@dataclass
+class Shard:
+    index: int
+    tests: List[TestCase] = field(default_factory=list)
+    planned: float = 0.0
+
+
+def plan_shards(tests: Sequence[TestCase], durations: Dict[str, float], workers: int) -> List[Shard]:
+    """Longest-processing-time-first packing of ``tests`` into ``workers`` shards.
+
+    Always within 4/3 of the optimal makespan; in practice near-perfect for
+    a few dozen tests of similar length.
+    """
+    known = [durations[t.name] for t in tests if t.name in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    shards = [Shard(i) for i in range(max(1, min(workers, len(tests))))]
+    for test in sorted(tests, key=lambda t: durations.get(t.name, fallback), reverse=True):
+        target = min(shards, key=lambda s: s.planned)
+        target.tests.append(test)
+        target.planned += durations.get(test.name, fallback)
+    return shards
+
+
+def _worker_env(shard: Shard, args: argparse.Namespace, accounts: List[dict]) -> Dict[str, str]:
+    env = dict(os.environ, TESTSPRITE_WORKER=str(shard.index), TESTSPRITE_NAMESPACE=f"w{shard.index}")
+    if args.same_server:
+        env["TESTSPRITE_BASE_URL"] = args.base_url
+    else:
+        env["TESTSPRITE_BASE_URL"] = f"http://localhost:{args.base_port + shard.index}"
+    if accounts:
+        account = accounts[shard.index % len(accounts)]
+        env["TESTSPRITE_USERNAME"] = account["username"]
+        env["TESTSPRITE_PASSWORD"] = account["password"]
+    return env
+
+
+def merge_reports(shards: Sequence[Shard], wall_time: float) -> SuiteReport:
+    """Combine the worker reports; missing ones count as errors for their tests."""
+    results: List[TestResult] = []
+    launch = 0.0
+    for shard in shards:
+        path = SHARDS_DIR / f"shard-{shard.index}.json"
+        data = json.loads(path.read_text()) if path.exists() else None
+        if data is None:
+            results.extend(TestResult(t.name, t.test_id, "error", 0.0, "shard produced no report")
+                           for t in shard.tests)
+            continue
+        launch = max(launch, data.get("launch_seconds", 0.0))
+        results.extend(TestResult(**r) for r in data["results"])
+    return SuiteReport(mode="sharded", wall_time=wall_time, results=results, launch_seconds=launch)
+
+
+def run_shards(shards: Sequence[Shard], args: argparse.Namespace,
+               tenants: Optional["TenantPool"] = None) -> SuiteReport:
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    accounts = json.loads(args.accounts.read_text()) if args.accounts else []
+    servers: List[AppServer] = []
+    workers: List[subprocess.Popen] = []
+    try:
+        envs = [_worker_env(shard, args, accounts) for shard in shards]
+        if tenants is not None:
+            for tenant, env in zip(tenants.tenants, envs):
+                env["MONGODB_URI"] = tenant.uri
+        if args.server_cmd and not args.same_server:
+            ensure_build()
+            servers = [AppServer(args.base_port + shard.index, args.server_cmd, env=env, build=False)
+                       for shard, env in zip(shards, envs)]
+            with ThreadPoolExecutor(len(servers)) as pool:
+                list(pool.map(AppServer.start, servers))
+            for server in servers:
+                print(server.summary())
+
+        started = time.perf_counter()
+        for shard, env in zip(shards, envs):
+            names = SHARDS_DIR / f"shard-{shard.index}.txt"
+            names.write_text("\n".join(t.name for t in shard.tests) + "\n")
+            report = SHARDS_DIR / f"shard-{shard.index}.json"
+            if report.exists():
+                report.unlink()
+            cmd = [sys.executable, "-m", "harness", "--tests-from", str(names),
+                   "--report", str(report), "--max-contexts", str(args.max_contexts),
+                   "--timeout", str(args.timeout), "--base-url", env["TESTSPRITE_BASE_URL"]]
+            cmd += args.worker_args
+            workers.append(subprocess.Popen(
+                cmd, cwd=TESTS_DIR, env=env,
+                stdout=subprocess.DEVNULL if not args.verbose else None,
+            ))
+        for index, worker in enumerate(workers):
+            worker.wait()
+            if tenants is not None:
+                # Its server goes first, then the database, while the others run on.
+                servers[index].stop()
+                tenants.release(tenants.tenants[index])
+        wall = time.perf_counter() - started
+    finally:
+        for proc in workers:
+            if proc.poll() is None:
+                proc.terminate()
+        for server in servers:
+            server.stop()
+    return merge_reports(shards, wall)
+
+
+def print_shards(shards: Sequence[Shard], report: SuiteReport) -> None:
+    actual = {r.name: r.duration for r in report.results}
+    print(f"{'shard':<7}{'tests':>6}{'planned s':>11}{'actual s':>10}")
+    for shard in shards:
+        ran = sum(actual.get(t.name, 0.0) for t in shard.tests)
+        print(f"w{shard.index:<6}{len(shard.tests):>6}{shard.planned:>11.1f}{ran:>10.1f}")
+    busy = sum(actual.values())
+    if report.wall_time:
+        efficiency = busy / (report.wall_time * len(shards))
+        print(f"test time {busy:.1f}s over {len(shards)} workers in {report.wall_time:.1f}s "
+              f"({efficiency:.0%} parallel efficiency)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness.shard", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("-k", dest="select", action="append",
+                        help="only run files whose name contains this (repeatable)")
+    parser.add_argument("--base-port", type=int, default=5000,
+                        help="worker i talks to http://localhost:<base-port + i> (default: 5000)")
+    parser.add_argument("--server-cmd", metavar="CMD",
+                        help="start one app server per worker with PORT set, "
+                             "e.g. 'npx tsx server/production.ts'")
+    parser.add_argument("--same-server", action="store_true",
+                        help="point every worker at --base-url instead of one port each")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--accounts", type=Path, metavar="FILE",
+                        help="JSON list of {username, password}, one tenant login per worker")
+    parser.add_argument("--tenants", nargs="?", const=True, metavar="MONGODB_URI",
+                        help="give every worker its own database cloned from a template snapshot "
+                             "(needs --server-cmd; default URI: the server's MONGODB_URI)")
+    parser.add_argument("--template-db", default="testsprite_template",
+                        help="with --tenants: database holding the template snapshot")
+    parser.add_argument("--refresh-template", action="store_true",
+                        help="with --tenants: re-take the template from the app's database")
+    parser.add_argument("--keep-tenants", action="store_true",
+                        help="with --tenants: leave the worker databases for inspection")
+    parser.add_argument("--max-contexts", type=int, default=4,
+                        help="context pool size inside each worker (default: 4)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--plan", action="store_true", help="print the packing and exit")
+    parser.add_argument("--api-gate", action="store_true",
+                        help="run harness.apisuite against --base-url once before starting the workers")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show worker output")
+    parser.add_argument("worker_args", nargs=argparse.REMAINDER,
+                        help="extra flags after -- are passed to every worker (e.g. -- --perf)")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.tenants and (not args.server_cmd or args.same_server):
+        parser.error("--tenants needs one server per worker: pass --server-cmd, not --same-server")
+    if args.worker_args[:1] == ["--"]:
+        args.worker_args = args.worker_args[1:]
+    tests = discover(select=args.select)
+    if not tests:
+        print("no tests selected", file=sys.stderr)
+        return 2
+
+    durations = load_durations(LAST_RUN_FILE, SERIAL_BASELINE_FILE)
+    shards = plan_shards(tests, durations, args.workers)
+    if args.plan:
+        for shard in shards:
+            print(f"w{shard.index}  {shard.planned:7.1f}s  " + " ".join(t.test_id for t in shard.tests))
+        return 0
+
+    if not args.server_cmd and not args.same_server:
+        urls = [f"http://localhost:{args.base_port + shard.index}" for shard in shards]
+        down = [url for url in urls if not answers_health(url)]
+        if down:
+            print(f"no app server answers /api/health at {', '.join(down)}; start one per worker port, "
+                  "pass --server-cmd to have them started, or --same-server to share --base-url",
+                  file=sys.stderr)
+            return 2
+    if args.api_gate and not api_gate(args.base_url):
+        return 1
+    tenants = None
+    if args.tenants:
+        from .tenants import TenantPool
+
+        tenants = TenantPool(args.tenants if isinstance(args.tenants, str) else None, args.template_db,
+                             refresh=args.refresh_template, keep=args.keep_tenants)
+        tenants.provision(len(shards))
+        print(tenants.summary())
+    try:
+        report = run_shards(shards, args, tenants)
+        attach_serial_baseline(report)
+        print_report(report)
+        print_shards(shards, report)
+        write_report(report, LAST_RUN_FILE)
+    finally:
+        if tenants is not None:
+            tenants.close()
+    return 0 if report.counts()["passed"] == len(report.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
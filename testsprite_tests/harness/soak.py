@@ -0,0 +1,387 @@
+"""Hours-long soak run that watches the server for memory and handle leaks.
+
+Suspects this is meant to catch:
+
+* ``server/index.ts`` arms a 30 s soft-timeout timer per request;
+* ``attachTenantDb`` races every tenant lookup against a 30 s
+  ``setTimeout`` that is never cleared, so each request keeps a timer and
+  its closure alive for 30 s after it has answered;
+* ``services/db-connection-manager.ts`` caches a ``pg.Pool`` per tenant
+  and never evicts one.
+
+Virtual users (as in :mod:`harness.load`, each with its own cookie jar)
+loop over a weighted mix of dashboard renders, report/list calls and fresh
+logins until ``--duration`` is up.  Every ``--interval`` seconds a sampler
+records:
+
+* RSS of the server's process tree and its established connections to
+  PostgreSQL (5432) and MongoDB (27017), read from ``/proc``;
+* ``/api/health`` latency and the interval's request count, errors and p95;
+* when the server runs with ``RUNTIME_METRICS=1``, ``/api/runtime-metrics``
+  (``server/runtime-metrics.ts``): V8 heap, active handles by type,
+  event-loop delay, pg pool sizes and the Mongo driver pool.
+
+Samples stream to ``artifacts/soak/samples.jsonl``.  After discarding the
+first ``--warmup`` fraction, each series gets a Mann-Kendall trend test and
+a Theil-Sen slope; a series is flagged as growing when the trend is
+significant (p < :data:`ALPHA`), consistent (tau >= :data:`MIN_TAU`) and
+the fitted line rises by at least :data:`MIN_GROWTH` over the run::
+
+    RUNTIME_METRICS=1 npm run dev &
+    python -m harness.soak --duration 4h --users 20 --pid "$(pgrep -f 'server/index.ts')"
+    python -m harness.soak --server --duration 2h --fail-on-growth
+
+The verdicts go to ``artifacts/soak/report.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from .auth import DEFAULT_PASSWORD, DEFAULT_USERNAME
+from .load import LOGIN_PATH, dashboard_requests
+from .loader import DEFAULT_BASE_URL, TESTS_DIR
+from .server import AppServer, process_tree, tree_rss
+from .stats import mann_kendall, percentile, theil_sen
+
+SOAK_DIR = TESTS_DIR / "artifacts" / "soak"
+SAMPLES_FILE = SOAK_DIR / "samples.jsonl"
+REPORT_FILE = SOAK_DIR / "report.json"
+METRICS_PATH = "/api/runtime-metrics"
+DB_PORTS = {"postgres": 5432, "mongo": 27017}
+
+ALPHA = 0.01
+MIN_TAU = 0.3
+MIN_GROWTH = 0.05
+MIN_SAMPLES = 10
+# Bookkeeping columns, not server state.
+NOT_TRENDED = {"t", "requests", "errors"}
+
+
+@dataclass
+class SoakConfig:
+    base_url: str = DEFAULT_BASE_URL
+    users: int = 10
+    duration: float = 3600.0  # seconds
+    interval: float = 30.0  # seconds between samples
+    think_time: float = 1.0
+    warmup: float = 0.1  # fraction of samples ignored by the trend tests
+    pid: Optional[int] = None
+    request_timeout: float = 35.0
+    username: str = DEFAULT_USERNAME
+    password: str = DEFAULT_PASSWORD
+    seed: Optional[int] = None
+
+
+def workload(today: Optional[dt.date] = None) -> List[Tuple[float, str, List[str]]]:
+    """``(weight, action, urls)``; ``login`` starts a new session."""
+    day = (today or dt.date.today()).isoformat()
+    return [
+        (6.0, "dashboard", [url for _, url in dashboard_requests(today)]),
+        (1.0, "reports", ["/api/reports/vendor-transactions", "/api/reports/receivables-payables"]),
+        (1.0, "lists", [f"/api/sale-entries?from={day}&to={day}", f"/api/tank-daily-readings?date={day}",
+                        "/api/credit-requests", "/api/employees"]),
+        (1.0, "login", []),
+    ]
+
+
+# -- server-side probes ------------------------------------------------------
+
+_ESTABLISHED = "01"
+
+
+def db_connections(pid: int) -> Dict[str, int]:
+    """Established TCP connections from the server's process tree, per database port."""
+    inodes = set()
+    for member in process_tree(pid):
+        fd_dir = Path(f"/proc/{member}/fd")
+        try:
+            for fd in fd_dir.iterdir():
+                try:
+                    target = os.readlink(fd)
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    inodes.add(target[8:-1])
+        except OSError:
+            continue
+    counts = {name: 0 for name in DB_PORTS}
+    ports = {port: name for name, port in DB_PORTS.items()}
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            lines = Path(table).read_text().splitlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            # sl local_address rem_address st tx:rx tr:when retrnsmt uid timeout inode
+            fields = line.split()
+            if len(fields) < 10 or fields[3] != _ESTABLISHED or fields[9] not in inodes:
+                continue
+            name = ports.get(int(fields[2].rsplit(":", 1)[1], 16))
+            if name:
+                counts[name] += 1
+    return counts
+
+
+def _flatten(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """The ``/api/runtime-metrics`` body as flat sample columns, in MiB where sizes."""
+    mib = 1024 * 1024
+    row: Dict[str, float] = {}
+    memory, heap = metrics.get("memory", {}), metrics.get("heap", {})
+    for key in ("heapUsed", "heapTotal", "external", "arrayBuffers"):
+        if key in memory:
+            row[f"{key}_mb"] = memory[key] / mib
+    if "detachedContexts" in heap:
+        row["detached_contexts"] = heap["detachedContexts"]
+    handles = metrics.get("handles", {})
+    row["handles_total"] = sum(handles.values())
+    for kind, count in handles.items():
+        row[f"handles_{kind}"] = count
+    for key, value in metrics.get("eventLoop", {}).items():
+        row[f"loop_{key}"] = value
+    for key, value in metrics.get("postgres", {}).items():
+        if value is not None:
+            row[f"pg_{key}"] = value
+    for key in ("connections", "open", "checkedOut"):
+        if key in metrics.get("mongo", {}):
+            row[f"mongo_{key}"] = metrics["mongo"][key]
+    return row
+
+
+# -- run ---------------------------------------------------------------------
+
+@dataclass
+class Trend:
+    metric: str
+    samples: int
+    first: float
+    last: float
+    slope_per_hour: float
+    growth: float  # fitted rise over the analysed window, relative to its start
+    tau: float
+    p_value: float
+    growing: bool
+
+
+@dataclass
+class SoakResult:
+    config: SoakConfig
+    elapsed: float = 0.0
+    samples: List[Dict[str, float]] = field(default_factory=list)
+    trends: List[Trend] = field(default_factory=list)
+
+    @property
+    def growing(self) -> List[Trend]:
+        return [t for t in self.trends if t.growing]
+
+    def to_dict(self) -> dict:
+        return {
+            "config": asdict(self.config),
+            "elapsed": self.elapsed,
+            "samples": len(self.samples),
+            "requests": sum(s.get("requests", 0) for s in self.samples),
+            "errors": sum(s.get("errors", 0) for s in self.samples),
+            "growing": [t.metric for t in self.growing],
+            "trends": [asdict(t) for t in self.trends],
+        }
+
+
+class _Window:
+    """Latencies and errors since the sampler last looked."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def drain(self) -> Tuple[List[float], int]:
+        latencies, errors = self.latencies, self.errors
+        self.latencies, self.errors = [], 0
+        return latencies, errors
+
+
+async def _request(client: httpx.AsyncClient, window: _Window, method: str, url: str,
+                   **kwargs: Any) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        await response.aread()
+    except httpx.HTTPError:
+        window.errors += 1
+        return None
+    window.latencies.append(time.perf_counter() - started)
+    if response.status_code >= 400:
+        window.errors += 1
+    return response
+
+
+async def _user(config: SoakConfig, window: _Window, deadline: float, rng: random.Random) -> None:
+    actions = workload()
+    weights = [w for w, _, _ in actions]
+    client: Optional[httpx.AsyncClient] = None
+    try:
+        while time.monotonic() < deadline:
+            _, action, urls = rng.choices(actions, weights)[0]
+            if client is None or action == "login":
+                if client is not None:
+                    await client.aclose()
+                client = httpx.AsyncClient(base_url=config.base_url, timeout=config.request_timeout)
+                await _request(client, window, "POST", LOGIN_PATH,
+                               json={"email": config.username, "password": config.password})
+            if urls:
+                await asyncio.gather(*(_request(client, window, "GET", url) for url in urls))
+            if config.think_time > 0:
+                await asyncio.sleep(rng.expovariate(1 / config.think_time))
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
+async def _sample(config: SoakConfig, probe: httpx.AsyncClient, window: _Window,
+                  started: float) -> Dict[str, float]:
+    row: Dict[str, float] = {"t": round(time.monotonic() - started, 1)}
+    latencies, errors = window.drain()
+    row["requests"], row["errors"] = len(latencies) + errors, errors
+    if latencies:
+        row["p95_ms"] = percentile(sorted(latencies), 95) * 1000
+    health_started = time.perf_counter()
+    try:
+        if (await probe.get("/api/health")).status_code == 200:
+            row["health_ms"] = (time.perf_counter() - health_started) * 1000
+        response = await probe.get(METRICS_PATH)
+        if response.status_code == 200:
+            row.update(_flatten(response.json()))
+    except httpx.HTTPError:
+        pass
+    if config.pid:
+        rss = tree_rss(config.pid)
+        if rss is not None:
+            row["rss_mb"] = rss / 1024 / 1024
+        for name, count in db_connections(config.pid).items():
+            row[f"conns_{name}"] = count
+    return row
+
+
+async def run_soak(config: SoakConfig, samples_file: Path = SAMPLES_FILE) -> SoakResult:
+    """Drive the workload for ``config.duration`` seconds, sampling as it goes."""
+    result = SoakResult(config)
+    rng = random.Random(config.seed)
+    window = _Window()
+    started = time.monotonic()
+    deadline = started + config.duration
+    samples_file.parent.mkdir(parents=True, exist_ok=True)
+    users = [asyncio.create_task(_user(config, window, deadline, random.Random(rng.random())))
+             for _ in range(config.users)]
+    async with httpx.AsyncClient(base_url=config.base_url, timeout=config.request_timeout) as probe:
+        with samples_file.open("w", encoding="utf-8") as out:
+            while True:
+                row = await _sample(config, probe, window, started)
+                result.samples.append(row)
+                out.write(json.dumps(row) + "\n")
+                out.flush()
+                if time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(min(config.interval, max(0.0, deadline - time.monotonic())))
+    await asyncio.gather(*users)
+    result.elapsed = time.monotonic() - started
+    result.trends = trends(result.samples, config.warmup)
+    return result
+
+
+def trends(samples: Sequence[Dict[str, float]], warmup: float = 0.1) -> List[Trend]:
+    """Trend verdict per sampled series, growing ones first."""
+    kept = list(samples[int(len(samples) * warmup):])
+    metrics = sorted({k for s in kept for k in s} - NOT_TRENDED)
+    rows: List[Trend] = []
+    for metric in metrics:
+        points = [(s["t"], s[metric]) for s in kept if metric in s]
+        if len(points) < MIN_SAMPLES:
+            continue
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        tau, p_value = mann_kendall(ys)
+        slope, intercept = theil_sen(xs, ys)
+        start, end = intercept + slope * xs[0], intercept + slope * xs[-1]
+        growth = (end - start) / abs(start) if start else (end - start)
+        rows.append(Trend(metric, len(points), ys[0], ys[-1], slope * 3600, growth, tau, p_value,
+                          p_value < ALPHA and tau >= MIN_TAU and growth >= MIN_GROWTH))
+    rows.sort(key=lambda t: (not t.growing, -t.tau if t.tau == t.tau else 0.0))
+    return rows
+
+
+def print_trends(result: SoakResult) -> None:
+    print(f"{'metric':<28}{'n':>5}{'first':>11}{'last':>11}{'per hour':>11}{'growth':>9}"
+          f"{'tau':>7}{'p':>8}  verdict")
+    for t in result.trends:
+        print(f"{t.metric:<28}{t.samples:>5}{t.first:>11.2f}{t.last:>11.2f}{t.slope_per_hour:>+11.2f}"
+              f"{t.growth:>+9.0%}{t.tau:>7.2f}{t.p_value:>8.3f}  {'GROWING' if t.growing else 'flat'}")
+    summary = result.to_dict()
+    print(f"{summary['samples']} samples over {result.elapsed / 3600:.2f} h, "
+          f"{summary['requests']} requests ({summary['errors']} errors); "
+          f"{len(result.growing)} series growing")
+
+
+def write_report(result: SoakResult, path: Path = REPORT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result.to_dict(), indent=2))
+
+
+def parse_duration(value: str) -> float:
+    """``"4h"``, ``"90m"``, ``"45s"`` or plain seconds."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([hms]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"bad duration {value!r}")
+    return float(match.group(1)) * {"h": 3600, "m": 60, "s": 1, "": 1}[match.group(2)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.soak", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--duration", type=parse_duration, default=3600.0, help="e.g. 4h, 90m (default 1h)")
+    parser.add_argument("--interval", type=parse_duration, default=30.0, help="sampling period (default 30s)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of samples to ignore")
+    parser.add_argument("--pid", type=int, help="server process to read RSS and sockets from")
+    parser.add_argument("--server", nargs="?", const=True, metavar="CMD",
+                        help="start the app server (RUNTIME_METRICS=1) for the run, optionally with CMD")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--fail-on-growth", action="store_true", help="exit 1 when any series is growing")
+    args = parser.parse_args(argv)
+
+    config = SoakConfig(base_url=args.base_url, users=args.users, duration=args.duration,
+                        interval=args.interval, think_time=args.think_time, warmup=args.warmup,
+                        pid=args.pid, seed=args.seed)
+    server: Optional[AppServer] = None
+    if args.server:
+        port = urlparse(config.base_url).port or 80
+        kwargs = {} if args.server is True else {"cmd": args.server}
+        # A restart would reset every series; let the run fail visibly instead.
+        server = AppServer(port, env={"RUNTIME_METRICS": "1"}, watch=False, **kwargs).start()
+        config.pid = config.pid or server.pid
+    try:
+        result = asyncio.run(run_soak(config))
+    finally:
+        if server is not None:
+            server.stop()
+    write_report(result)
+    print_trends(result)
+    print(f"samples in {SAMPLES_FILE}, report in {REPORT_FILE}")
+    return 1 if args.fail_on_growth and result.growing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Small statistics helpers shared by the harness reports."""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of already-sorted values (``q`` in 0-100)."""
+    if not sorted_values:
+        return math.nan
+    rank = (len(sorted_values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def mann_whitney_greater(baseline: Sequence[float], current: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U p-value for "``current`` tends to be larger".
+
+    Normal approximation with tie and continuity correction; good enough for
+    the handful-to-thousands of samples the harness compares.
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return math.nan
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    rank_sum, tie_term, i = 0.0, 0.0, 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        ties = j - i + 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for _, group in combined[i:j + 1] if group == 1)
+        tie_term += ties ** 3 - ties
+        i = j + 1
+    n = n1 + n2
+    u = rank_sum - n2 * (n2 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_kendall(values: Sequence[float]) -> tuple:
+    """Mann-Kendall trend test: ``(tau, two-sided p)`` for a time-ordered series.
+
+    ``tau`` near +1 means the series almost only goes up.  Normal
+    approximation with tie correction, fine from about ten samples.
+    """
+    n = len(values)
+    if n < 3:
+        return math.nan, math.nan
+    s = 0
+    for i in range(n - 1):
+        vi = values[i]
+        for vj in values[i + 1:]:
+            s += (vj > vi) - (vj < vi)
+    counts: dict = {}
+    for v in values:
+        counts[v] = counts.get(v, 0) + 1
+    tie_term = sum(t * (t - 1) * (2 * t + 5) for t in counts.values() if t > 1)
+    variance = (n * (n - 1) * (2 * n + 5) - tie_term) / 18
+    pairs = n * (n - 1) / 2
+    tau = s / pairs
+    if variance <= 0:
+        return tau, 1.0
+    z = (s - math.copysign(1, s)) / math.sqrt(variance) if s else 0.0
+    return tau, math.erfc(abs(z) / math.sqrt(2))
+
+
+def theil_sen(xs: Sequence[float], ys: Sequence[float]) -> tuple:
+    """Robust line fit: ``(slope, intercept)`` from the median pairwise slope."""
+    slopes = sorted((ys[j] - ys[i]) / (xs[j] - xs[i])
+                    for i in range(len(xs)) for j in range(i + 1, len(xs)) if xs[j] != xs[i])
+    if not slopes:
+        return math.nan, math.nan
+    slope = percentile(slopes, 50)
+    intercept = percentile(sorted(y - slope * x for x, y in zip(xs, ys)), 50)
+    return slope, intercept
@@ -0,0 +1,570 @@
+"""Synthetic petrol-pump data at production scale.
+
+``db_dump.json`` holds five documents per collection, which hides every
+per-row cost in the routes.  :func:`generate` builds one tenant's worth of
+referentially consistent data with vectorized NumPy sampling:
+
+* fuel products with a daily rate random walk (``openRate`` of a day is the
+  previous ``closeRate``), tanks and nozzles wired to them, duty shifts and
+  employees;
+* one sale entry per nozzle, shift and day, whose meter readings are a
+  running total per nozzle (``openingReading`` of a shift is the previous
+  ``closingReading``) and whose amounts use that day's rate;
+* tank daily readings that balance: opening stock is the previous day's
+  closing, metered sales are the sum over the tank's nozzles, and tanker
+  deliveries (also emitted as tanker sales) arrive on a schedule sized to
+  the coming consumption;
+* guest sales, credit customers and recoveries with Poisson daily counts.
+
+The default scale is 50 nozzles x 3 shifts x 3 years (164,250 sale entries).
+Data is held column-wise and only turned into documents on export:
+
+    data = generate(SynthConfig(days=365, seed=7))
+    data.load_mongo("mongodb://localhost:27017", "bench_tenant")   # insertMany
+    data.load_postgres("postgresql://localhost/bench")               # COPY
+    store = Store(data.to_collections())                             # harness.mockapi
+
+Performance tests share datasets through :func:`cached`, which keeps each
+preset in ``artifacts/synth/`` so it is generated once per seed.
+
+``python -m harness.synth --scale large --mongo URI --db NAME`` loads from the
+command line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .loader import TESTS_DIR
+
+SYNTH_DIR = TESTS_DIR / "artifacts" / "synth"
+DELIVERY_LOT = 4000.0  # litres per tanker compartment
+CHUNK = 10_000
+
+PRODUCTS = [
+    # name, short name, base price per litre
+    ("Motor Spirit", "MS", 102.0),
+    ("High Speed Diesel", "HSD", 89.0),
+    ("Xtra Premium", "XP", 110.0),
+    ("Xtra Green", "XG", 92.0),
+]
+SHIFTS = [("S-1", "06:00", "14:00", 1.0), ("S-2", "14:00", "22:00", 1.2), ("S-3", "22:00", "06:00", 0.4)]
+FIRST_NAMES = np.array(["Ravi", "Amit", "Suresh", "Priya", "Anil", "Deepak", "Kavita", "Manoj",
+                        "Sunita", "Rajesh", "Pooja", "Vikram", "Neha", "Sanjay", "Arjun", "Meena"])
+LAST_NAMES = np.array(["Kumar", "Sharma", "Singh", "Patel", "Reddy", "Nair", "Gupta", "Das",
+                       "Joshi", "Iyer", "Verma", "Rao"])
+ORG_WORDS = np.array(["Sri", "Balaji", "Krishna", "Ganesh", "Metro", "City", "Royal", "National",
+                      "Express", "Coastal", "Highway", "Green"])
+ORG_KINDS = np.array(["Transport", "Logistics", "Cargo", "Travels", "Carriers", "Roadways", "Movers"])
+PAYMENT_MODES = np.array(["Cash", "UPI", "Card"])
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"nozzles": 8, "days": 30, "credit_customers": 20, "employees": 10},
+    "medium": {"nozzles": 20, "days": 365, "credit_customers": 100, "employees": 20},
+    "large": {"nozzles": 50, "days": 3 * 365, "credit_customers": 500, "employees": 40},
+}
+
+
+@dataclass
+class SynthConfig:
+    nozzles: int = 50
+    shifts: int = 3
+    days: int = 3 * 365
+    end_date: dt.date = field(default_factory=lambda: dt.date(2026, 1, 1))
+    products: int = 3
+    nozzles_per_tank: int = 4
+    employees: int = 40
+    credit_customers: int = 500
+    guest_sales_per_day: float = 40.0
+    recoveries_per_day: float = 6.0
+    delivery_interval: int = 3  # days between tanker deliveries per tank
+    seed: int = 0
+
+    @classmethod
+    def preset(cls, scale: str, **overrides: Any) -> "SynthConfig":
+        return cls(**{**SCALES[scale], **overrides})
+
+    @property
+    def start_date(self) -> dt.date:
+        return self.end_date - dt.timedelta(days=self.days - 1)
+
+    def key(self) -> str:
+        payload = json.dumps(asdict(self), default=str, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+@dataclass
+class Table:
+    """One collection, column-wise.  Date columns are ``datetime64[D]``."""
+
+    collection: str  # mongoose collection name
+    columns: Dict[str, np.ndarray]
+    pg_table: Optional[str] = None
+    pg_columns: Dict[str, str] = field(default_factory=dict)  # camelCase -> column
+    string_dates: Tuple[str, ...] = ()  # stored as "YYYY-MM-DD" strings in Mongo
+    object_ids: Tuple[str, ...] = ()  # hex strings stored as ObjectId in Mongo
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def rows(self, columns: Optional[Sequence[str]] = None) -> Iterator[tuple]:
+        names = list(columns or self.columns)
+        return zip(*(self.columns[n].tolist() for n in names))
+
+    def documents(self, dates: str = "datetime") -> Iterator[Dict[str, Any]]:
+        """Mongo-shaped documents; ``dates`` is ``"datetime"`` or ``"iso"``."""
+        names = list(self.columns)
+        for values in self.rows(names):
+            doc = {}
+            for name, value in zip(names, values):
+                if isinstance(value, dt.datetime):
+                    if dates == "iso":
+                        value = value.isoformat(timespec="milliseconds") + "Z"
+                elif isinstance(value, dt.date):
+                    if name in self.string_dates:
+                        value = value.isoformat()
+                    elif dates == "iso":
+                        value = f"{value.isoformat()}T00:00:00.000Z"
+                    else:
+                        value = dt.datetime(value.year, value.month, value.day)
+                doc["_id" if name == "id" else name] = value
+            yield doc
+
+
+@dataclass
+class Dataset:
+    config: SynthConfig
+    tenant: Dict[str, Any]
+    tables: Dict[str, Table]
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(table) for name, table in self.tables.items()}
+
+    def to_collections(self) -> Dict[str, List[dict]]:
+        """JSON-ready documents keyed by collection, as ``harness.mockapi.Store`` takes."""
+        collections = {t.collection: list(t.documents(dates="iso")) for t in self.tables.values()}
+        collections["tenants"] = [dict(self.tenant, createdAt=self.tenant["createdAt"].isoformat() + "Z")]
+        return collections
+
+    def load_mongo(self, uri: str, database: str, master_db: Optional[str] = None,
+                   drop: bool = True) -> Dict[str, float]:
+        """``insert_many`` every table in :data:`CHUNK`-sized unordered batches.
+
+        With ``master_db`` the tenant is also registered there, pointing at
+        ``database``, the way tenant provisioning does.
+        """
+        from bson import ObjectId
+        from pymongo import MongoClient
+
+        seconds: Dict[str, float] = {}
+        with MongoClient(uri) as client:
+            db = client[database]
+            for table in self.tables.values():
+                started = time.perf_counter()
+                collection = db[table.collection]
+                if drop:
+                    collection.drop()
+                batch: List[dict] = []
+                for doc in table.documents():
+                    for name in table.object_ids:
+                        key = "_id" if name == "id" else name
+                        doc[key] = ObjectId(doc[key])
+                    batch.append(doc)
+                    if len(batch) == CHUNK:
+                        collection.insert_many(batch, ordered=False)
+                        batch = []
+                if batch:
+                    collection.insert_many(batch, ordered=False)
+                seconds[table.collection] = time.perf_counter() - started
+            if master_db:
+                tenant = dict(self.tenant, _id=ObjectId(self.tenant["_id"]), tenantDbName=database)
+                client[master_db]["tenants"].replace_one({"_id": tenant["_id"]}, tenant, upsert=True)
+        return seconds
+
+    def load_postgres(self, dsn: str, truncate: bool = True) -> Dict[str, float]:
+        """``COPY ... FROM STDIN`` into the Drizzle tables, in dependency order, one transaction."""
+        import psycopg
+
+        seconds: Dict[str, float] = {}
+        tables = [t for t in self.tables.values() if t.pg_table]
+        with psycopg.connect(dsn) as conn, conn.cursor() as cur:
+            if truncate:
+                cur.execute("TRUNCATE " + ", ".join(t.pg_table for t in reversed(tables)) + " CASCADE")
+            for table in tables:
+                started = time.perf_counter()
+                fields = list(table.pg_columns)
+                columns = ", ".join(table.pg_columns[f] for f in fields)
+                with cur.copy(f"COPY {table.pg_table} ({columns}) FROM STDIN") as copy:
+                    for row in table.rows(fields):
+                        copy.write_row(row)
+                seconds[table.pg_table] = time.perf_counter() - started
+        return seconds
+
+
+def _uuids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """``n`` RFC 4122 version-4 UUID strings, reproducible from ``rng``."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    hexes = [bytes(row).hex() for row in raw]
+    return np.array([f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}" for h in hexes])
+
+
+def _names(rng: np.random.Generator, first: np.ndarray, last: np.ndarray, n: int) -> np.ndarray:
+    return np.char.add(np.char.add(rng.choice(first, n), " "), rng.choice(last, n))
+
+
+def _phones(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.integers(6_000_000_000, 9_999_999_999, n).astype(str)
+
+
+def _stamp(dates: np.ndarray) -> np.ndarray:
+    """``createdAt`` values: the business date itself, as ``datetime64[D]``."""
+    return dates.astype("datetime64[D]")
+
+
+def _pg(*names: str) -> Dict[str, str]:
+    return {name: "".join("_" + c.lower() if c.isupper() else c for c in name) for name in names}
+
+
+def generate(config: SynthConfig = SynthConfig(), tenant_index: int = 0) -> Dataset:
+    """Build one tenant's dataset.  Same ``config`` and index, same data."""
+    rng = np.random.default_rng([config.seed, tenant_index])
+    days = np.arange(np.datetime64(config.start_date), np.datetime64(config.end_date) + 1)
+    n_days, n_shifts = len(days), config.shifts
+    tenant_id = rng.integers(0, 256, 12, dtype=np.uint8).tobytes().hex()
+    tables: Dict[str, Table] = {}
+
+    # -- fuel products and their daily rates ----------------------------------
+    n_products = min(config.products, len(PRODUCTS))
+    product_ids = _uuids(rng, n_products)
+    base_price = np.array([p[2] for p in PRODUCTS[:n_products]])
+    tables["fuel_products"] = Table("fuelproducts", {
+        "id": product_ids,
+        "tenantId": np.full(n_products, tenant_id),
+        "productName": np.array([p[0] for p in PRODUCTS[:n_products]]),
+        "shortName": np.array([p[1] for p in PRODUCTS[:n_products]]),
+        "gstPercentage": np.zeros(n_products),
+        "tdsPercentage": np.zeros(n_products),
+        "wgtPercentage": np.zeros(n_products),
+        "lfrn": np.full(n_products, "0"),
+        "isActive": np.ones(n_products, dtype=bool),
+        "createdAt": np.full(n_products, days[0]),
+    }, "fuel_products", _pg("id", "productName", "shortName", "gstPercentage", "tdsPercentage",
+                            "wgtPercentage", "lfrn", "isActive", "createdAt"))
+
+    steps = rng.normal(0.0, 0.15, size=(n_products, n_days))
+    close = np.round(base_price[:, None] + np.cumsum(steps, axis=1), 2)  # (products, days)
+    open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    tables["daily_sale_rates"] = Table("dailysalerates", {
+        "id": _uuids(rng, n_products * n_days),
+        "rateDate": np.tile(days, n_products),
+        "fuelProductId": np.repeat(product_ids, n_days),
+        "openRate": open_.ravel(),
+        "closeRate": close.ravel(),
+        "variationAmount": np.round((close - open_).ravel(), 2),
+        "createdAt": _stamp(np.tile(days, n_products)),
+    }, "daily_sale_rates", _pg("id", "rateDate", "fuelProductId", "openRate", "closeRate",
+                               "variationAmount", "createdAt"))
+
+    # -- tanks, nozzles, shifts, employees ------------------------------------
+    n_tanks = max(n_products, -(-config.nozzles // config.nozzles_per_tank))
+    tank_ids = _uuids(rng, n_tanks)
+    tank_product = np.arange(n_tanks) % n_products
+    capacity = rng.choice([15000.0, 20000.0, 25000.0], n_tanks)
+    nozzle_ids = _uuids(rng, config.nozzles)
+    nozzle_tank = np.arange(config.nozzles) % n_tanks
+    nozzle_product = tank_product[nozzle_tank]
+    tables["nozzles"] = Table("nozzles", {
+        "id": nozzle_ids,
+        "nozzleNumber": np.char.add("N-", (np.arange(config.nozzles) + 1).astype(str)),
+        "pumpStation": np.char.add("P", (np.arange(config.nozzles) // 2 + 1).astype(str)),
+        "tankId": tank_ids[nozzle_tank],
+        "fuelProductId": product_ids[nozzle_product],
+        "isActive": np.ones(config.nozzles, dtype=bool),
+        "createdAt": np.full(config.nozzles, days[0]),
+    }, "nozzles", _pg("id", "nozzleNumber", "pumpStation", "tankId", "fuelProductId",
+                      "isActive", "createdAt"))
+
+    shift_spec = SHIFTS[:n_shifts]
+    shift_ids = _uuids(rng, n_shifts)
+    tables["duty_shifts"] = Table("dutyshifts", {
+        "id": shift_ids,
+        "shiftName": np.array([s[0] for s in shift_spec]),
+        "startTime": np.array([s[1] for s in shift_spec]),
+        "endTime": np.array([s[2] for s in shift_spec]),
+        "createdAt": np.full(n_shifts, days[0]),
+    }, "duty_shifts", _pg("id", "shiftName", "startTime", "endTime", "createdAt"))
+
+    n_emp = config.employees
+    employee_ids = _uuids(rng, n_emp)
+    tables["employees"] = Table("employees", {
+        "id": employee_ids,
+        "employeeName": _names(rng, FIRST_NAMES, LAST_NAMES, n_emp),
+        "employeeNumber": np.char.add("EMP", np.char.zfill((np.arange(n_emp) + 1).astype(str), 4)),
+        "mobileNumber": _phones(rng, n_emp),
+        "designation": rng.choice(np.array(["Pump Attendant", "Cashier", "Manager"]), n_emp,
+                                  p=[0.8, 0.15, 0.05]),
+        "salaryType": np.full(n_emp, "Per Month"),
+        "salary": rng.choice([12000.0, 15000.0, 18000.0, 25000.0], n_emp),
+        "joinDate": days[0] - rng.integers(0, 720, n_emp).astype("timedelta64[D]"),
+        "isActive": np.ones(n_emp, dtype=bool),
+        "createdAt": np.full(n_emp, days[0]),
+    }, "employees", _pg("id", "employeeName", "employeeNumber", "mobileNumber", "designation",
+                        "salaryType", "salary", "joinDate", "isActive", "createdAt"))
+
+    # -- sale entries: nozzle x day x shift -----------------------------------
+    # Litres per shift: nozzle popularity x shift weight x weekly cycle x noise.
+    popularity = rng.lognormal(0.0, 0.35, config.nozzles)
+    shift_weight = np.array([s[3] for s in shift_spec])
+    weekday = (days.astype("datetime64[D]").view("int64") - 4) % 7  # 0 = Monday
+    weekly = np.where(weekday >= 5, 1.15, 1.0)
+    mean = 180.0 * popularity[:, None, None] * weekly[None, :, None] * shift_weight[None, None, :]
+    qty = np.round(rng.gamma(4.0, mean / 4.0), 2)  # (nozzles, days, shifts)
+    test = np.where(rng.random(qty.shape) < 0.1, 5.0, 0.0)
+    dispensed = (qty + test).reshape(config.nozzles, -1)
+    start_reading = rng.uniform(10_000, 500_000, config.nozzles).round(2)
+    closing = np.round(start_reading[:, None] + np.cumsum(dispensed, axis=1), 2)
+    opening = np.concatenate([start_reading[:, None], closing[:, :-1]], axis=1)
+    price = close[nozzle_product][:, :, None].repeat(n_shifts, axis=2)  # day's closing rate
+
+    n_entries = qty.size
+    entry_day = np.broadcast_to(days[None, :, None], qty.shape).ravel()
+    entry_nozzle = np.broadcast_to(np.arange(config.nozzles)[:, None, None], qty.shape).ravel()
+    entry_shift = np.broadcast_to(np.arange(n_shifts)[None, None, :], qty.shape).ravel()
+    # createdAt orders shifts within a day, so (saleDate, createdAt) sorts like the UI.
+    created = entry_day.astype("datetime64[ms]") + (6 + 8 * entry_shift).astype("timedelta64[h]")
+    tables["sale_entries"] = Table("saleentries", {
+        "id": _uuids(rng, n_entries),
+        "saleDate": entry_day,
+        "shiftId": shift_ids[entry_shift],
+        "pumpStation": tables["nozzles"].columns["pumpStation"][entry_nozzle],
+        "nozzleId": nozzle_ids[entry_nozzle],
+        "fuelProductId": product_ids[nozzle_product[entry_nozzle]],
+        "tankId": tank_ids[nozzle_tank[entry_nozzle]],
+        "openingReading": opening.ravel(),
+        "closingReading": closing.ravel(),
+        "testQty": test.ravel(),
+        "pricePerUnit": price.ravel(),
+        "quantity": qty.ravel(),
+        "netSaleAmount": np.round(qty.ravel() * price.ravel(), 2),
+        "employeeId": employee_ids[rng.integers(0, n_emp, n_entries)],
+        "createdAt": created,
+    }, "sale_entries", _pg("id", "saleDate", "shiftId", "pumpStation", "nozzleId", "fuelProductId",
+                           "openingReading", "closingReading", "quantity", "pricePerUnit",
+                           "netSaleAmount", "employeeId", "createdAt"))
+
+    # -- tank stock: readings and the deliveries that keep them positive ------
+    meter = np.zeros((n_tanks, n_days))
+    np.add.at(meter, nozzle_tank, dispensed.reshape(config.nozzles, n_days, n_shifts).sum(axis=2))
+    testing = np.zeros((n_tanks, n_days))
+    np.add.at(testing, nozzle_tank, test.sum(axis=2))
+    dip_sales = np.round(meter - testing + rng.normal(0.0, 0.002, meter.shape) * meter, 3)
+
+    # Deliver on every interval-th day enough whole lots for the coming interval.
+    interval = max(1, config.delivery_interval)
+    padded = np.pad(dip_sales, ((0, 0), (0, -n_days % interval)))
+    upcoming = padded.reshape(n_tanks, -1, interval).sum(axis=2)
+    received = np.zeros_like(padded)
+    received[:, ::interval] = np.ceil(upcoming / DELIVERY_LOT) * DELIVERY_LOT
+    received = received[:, :n_days]
+    initial = np.round(capacity * 0.5, 3)
+    closing_stock = np.round(initial[:, None] + np.cumsum(received - dip_sales, axis=1), 3)
+    opening_stock = np.concatenate([initial[:, None], closing_stock[:, :-1]], axis=1)
+    actual = meter - testing
+    tables["tanks"] = Table("tanks", {
+        "id": tank_ids,
+        "tankNumber": np.char.add("T-", (np.arange(n_tanks) + 1).astype(str)),
+        "fuelProductId": product_ids[tank_product],
+        "capacity": capacity,
+        "currentStock": closing_stock[:, -1],
+        "isActive": np.ones(n_tanks, dtype=bool),
+        "createdAt": np.full(n_tanks, days[0]),
+    }, "tanks", _pg("id", "tankNumber", "fuelProductId", "capacity", "currentStock", "createdAt"))
+    tables["tank_daily_readings"] = Table("tankdailyreadings", {
+        "id": _uuids(rng, n_tanks * n_days),
+        "readingDate": np.tile(days, n_tanks),
+        "tankId": np.repeat(tank_ids, n_days),
+        "openingStock": opening_stock.ravel(),
+        "stockReceived": received.ravel(),
+        "closingStock": closing_stock.ravel(),
+        "meterSale": np.round(meter, 3).ravel(),
+        "testing": testing.ravel(),
+        "variation": np.round(actual - (opening_stock + received - closing_stock), 3).ravel(),
+        "createdAt": _stamp(np.tile(days, n_tanks)),
+    }, "tank_daily_readings", _pg("id", "readingDate", "tankId", "openingStock", "stockReceived",
+                                  "closingStock", "meterSale", "testing", "variation", "createdAt"))
+
+    tank_idx, day_idx = np.nonzero(received)
+    n_deliveries = len(tank_idx)
+    tables["tanker_sales"] = Table("tankersales", {
+        "id": _uuids(rng, n_deliveries),
+        "saleDate": days[day_idx],
+        "fuelProductId": product_ids[tank_product[tank_idx]],
+        "tankId": tank_ids[tank_idx],
+        "beforeDipStock": opening_stock[tank_idx, day_idx],
+        "grossStock": opening_stock[tank_idx, day_idx] + received[tank_idx, day_idx],
+        "tankerSaleQuantity": received[tank_idx, day_idx],
+        "notes": np.char.add("Invoice: INV-", (np.arange(n_deliveries) + 1).astype(str)),
+        "createdAt": _stamp(days[day_idx]),
+    }, "tanker_sales", _pg("id", "saleDate", "fuelProductId", "beforeDipStock", "grossStock",
+                           "tankerSaleQuantity", "notes", "createdAt"))
+
+    # -- walk-in and credit business ------------------------------------------
+    per_day = rng.poisson(config.guest_sales_per_day, n_days)
+    g_day = np.repeat(np.arange(n_days), per_day)
+    n_guest = len(g_day)
+    g_product = rng.integers(0, n_products, n_guest)
+    g_qty = np.round(rng.lognormal(2.3, 0.6, n_guest), 2)
+    g_price = close[g_product, g_day]
+    g_discount = np.where(rng.random(n_guest) < 0.2, rng.choice([5.0, 10.0, 20.0], n_guest), 0.0)
+    tables["guest_sales"] = Table("guestsales", {
+        "id": _uuids(rng, n_guest),
+        "saleDate": days[g_day],
+        "shift": rng.choice(np.array([s[0] for s in shift_spec]), n_guest),
+        "customerName": _names(rng, FIRST_NAMES, LAST_NAMES, n_guest),
+        "mobileNumber": _phones(rng, n_guest),
+        "billNo": (np.arange(n_guest) + 1).astype(str),
+        "vehicleNumber": np.char.add("KA01", rng.integers(1000, 9999, n_guest).astype(str)),
+        "fuelProductId": product_ids[g_product],
+        "pricePerUnit": g_price,
+        "quantity": g_qty,
+        "discount": g_discount,
+        "totalAmount": np.round(g_qty * g_price - g_discount, 2),
+        "paymentMode": rng.choice(PAYMENT_MODES, n_guest, p=[0.5, 0.4, 0.1]),
+        "employeeId": employee_ids[rng.integers(0, n_emp, n_guest)],
+        "createdAt": _stamp(days[g_day]),
+    }, "guest_sales", _pg("id", "saleDate", "shift", "customerName", "mobileNumber", "billNo",
+                          "vehicleNumber", "fuelProductId", "pricePerUnit", "quantity", "discount",
+                          "totalAmount", "paymentMode", "employeeId", "createdAt"))
+
+    n_cust = config.credit_customers
+    customer_ids = _uuids(rng, n_cust)
+    opening_balance = np.round(rng.uniform(0, 50_000, n_cust), 2)
+    per_day = rng.poisson(config.recoveries_per_day if n_cust else 0.0, n_days)
+    r_day = np.repeat(np.arange(n_days), per_day)
+    n_rec = len(r_day)
+    r_customer = rng.integers(0, max(n_cust, 1), n_rec)
+    r_amount = np.round(rng.uniform(500, 20_000, n_rec), -1)
+    recovered = np.bincount(r_customer, weights=r_amount, minlength=n_cust)
+    customer_names = np.char.add(np.char.add(rng.choice(ORG_WORDS, n_cust), " "),
+                                 rng.choice(ORG_KINDS, n_cust))
+    phones = _phones(rng, n_cust)
+    tables["credit_customers"] = Table("creditcustomers", {
+        "id": customer_ids,
+        "tenantId": np.full(n_cust, tenant_id),
+        "organizationName": np.char.add(customer_names, np.char.add(" #", (np.arange(n_cust) + 1).astype(str))),
+        "phoneNumber": phones,
+        "mobileNumber": phones,
+        "creditLimit": rng.choice([50_000.0, 100_000.0, 200_000.0], n_cust),
+        "openingBalance": opening_balance,
+        "currentBalance": np.round(opening_balance - recovered, 2),
+        "registeredDate": days[0] - rng.integers(0, 365, n_cust).astype("timedelta64[D]"),
+        "balanceType": np.full(n_cust, "Due"),
+        "isActive": np.ones(n_cust, dtype=bool),
+        "createdAt": np.full(n_cust, days[0]),
+    }, "credit_customers", _pg("id", "organizationName", "phoneNumber", "mobileNumber", "creditLimit",
+                               "openingBalance", "currentBalance", "registeredDate", "balanceType",
+                               "isActive", "createdAt"))
+
+    tables["recoveries"] = Table("recoveries", {
+        "id": _uuids(rng, n_rec),
+        "tenantId": np.full(n_rec, tenant_id),
+        "creditCustomerId": customer_ids[r_customer],
+        "customerName": tables["credit_customers"].columns["organizationName"][r_customer],
+        "recoveryDate": days[r_day],
+        "receivedAmount": r_amount,
+        "discount": np.zeros(n_rec),
+        "paymentMode": rng.choice(PAYMENT_MODES, n_rec),
+        "createdAt": _stamp(days[r_day]),
+    }, "recoveries", _pg("id", "recoveryDate", "creditCustomerId", "receivedAmount", "discount",
+                         "paymentMode", "createdAt"), string_dates=("recoveryDate",))
+
+    tenant = {
+        "_id": tenant_id,
+        "organizationName": f"Synthetic Fuels {tenant_index + 1}",
+        "superAdminEmail": f"synth{tenant_index + 1}@example.com",
+        "status": "active",
+        "createdAt": dt.datetime.combine(config.start_date, dt.time()),
+    }
+    return Dataset(config, tenant, tables)
+
+
+def cached(config: SynthConfig, tenant_index: int = 0, directory: Path = SYNTH_DIR) -> Dataset:
+    """:func:`generate`, memoized on disk by config hash (``.npz`` per table)."""
+    path = directory / f"{config.key()}-{tenant_index}"
+    meta = path / "meta.json"
+    if meta.exists():
+        info = json.loads(meta.read_text())
+        tables = {}
+        for name, spec in info["tables"].items():
+            with np.load(path / f"{name}.npz", allow_pickle=False) as npz:
+                columns = {c: npz[c] for c in spec["columns"]}
+            tables[name] = Table(spec["collection"], columns, spec["pg_table"], spec["pg_columns"],
+                                 tuple(spec["string_dates"]), tuple(spec.get("object_ids", ())))
+        tenant = dict(info["tenant"], createdAt=dt.datetime.fromisoformat(info["tenant"]["createdAt"]))
+        return Dataset(config, tenant, tables)
+
+    data = generate(config, tenant_index)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, table in data.tables.items():
+        np.savez(path / f"{name}.npz", **table.columns)
+    meta.write_text(json.dumps({
+        "tenant": dict(data.tenant, createdAt=data.tenant["createdAt"].isoformat()),
+        "tables": {name: {"collection": t.collection, "columns": list(t.columns), "pg_table": t.pg_table,
+                          "pg_columns": t.pg_columns, "string_dates": list(t.string_dates),
+                          "object_ids": list(t.object_ids)}
+                   for name, t in data.tables.items()},
+    }, indent=2))
+    return data
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.synth", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="large")
+    parser.add_argument("--nozzles", type=int)
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tenants", type=int, default=1, help="datasets to build, one per tenant")
+    parser.add_argument("--mongo", metavar="URI", help="insertMany into this MongoDB")
+    parser.add_argument("--db", default="synthetic", help="Mongo database (tenant i gets <db>_<i> when --tenants > 1)")
+    parser.add_argument("--master-db", help="also register each tenant in this Mongo database")
+    parser.add_argument("--postgres", metavar="DSN", help="COPY into this PostgreSQL database (first tenant)")
+    parser.add_argument("--json", type=Path, metavar="FILE", help="write mockapi-ready collections as JSON")
+    args = parser.parse_args(argv)
+
+    overrides = {k: v for k, v in (("nozzles", args.nozzles), ("days", args.days)) if v}
+    config = SynthConfig.preset(args.scale, seed=args.seed, **overrides)
+    for index in range(args.tenants):
+        started = time.perf_counter()
+        data = cached(config, index)
+        print(f"tenant {data.tenant['_id']} generated in {time.perf_counter() - started:.1f}s")
+        for name, count in data.counts().items():
+            print(f"  {name:<22}{count:>10,}")
+        if args.mongo:
+            database = args.db if args.tenants == 1 else f"{args.db}_{index}"
+            for name, secs in data.load_mongo(args.mongo, database, args.master_db).items():
+                print(f"  mongo {name:<22}{secs:>8.2f}s")
+        if args.postgres and index == 0:
+            for name, secs in data.load_postgres(args.postgres).items():
+                print(f"  postgres {name:<19}{secs:>8.2f}s")
+        if args.json and index == 0:
+            args.json.write_text(json.dumps({"databases": [{"name": "synthetic", "collections": [
+                {"name": name, "count": len(docs), "sample": docs}
+                for name, docs in data.to_collections().items()
+            ]}]}, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
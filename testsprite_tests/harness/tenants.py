@@ -0,0 +1,227 @@
+"""Throwaway tenant databases, one per shard worker.
+
+Every worker logs in as the same user against the same tenant.  Parallel
+runs therefore fight over the same credit customers, nozzles and daily
+rates, and assertions on fixed values (the KPI figures in TC004) only hold
+when the suite runs serially.
+
+On the Postgres branch, ``provisionTenant`` in
+``server/services/tenant-provisioning.ts`` gives every tenant its own
+database.  The Mongo branch, which runs when ``DATABASE_URL`` is unset,
+reads whatever database ``MONGODB_URI`` names.  So a throwaway tenant here
+is a database:
+
+1. **Template.**  The app's database (users, tenants and data) is copied
+   once, server-side with ``$out``, into ``--template-db``.  The copy is
+   reused until ``--refresh-template``, so every run starts from the same
+   data.
+2. **Provision.**  Each worker gets ``<template>_r<run>_w<i>``, cloned from
+   the template the same way, indexes included.  Its app server
+   (``harness.shard --server-cmd``) is started with ``MONGODB_URI``
+   pointing at it.  Logins work unchanged because ``users`` and
+   ``tenants`` are copied too.
+3. **Teardown.**  When a worker finishes, its database is dropped on a
+   background thread while the other workers keep running.  ``sweep``
+   drops the databases of runs that crashed.
+
+::
+
+    python -m harness.shard -j 8 --server-cmd "npx tsx server/production.ts" --tenants
+    python -m harness.tenants snapshot --refresh     # re-copy the template
+    python -m harness.tenants provision -j 2         # print URIs for manual servers
+    python -m harness.tenants sweep                  # drop leftovers of crashed runs
+
+Needs ``pymongo`` (see requirements.txt) and MongoDB 4.4+ for
+cross-database ``$out``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit, urlunsplit
+
+from .auth import server_env
+
+DEFAULT_TEMPLATE = "testsprite_template"
+MARKER = "_testsprite_template"  # collection recording when the template was taken
+MONGOOSE_DEFAULT_DB = "test"
+
+
+def database_of(uri: str) -> str:
+    """Database a mongoose connection string selects (``test`` if none)."""
+    return urlsplit(uri).path.lstrip("/") or MONGOOSE_DEFAULT_DB
+
+
+def with_database(uri: str, database: str) -> str:
+    """``uri`` pointing at ``database``, options kept."""
+    parts = urlsplit(uri)
+    return urlunsplit(parts._replace(path="/" + database))
+
+
+def _client(uri: str) -> Any:
+    from pymongo import MongoClient
+
+    return MongoClient(uri)
+
+
+def clone_database(client: Any, source: str, target: str) -> Dict[str, int]:
+    """Copy every collection of ``source`` into ``target`` server-side, with indexes.
+
+    Returns documents per collection.
+    """
+    counts: Dict[str, int] = {}
+    for name in client[source].list_collection_names():
+        if name.startswith("system.") or name == MARKER:
+            continue
+        src = client[source][name]
+        src.aggregate([{"$match": {}}, {"$out": {"db": target, "coll": name}}])
+        # $out into a new collection only carries the default _id index.
+        indexes = [ix for ix in src.list_indexes() if ix["name"] != "_id_"]
+        for index in indexes:
+            options = {k: v for k, v in index.items() if k not in ("v", "key", "ns")}
+            client[target][name].create_index(list(index["key"].items()), **options)
+        counts[name] = client[target][name].estimated_document_count()
+    return counts
+
+
+@dataclass
+class Tenant:
+    worker: int
+    database: str
+    uri: str
+    seconds: float
+    documents: int
+
+
+class TenantPool:
+    """Template snapshot plus one cloned database per worker, dropped asynchronously."""
+
+    def __init__(self, uri: Optional[str] = None, template: str = DEFAULT_TEMPLATE,
+                 refresh: bool = False, keep: bool = False) -> None:
+        uri = uri or server_env("MONGODB_URI")
+        if not uri:
+            raise ValueError("MONGODB_URI is not set (environment, .env or .local.env)")
+        self.uri = uri
+        self.source = database_of(uri)
+        self.template = template
+        self.refresh = refresh
+        self.keep = keep
+        self.run_id = time.strftime("%m%d%H%M%S")
+        self.tenants: List[Tenant] = []
+        self._client = _client(uri)
+        self._teardown = ThreadPoolExecutor(4, thread_name_prefix="tenant-teardown")
+        self._pending: List[Future] = []
+        self._released: set = set()
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Take the template from the app's database unless one exists; return its marker."""
+        marker = self._client[self.template][MARKER]
+        existing = marker.find_one()
+        if existing is not None and not self.refresh:
+            return existing
+        self._client.drop_database(self.template)
+        started = time.perf_counter()
+        counts = clone_database(self._client, self.source, self.template)
+        info = {"source": self.source, "takenAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "seconds": time.perf_counter() - started, "documents": counts}
+        marker.insert_one(dict(info))
+        return info
+
+    def _provision_one(self, worker: int) -> Tenant:
+        database = f"{self.template}_r{self.run_id}_w{worker}"
+        started = time.perf_counter()
+        self._client.drop_database(database)
+        counts = clone_database(self._client, self.template, database)
+        return Tenant(worker, database, with_database(self.uri, database),
+                      time.perf_counter() - started, sum(counts.values()))
+
+    def provision(self, workers: int) -> List[Tenant]:
+        """One database per worker, cloned in parallel."""
+        self.snapshot()
+        with ThreadPoolExecutor(max(1, min(workers, 8))) as pool:
+            self.tenants = list(pool.map(self._provision_one, range(workers)))
+        return self.tenants
+
+    def release(self, tenant: Tenant) -> Optional[Future]:
+        """Drop ``tenant`` on a background thread (unless ``keep``)."""
+        if self.keep or tenant.database in self._released:
+            return None
+        self._released.add(tenant.database)
+        future = self._teardown.submit(self.drop, tenant.database)
+        self._pending.append(future)
+        return future
+
+    def drop(self, database: str) -> None:
+        self._client.drop_database(database)
+
+    def sweep(self) -> List[str]:
+        """Drop the worker databases of every earlier run of this template."""
+        pattern = re.compile(rf"^{re.escape(self.template)}_r\d+_w\d+$")
+        current = {t.database for t in self.tenants}
+        dropped = [name for name in self._client.list_database_names()
+                   if pattern.match(name) and name not in current]
+        for name in dropped:
+            self.drop(name)
+        return dropped
+
+    def close(self) -> None:
+        """Release what is left, wait for the teardowns, then disconnect."""
+        for tenant in self.tenants:
+            self.release(tenant)
+        for future in self._pending:
+            future.result()
+        self._teardown.shutdown()
+        self._client.close()
+
+    def __enter__(self) -> "TenantPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def summary(self) -> str:
+        if not self.tenants:
+            return "no tenants provisioned"
+        slowest = max(t.seconds for t in self.tenants)
+        return (f"{len(self.tenants)} tenant databases cloned from {self.template} "
+                f"({self.tenants[0].documents} documents each, slowest {slowest:.1f}s)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.tenants", description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["snapshot", "provision", "teardown", "sweep"])
+    parser.add_argument("databases", nargs="*", help="teardown: databases to drop")
+    parser.add_argument("--mongo", metavar="URI", help="app database (default: MONGODB_URI)")
+    parser.add_argument("--template-db", default=DEFAULT_TEMPLATE)
+    parser.add_argument("--refresh", action="store_true", help="re-take the template snapshot")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="provision: databases to clone")
+    args = parser.parse_args(argv)
+
+    pool = TenantPool(args.mongo, args.template_db, refresh=args.refresh, keep=True)
+    try:
+        if args.command == "snapshot":
+            info = pool.snapshot()
+            print(json.dumps({k: v for k, v in info.items() if k != "_id"}, indent=2, default=str))
+        elif args.command == "provision":
+            print(json.dumps([asdict(t) for t in pool.provision(args.workers)], indent=2))
+        elif args.command == "teardown":
+            for name in args.databases:
+                pool.drop(name)
+                print(f"dropped {name}")
+        else:
+            for name in pool.sweep():
+                print(f"dropped {name}")
+    finally:
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Event-driven waits for the generated TestSprite flows.
+
+The generated steps used to sleep ``page.wait_for_timeout(3000)`` before every
+``fill``/``click``.  These helpers wait on the signal the sleep was standing
+in for instead:
+
+* :func:`actionable` - the locator is visible and React Query has no request
+  in flight (Playwright's own ``click``/``fill`` then checks enabled/stable);
+* :func:`api_response` - a specific ``/api/...`` response has arrived and its
+  body has finished streaming;
+* :func:`query_idle` - ``queryClient.isFetching()`` and ``isMutating()`` are
+  both zero.  The client is exposed as ``window.__REACT_QUERY_CLIENT__`` by
+  ``src/App.tsx`` in dev builds and in builds made with ``VITE_E2E_HOOKS=1``
+  (:func:`harness.server.ensure_build` does that); without it the helper
+  falls back to the ``networkidle`` load state and says so once.
+
+Every :func:`actionable` call also marks a step boundary for the listeners
+registered with :func:`add_step_listener` (``harness.profiler`` uses it to
+profile each step on its own).
+
+Set ``TESTSPRITE_FIXED_WAITS=1`` (or pass ``--fixed-waits`` to the runner) to
+restore the old fixed 3 s sleeps so both modes can be timed side by side.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Error, Locator, Page, Response
+
+FIXED_WAIT_MS = 3000
+DEFAULT_TIMEOUT_MS = 10000
+
+_fixed_waits = os.environ.get("TESTSPRITE_FIXED_WAITS", "") == "1"
+_step_listeners: List[Callable[[Locator], Awaitable[None]]] = []
+_fallback_reported = False
+
+_QUERY_IDLE_JS = """() => {
+  const client = window.__REACT_QUERY_CLIENT__;
+  return client ? client.isFetching() === 0 && client.isMutating() === 0 : null;
+}"""
+
+
+def set_fixed_waits(enabled: bool) -> None:
+    """Switch every helper between event-driven and fixed-sleep mode."""
+    global _fixed_waits
+    _fixed_waits = enabled
+
+
+def fixed_waits_enabled() -> bool:
+    return _fixed_waits
+
+
+async def query_idle(page: Page, timeout: float = DEFAULT_TIMEOUT_MS) -> None:
+    """Wait until React Query has no queries fetching and no mutations running."""
+    if _fixed_waits:
+        await page.wait_for_timeout(FIXED_WAIT_MS)
+        return
+    if await page.evaluate(_QUERY_IDLE_JS) is None:
+        global _fallback_reported
+        if not _fallback_reported:
+            _fallback_reported = True
+            print(f"window.__REACT_QUERY_CLIENT__ missing on {page.url}; waiting for networkidle instead "
+                  "(build the app with VITE_E2E_HOOKS=1)", file=sys.stderr)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        except Error:
+            pass
+        return
+    await page.wait_for_function(_QUERY_IDLE_JS, timeout=timeout)
+
+
+def add_step_listener(listener: Callable[[Locator], Awaitable[None]]) -> None:
+    """Call ``await listener(locator)`` at the start of every step."""
+    _step_listeners.append(listener)
+
+
+def remove_step_listener(listener: Callable[[Locator], Awaitable[None]]) -> None:
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+async def actionable(locator: Locator, timeout: float = DEFAULT_TIMEOUT_MS) -> None:
+    """Wait until ``locator`` can be acted on, replacing the pre-action sleep."""
+    for listener in list(_step_listeners):
+        await listener(locator)
+    if _fixed_waits:
+        await locator.page.wait_for_timeout(FIXED_WAIT_MS)
+        return
+    await locator.wait_for(state="visible", timeout=timeout)
+    try:
+        await query_idle(locator.page, timeout=timeout)
+    except Error:
+        # A slow background refetch (the dashboard polls every 30 s) should
+        # not fail a step whose element is already on screen.
+        pass
+
+
+def _matches(response: Response, path: str, method: Optional[str]) -> bool:
+    url_path = urlparse(response.url).path
+    if url_path != path and not url_path.startswith(path.rstrip("/") + "/"):
+        return False
+    return method is None or response.request.method == method.upper()
+
+
+@asynccontextmanager
+async def api_response(
+    page: Page,
+    path: str,
+    method: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT_MS,
+) -> AsyncIterator[None]:
+    """Wait for the ``path`` response triggered inside the ``async with`` body.
+
+    ``path`` matches the URL path exactly or as a prefix segment, so
+    ``/api/guest-sales`` also covers ``/api/guest-sales/<id>``.  After the
+    response has finished, waits for React Query to settle the refetches the
+    mutation's ``invalidateQueries`` kicked off.
+    """
+    if _fixed_waits:
+        yield
+        await page.wait_for_timeout(FIXED_WAIT_MS)
+        return
+    async with page.expect_response(lambda r: _matches(r, path, method), timeout=timeout) as info:
+        yield
+    response = await info.value
+    await response.finished()
+    try:
+        await query_idle(page, timeout=timeout)
+    except Error:
+        pass